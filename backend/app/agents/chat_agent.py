@@ -14,6 +14,7 @@ import importlib
 
 from app.core.llm_factory import create_chat_llm
 from app.core.redis_cache import redis_cache
+from app.core.cache_keys import make_key, digest, normalize_text, normalize_terms
 from app.core.semantic_cache import semantic_cache_service
 from app.core.config import settings
 from config import get_personal_configs, get_agent_config
@@ -110,23 +111,23 @@ class SimpleKetoCoachAgent:
             allergies = profile.get("allergies", []) if profile else []
             dislikes = profile.get("dislikes", []) if profile else []
             
-            cache_key = f"general_chat_{hash(message)}_{user_id}_{hash(tuple(sorted(allergies)))}_{hash(tuple(sorted(dislikes)))}"
+            cache_key = make_key(
+                "general_chat", normalize_text(message), user_id=user_id,
+                allergies=normalize_terms(allergies), dislikes=normalize_terms(dislikes),
+            )
             
             # 🔍 디버깅 로그 추가
             print(f"🔍 일반 채팅 캐시 키: {cache_key}")
             print(f"🔍 사용자 ID: {user_id}")
-            print(f"🔍 알레르기 해시: {hash(tuple(sorted(allergies)))}")
-            print(f"🔍 기피식품 해시: {hash(tuple(sorted(dislikes)))}")
-            print(f"🔍 메시지 해시: {hash(message)}")
             
             # Redis 캐시 확인
             print(f"    🔍 캐시 확인 시작: {cache_key}")
-            print(f"    🔍 Redis 활성화 상태: {redis_cache.is_enabled}")
+            print(f"    🔍 Redis 활성화 상태: {redis_cache.enabled}")
             print(f"    🔍 Redis 객체: {redis_cache}")
             print(f"    🔍 Redis 타입: {type(redis_cache)}")
             
             try:
-                cached_result = redis_cache.get(cache_key)
+                cached_result = await redis_cache.aget(cache_key)
                 print(f"    🔍 Redis get 결과: {cached_result is not None}")
             except Exception as e:
                 print(f"    ❌ Redis get 오류: {e}")
@@ -141,7 +142,7 @@ class SimpleKetoCoachAgent:
             if settings.semantic_cache_enabled:
                 try:
                     model_ver = f"chat_agent_{settings.llm_model}"
-                    opts_hash = f"{user_id}_{hash(tuple(sorted(allergies)))}_{hash(tuple(sorted(dislikes)))}"
+                    opts_hash = f"{user_id}_{digest(normalize_terms(allergies), normalize_terms(dislikes), length=16)}"
                     
                     semantic_result = await semantic_cache_service.semantic_lookup(
                         message, user_id, model_ver, opts_hash
@@ -169,7 +170,7 @@ class SimpleKetoCoachAgent:
             
             # 🚀 일반 채팅 결과 캐싱 (TTL: 30분)
             print(f"    💾 캐시 저장 시작: {cache_key}")
-            redis_cache.set(cache_key, result_data, ttl=1800)
+            await redis_cache.aset(cache_key, result_data, ttl=1800)
             print(f"    ✅ 일반 채팅 결과 캐시 저장 완료: {message[:30]}...")
             print(f"    ✅ 저장된 응답 길이: {len(str(result_data))} 문자")
             
@@ -177,7 +178,7 @@ class SimpleKetoCoachAgent:
             if settings.semantic_cache_enabled:
                 try:
                     model_ver = f"chat_agent_{settings.llm_model}"
-                    opts_hash = f"{user_id}_{hash(tuple(sorted(allergies)))}_{hash(tuple(sorted(dislikes)))}"
+                    opts_hash = f"{user_id}_{digest(normalize_terms(allergies), normalize_terms(dislikes), length=16)}"
                     
                     meta = {
                         "route": "general_chat",
@@ -211,23 +212,23 @@ class SimpleKetoCoachAgent:
             allergies = profile.get("allergies", []) if profile else []
             dislikes = profile.get("dislikes", []) if profile else []
             
-            cache_key = f"general_chat_response_{hash(message)}_{user_id}_{hash(tuple(sorted(allergies)))}_{hash(tuple(sorted(dislikes)))}"
+            cache_key = make_key(
+                "general_chat_resp", normalize_text(message), user_id=user_id,
+                allergies=normalize_terms(allergies), dislikes=normalize_terms(dislikes),
+            )
             
             # 🔍 디버깅 로그 추가
             print(f"🔍 _generate_general_response 캐시 키: {cache_key}")
             print(f"🔍 사용자 ID: {user_id}")
-            print(f"🔍 알레르기 해시: {hash(tuple(sorted(allergies)))}")
-            print(f"🔍 기피식품 해시: {hash(tuple(sorted(dislikes)))}")
-            print(f"🔍 메시지 해시: {hash(message)}")
             
             # Redis 캐시 확인
             print(f"    🔍 캐시 확인 시작: {cache_key}")
-            print(f"    🔍 Redis 활성화 상태: {redis_cache.is_enabled}")
+            print(f"    🔍 Redis 활성화 상태: {redis_cache.enabled}")
             print(f"    🔍 Redis 객체: {redis_cache}")
             print(f"    🔍 Redis 타입: {type(redis_cache)}")
             
             try:
-                cached_result = redis_cache.get(cache_key)
+                cached_result = await redis_cache.aget(cache_key)
                 print(f"    🔍 Redis get 결과: {cached_result is not None}")
             except Exception as e:
                 print(f"    ❌ Redis get 오류: {e}")
@@ -262,7 +263,7 @@ class SimpleKetoCoachAgent:
             
             # 🚀 일반 채팅 응답 캐싱 (TTL: 30분)
             print(f"    💾 캐시 저장 시작: {cache_key}")
-            redis_cache.set(cache_key, response_content, ttl=1800)
+            await redis_cache.aset(cache_key, response_content, ttl=1800)
             print(f"    ✅ 일반 채팅 응답 캐시 저장 완료: {message[:30]}...")
             print(f"    ✅ 저장된 응답 길이: {len(str(response_content))} 문자")
             
@@ -11,6 +11,7 @@ AI 기반 7일 키토 식단 계획 생성
 
 import asyncio
 import json
+import re
 import random
 from typing import Dict, Any, List, Optional
 from datetime import date, timedelta
@@ -19,6 +20,7 @@ import importlib
 import random
 
 from app.tools.shared.hybrid_search import hybrid_search_tool
+from app.tools.meal.meal_candidate_pool import EGG_SLOT, meal_candidate_pool, search_meal_candidates
 from app.tools.shared.profile_tool import user_profile_tool
 from app.tools.shared.date_parser import DateParser
 from app.tools.shared.temporary_dislikes_extractor import temp_dislikes_extractor
@@ -26,8 +28,11 @@ from app.tools.meal.response_formatter import MealResponseFormatter
 from app.tools.shared.recipe_rag import recipe_rag_tool
 from app.core.llm_factory import create_chat_llm
 from app.core.redis_cache import redis_cache
+from app.core.stream_events import emit, is_streaming
+from app.core.cache_keys import make_key, digest, normalize_terms
 from app.core.semantic_cache import semantic_cache_service
 from app.core.config import settings
+from app.shared.utils.keyword_router import keyword_router
 from config import get_personal_configs, get_agent_config
 
 # 기본값 상수 정의
@@ -559,142 +564,6 @@ class MealPlannerAgent:
         return " | ".join(constraints)
     
     
-    async def _search_with_diversity(
-        self,
-        search_query: str,
-        constraints: str,
-        user_id: Optional[str],
-        used_recipes: set,
-        max_results: int = 35,
-        allergies: Optional[List[str]] = None,
-        dislikes: Optional[List[str]] = None
-    ) -> List[Dict[str, Any]]:
-        """
-        다양성을 고려한 레시피 검색 (중복 방지)
-
-        Args:
-            search_query: 검색 쿼리
-            constraints: 제약 조건
-            user_id: 사용자 ID
-            used_recipes: 이미 사용된 레시피 ID 집합
-            max_results: 최대 결과 수
-            allergies: 알레르기 목록 (임시 + 프로필)
-            dislikes: 비선호 목록 (임시 + 프로필)
-
-        Returns:
-            중복되지 않은 레시피 목록
-        """
-        try:
-            # 하이브리드 검색 실행 (알레르기/비선호 필터링 포함)
-            search_results = await hybrid_search_tool.search(
-                query=search_query,
-                profile=constraints,
-                max_results=min(max_results * 3, 50),  # 더 많이 가져오기
-                user_id=user_id,
-                allergies=allergies,
-                dislikes=dislikes
-            )
-            
-            if not search_results:
-                return []
-            
-            # 중복되지 않은 레시피만 필터링
-            unique_results = []
-
-            for result in search_results:
-                recipe_id = result.get('id', '')
-
-                # 디버깅: ID 확인
-                if not recipe_id:
-                    print(f"⚠️ ID 없는 레시피 발견: {result.get('title', 'Unknown')}")
-                    # ID가 없으면 title로 대체
-                    recipe_id = result.get('title', '')
-
-                if recipe_id and recipe_id not in used_recipes:
-                    unique_results.append(result)
-                    used_recipes.add(recipe_id)  # 중복 방지를 위해 추가
-                    # print(f"  ✅ 수집: {result.get('title', 'Unknown')} (ID: {recipe_id})")
-                    if len(unique_results) >= max_results:
-                        break
-                else:
-                    if recipe_id:
-                        print(f"  ⚠️ 중복 제외: {result.get('title', 'Unknown')} (ID: {recipe_id})")
-
-            print(f"🔍 _search_with_diversity 결과: 검색 {len(search_results)}개 → 중복제거 후 {len(unique_results)}개")
-            return unique_results
-            
-        except Exception as e:
-            print(f"❌ 다양성 검색 실패: {e}")
-            return []
-    
-    async def _search_with_diversity_optimized(
-        self,
-        search_query: str,
-        constraints: str,
-        user_id: Optional[str],
-        used_recipes: set,
-        max_results: int = 35,
-        processed_allergies: Optional[List[str]] = None,
-        processed_dislikes: Optional[List[str]] = None
-    ) -> List[Dict[str, Any]]:
-        """
-        최적화된 다양성 검색 (알레르기/비선호 정보 재사용)
-
-        Args:
-            search_query: 검색 쿼리
-            constraints: 제약 조건
-            user_id: 사용자 ID
-            used_recipes: 이미 사용된 레시피 ID 집합
-            max_results: 최대 결과 수
-            processed_allergies: 사전 처리된 알레르기 목록
-            processed_dislikes: 사전 처리된 비선호 목록
-
-        Returns:
-            중복되지 않은 레시피 목록
-        """
-        try:
-            # 하이브리드 검색 실행 (사전 처리된 알레르기/비선호 정보 사용)
-            search_results = await hybrid_search_tool.search(
-                query=search_query,
-                profile=constraints,
-                max_results=min(max_results * 3, 50),  # 더 많이 가져오기
-                user_id=user_id,
-                allergies=processed_allergies,
-                dislikes=processed_dislikes
-            )
-            
-            if not search_results:
-                return []
-            
-            # 중복되지 않은 레시피만 필터링
-            unique_results = []
-
-            for result in search_results:
-                recipe_id = result.get('id', '')
-
-                # 디버깅: ID 확인
-                if not recipe_id:
-                    print(f"⚠️ ID 없는 레시피 발견: {result.get('title', 'Unknown')}")
-                    # ID가 없으면 title로 대체
-                    recipe_id = result.get('title', '')
-
-                if recipe_id and recipe_id not in used_recipes:
-                    unique_results.append(result)
-                    used_recipes.add(recipe_id)  # 중복 방지를 위해 추가
-                    # print(f"  ✅ 수집: {result.get('title', 'Unknown')} (ID: {recipe_id})")
-                    if len(unique_results) >= max_results:
-                        break
-                else:
-                    if recipe_id:
-                        print(f"  ⚠️ 중복 제외: {result.get('title', 'Unknown')} (ID: {recipe_id})")
-
-            print(f"🔍 _search_with_diversity_optimized 결과: 검색 {len(search_results)}개 → 중복제거 후 {len(unique_results)}개")
-            return unique_results
-            
-        except Exception as e:
-            print(f"❌ 최적화된 다양성 검색 실패: {e}")
-            return []
-    
     async def _generate_ai_search_query(
         self, 
         meal_slot: str, 
@@ -888,185 +757,52 @@ class MealPlannerAgent:
                 ai_strategies = await self._generate_ai_meal_strategies(days, constraints)
                 meal_strategies = ai_strategies.get("meal_strategies", self._get_default_meal_strategies()["meal_strategies"])
             
-            # 효율적인 검색: 식사별로 한 번에 여러 개 검색
             meal_plan_days = []
             used_recipes = set()  # 중복 방지용
             
-            # 각 식사별로 한 번에 여러 개 검색
+            # 1. 후보 풀: 빠른 모드(기본 전략)는 선호 해시별 사전 계산 풀 사용, 없으면 검색 후 풀로 저장
+            #    (AI 전략은 요청마다 달라 풀을 공유하지 않음)
+            candidate_pool = None
+            if fast_mode and settings.meal_pool_enabled:
+                candidate_pool = await meal_candidate_pool.get(allergies, dislikes)
+                if candidate_pool is not None:
+                    print("⚡ 식단 후보 풀 히트 - 검색 없이 식단 구성")
+                else:
+                    candidate_pool = await meal_candidate_pool.build(meal_strategies, allergies, dislikes)
+            if candidate_pool is None:
+                # 모든 슬롯의 모든 쿼리를 한 번에 검색 (임베딩 1회 배치 + 쿼리별 검색 병렬)
+                candidate_pool = await search_meal_candidates(meal_strategies, days, user_id, allergies, dislikes)
+            
+            def is_egg_related(title):
+                """계란 관련 레시피인지 확인"""
+                title_lower = title.lower()
+                egg_keywords = ['달걀', '계란', 'egg', '에그', '계란말이', '달걀찜', '스크램블', 'scramble', '달갈', '계란볶음', '달걀볶음', '계란샐러드', '달걀샐러드', '삶은달걀', '삶은계란', '프리타타', 'frittata', '지단', '계란지단', '달걀지단', '오믈렛', 'omelette', '동그랑땡', '동그랑떵', '계란탕']
+                return any(keyword in title_lower for keyword in egg_keywords)
+            
+            # 풀은 공유 데이터 → 슬롯별 복사본에서 선택/제거
             meal_collections = {}
+            for slot in meal_strategies.keys():
+                unique_results = list(candidate_pool.get(slot) or [])
+                # 🆕 아침의 경우 계란 관련 레시피 추가 필터링 (비계란 레시피가 없으면 원본 사용)
+                if slot == 'breakfast':
+                    non_egg_results = [r for r in unique_results if not is_egg_related(r.get('title', ''))]
+                    if non_egg_results:
+                        unique_results = non_egg_results
+                meal_collections[slot] = unique_results
             
-            # 🆕 계란 레시피 1개만 미리 선별 (랜덤 배치용)
+            # 🆕 계란 레시피 1개만 선별 (랜덤 날짜 아침에 배치)
             egg_breakfast_recipe = None
             egg_day = None  # 계란을 배치할 날짜
+            egg_candidates = candidate_pool.get(EGG_SLOT) or []
             
-            if days > 0:  # 최소 1일 이상일 때만
-                # 계란 포함 확률 결정
-                if days == 1:
-                    include_egg = random.random() < 0.5  # 50% 확률
-                else:
-                    include_egg = True  # 2일 이상이면 무조건 포함
-                
+            if days > 0 and egg_candidates:  # 최소 1일 이상일 때만
+                # 계란 포함 확률 결정: 1일이면 50%, 2일 이상이면 무조건 포함
+                include_egg = random.random() < 0.5 if days == 1 else True
                 if include_egg:
-                    # 계란 레시피 검색
-                    egg_search_results = await hybrid_search_tool.search(
-                        query="계란 달걀 스크램블 오믈렛 키토 아침",
-                        profile=constraints,
-                        max_results=10,
-                        user_id=user_id,
-                        allergies=allergies,
-                        dislikes=dislikes
-                    )
-                    if egg_search_results:
-                        egg_breakfast_recipe = random.choice(egg_search_results)
-                        egg_day = random.randint(0, days - 1)  # 랜덤 날짜 선택
-                        # print(f"🥚 계란 레시피 선별: '{egg_breakfast_recipe.get('title', '')}' → {egg_day + 1}일차 아침")  # 디버그용 제거
-                        
-                        # 🆕 계란 레시피를 used_recipes에 미리 추가하여 다른 검색에서 제외
-                        egg_recipe_id = egg_breakfast_recipe.get('id', f"egg_breakfast_{egg_day}")
-                        used_recipes.add(egg_recipe_id)
-                        # print(f"🚫 계란 레시피 ID '{egg_recipe_id}' 미리 제외 처리")  # 디버그용 제거
-            
-            # 알레르기/비선호 정보를 한 번만 처리하여 재사용
-            # print(f"🔍 알레르기/비선호 정보 사전 처리 시작")  # 임시 비활성화
-            processed_allergies = allergies or []
-            processed_dislikes = dislikes or []
-            # print(f"  - 알레르기: {processed_allergies}")  # 임시 비활성화
-            # print(f"  - 비선호: {processed_dislikes}")  # 임시 비활성화
-            
-            # 병렬 검색을 위한 태스크 생성
-            import asyncio
-            
-            async def search_slot(slot, strategy):
-                """개별 식사 슬롯 검색 (병렬 실행용)"""
-                # print(f"🔍 {slot} 레시피 {days}개 검색 중...")  # 임시 비활성화
-                
-                # 다양성을 위해 여러 검색 전략 시도
-                all_search_results = []
-                
-                # 변수 초기화 (스코프 문제 해결)
-                basic_results = []
-                variety_results = []
-                cooking_results = []
-                total_variety_count = 0  # 전체 다양성 검색 결과 수
-                
-                # 1. 기본 키워드 검색 (알레르기 필터링 고려하여 증가)
-                basic_query = f"{' '.join(strategy['primary_keywords'])} 키토"
-                
-                # 🆕 아침의 경우 계란 키워드 완전 제외
-                if slot == 'breakfast':
-                    basic_query = basic_query.replace('계란', '').replace('달걀', '').replace('스크램블', '').replace('오믈렛', '')
-                    basic_query += ' 닭가슴살 두부 베이컨 연어'  # 계란 대신 다른 단백질 키워드 추가
-                    # print(f"🚫 아침 검색 쿼리 (계란 제외): '{basic_query}'")  # 디버그용 제거
-                else:
-                    # print(f"🔍 DEBUG: {slot} 기본 검색어: '{basic_query}'")  # 디버그용 제거
-                    pass
-                
-                basic_results = await self._search_with_diversity_optimized(
-                    basic_query, constraints, user_id, used_recipes, max_results=days * 4,  # 2 → 4로 증가
-                    processed_allergies=processed_allergies, processed_dislikes=processed_dislikes
-                )
-                all_search_results.extend(basic_results)
-                
-                # 2. 다양성 키워드 검색 (알레르기 필터링 고려하여 증가)
-                if 'variety_keywords' in strategy and len(all_search_results) < days * 3:
-                    # 모든 다양성 키워드 그룹을 순회하며 검색
-                    for i, variety_group in enumerate(strategy['variety_keywords']):
-                        variety_query = f"{' '.join(variety_group)} 키토"
-                        
-                        # 🆕 아침의 경우 계란 키워드 완전 제외
-                        if slot == 'breakfast':
-                            variety_query = variety_query.replace('계란', '').replace('달걀', '').replace('스크램블', '').replace('오믈렛', '')
-                            variety_query += ' 닭가슴살 두부 베이컨 연어'  # 계란 대신 다른 단백질 키워드 추가
-                            # print(f"🚫 아침 다양성 검색 쿼리 (계란 제외): '{variety_query}'")  # 디버그용 제거
-                        else:
-                            # print(f"🔍 DEBUG: {slot} 다양성 검색어 {i+1}: '{variety_query}'")  # 디버그용 제거
-                            pass
-                        
-                        variety_results = await self._search_with_diversity_optimized(
-                            variety_query, constraints, user_id, used_recipes, max_results=2,  # 각 그룹당 2개씩
-                            processed_allergies=processed_allergies, processed_dislikes=processed_dislikes
-                        )
-                        all_search_results.extend(variety_results)
-                        total_variety_count += len(variety_results)  # 다양성 결과 수 누적
-                        
-                        # 충분한 결과가 있으면 중단
-                        if len(all_search_results) >= days * 3:
-                            break
-                
-                # 3. 조리법 기반 검색 (알레르기 필터링 고려하여 증가)
-                if 'cooking_methods' in strategy and len(all_search_results) < days * 3:
-                    cooking_query = f"{' '.join(strategy['cooking_methods'][:2])} 키토 {slot}"  # 3 → 2로 감소
-                    
-                    # 🆕 아침의 경우 계란 키워드 완전 제외
-                    if slot == 'breakfast':
-                        cooking_query = cooking_query.replace('계란', '').replace('달걀', '').replace('스크램블', '').replace('오믈렛', '')
-                        cooking_query += ' 닭가슴살 두부 베이컨 연어'  # 계란 대신 다른 단백질 키워드 추가
-                        # print(f"🚫 아침 조리법 검색 쿼리 (계란 제외): '{cooking_query}'")  # 디버그용 제거
-                    else:
-                        # print(f"🔍 DEBUG: {slot} 조리법 검색어: '{cooking_query}'")  # 디버그용 제거
-                        pass
-                    
-                    cooking_results = await self._search_with_diversity_optimized(
-                        cooking_query, constraints, user_id, used_recipes, max_results=4,  # 2 → 4로 증가
-                        processed_allergies=processed_allergies, processed_dislikes=processed_dislikes
-                    )
-                    all_search_results.extend(cooking_results)
-                
-                if all_search_results:
-                    # 효율적인 중복 제거 (ID 기준) - dict comprehension 사용
-                    seen_ids = set()
-                    unique_results = [
-                        result for result in all_search_results
-                        if (result_id := result.get('id', '')) and result_id not in seen_ids and not seen_ids.add(result_id)
-                    ]
-                    
-                    # 🆕 아침의 경우 계란 관련 레시피 추가 필터링
-                    if slot == 'breakfast':
-                        def is_egg_related(title):
-                            """계란 관련 레시피인지 확인"""
-                            title_lower = title.lower()
-                            egg_keywords = ['달걀', '계란', 'egg', '에그', '계란말이', '달걀찜', '스크램블', 'scramble', '달갈', '계란볶음', '달걀볶음', '계란샐러드', '달걀샐러드', '삶은달걀', '삶은계란', '프리타타', 'frittata', '지단', '계란지단', '달걀지단', '오믈렛', 'omelette', '동그랑땡', '동그랑떵', '계란탕']
-                            return any(keyword in title_lower for keyword in egg_keywords)
-                        
-                        # 계란 관련 레시피 제외
-                        non_egg_results = [r for r in unique_results if not is_egg_related(r.get('title', ''))]
-                        
-                        if non_egg_results:
-                            # print(f"🚫 아침 계란 레시피 추가 필터링: {len(unique_results)} → {len(non_egg_results)}개")  # 디버그용 제거
-                            # 제외된 계란 레시피들 로그 출력
-                            egg_filtered = [r for r in unique_results if is_egg_related(r.get('title', ''))]
-                            # for egg_recipe in egg_filtered:
-                            #     print(f"    ❌ 계란 레시피 제외: '{egg_recipe.get('title', '')}'")  # 디버그용 제거
-                            unique_results = non_egg_results
-                        else:
-                            # print(f"⚠️ 비계란 레시피 없음 - 원본 사용")  # 디버그용 제거
-                            pass
-                    
-                    # print(f"✅ {slot} 레시피 {len(unique_results)}개 수집 완료 (다양성 검색 적용)")  # 디버그용 제거
-                    # print(f"    🔍 검색 전략별 결과: 기본={len(basic_results)}, 다양성={total_variety_count}, 조리법={len(cooking_results) if 'cooking_methods' in strategy else 0}")  # 디버그용 제거
-                    return slot, unique_results
-                else:
-                    # print(f"❌ {slot} 레시피 검색 실패")  # 디버그용 제거
-                    return slot, []
-            
-            # 모든 식사 슬롯을 병렬로 검색
-            # print(f"🚀 {len(meal_strategies)}개 식사 슬롯 병렬 검색 시작...")  # 디버그용 제거
-            search_tasks = [
-                search_slot(slot, strategy) 
-                for slot, strategy in meal_strategies.items()
-            ]
-            
-            # 병렬 실행
-            search_results = await asyncio.gather(*search_tasks, return_exceptions=True)
-            
-            # 결과 정리
-            for result in search_results:
-                if isinstance(result, Exception):
-                    print(f"❌ 검색 오류: {result}")
-                    continue
-                
-                slot, results = result
-                meal_collections[slot] = results
+                    egg_breakfast_recipe = random.choice(egg_candidates)
+                    egg_day = random.randint(0, days - 1)  # 랜덤 날짜 선택
+                    # 계란 레시피는 다른 슬롯에서 제외
+                    used_recipes.add(egg_breakfast_recipe.get('id', f"egg_breakfast_{egg_day}"))
             
             # 7일 식단표 구성 (다양성 보장) - 부분 성공도 허용
             missing_count = 0  # 못 찾은 슬롯 개수
@@ -1074,6 +810,9 @@ class MealPlannerAgent:
             # 메뉴 다양성을 위한 재료 그룹 추적 (전체 식단 기준)
             used_ingredient_groups = global_used_groups if global_used_groups is not None else set()  # 전역 그룹 사용
             
+            if is_streaming():
+                emit("meal_plan_start", total_days=days, markdown=self.response_formatter.format_meal_plan_header(days))
+            
             for day in range(days):
                 day_meals = {}
                 
@@ -1113,40 +852,7 @@ class MealPlannerAgent:
                         
                         if unused_recipes:
                             # 🆕 재료 그룹 기반 다양성 필터링
-                            def get_main_ingredient_group(title):
-                                """메뉴 제목에서 주요 재료 그룹 추출"""
-                                title_lower = title.lower()
-                                
-                                # 계란 그룹 (완전 포괄적인 키워드)
-                                if any(keyword in title_lower for keyword in ['달걀', '계란', 'egg', '에그', '계란말이', '달걀찜', '스크램블', 'scramble', '달갈', '계란볶음', '달걀볶음', '계란샐러드', '달걀샐러드', '삶은달걀', '삶은계란', '프리타타', 'frittata', '지단', '계란지단', '달걀지단', '오믈렛', 'omelette', '동그랑땡', '동그랑떵', '계란탕']):
-                                    return 'egg_group'
-                                
-                                # 닭고기 그룹
-                                if any(keyword in title_lower for keyword in ['닭', '치킨', '닭가슴', '닭다리', '닭날개']):
-                                    return 'chicken_group'
-                                
-                                # 돼지고기 그룹
-                                if any(keyword in title_lower for keyword in ['돼지', '돼지고기', '삼겹', '목살', '베이컨']):
-                                    return 'pork_group'
-                                
-                                # 소고기 그룹
-                                if any(keyword in title_lower for keyword in ['소고기', '소', '한우', '쇠고기', '스테이크']):
-                                    return 'beef_group'
-                                
-                                # 생선 그룹
-                                if any(keyword in title_lower for keyword in ['생선', '연어', '참치', '고등어', '광어', '오징어']):
-                                    return 'fish_group'
-                                
-                                # 김밥 그룹
-                                if any(keyword in title_lower for keyword in ['김밥', '초밥', '롤']):
-                                    return 'gimbap_group'
-                                
-                                # 샐러드 그룹
-                                if any(keyword in title_lower for keyword in ['샐러드', '무침', '채소']):
-                                    return 'salad_group'
-                                
-                                # 기타 (고유 그룹)
-                                return f'other_{hash(title) % 1000}'
+                            get_main_ingredient_group = self._main_ingredient_group
                             
                             # 이미 사용된 재료 그룹 제외 (더 강력한 필터링)
                             filtered_recipes = []
@@ -1235,6 +941,16 @@ class MealPlannerAgent:
                         print(f"⚠️ {slot}: 검색 결과 없음 (2단계에서 생성 예정)")
                 
                 meal_plan_days.append(day_meals)
+                
+                # 스트리밍 요청이면 완성된 일차를 바로 전송 (빈 슬롯은 2단계에서 채워진 뒤 complete 이벤트로 확정)
+                if is_streaming():
+                    emit(
+                        "meal_plan_day",
+                        day=day + 1,
+                        total_days=days,
+                        meals=day_meals,
+                        markdown=self.response_formatter.format_meal_plan_day(day + 1, day_meals)
+                    )
             
             # 부분 성공도 반환 (2단계에서 채움)
             if len(meal_plan_days) == days:
@@ -1302,13 +1018,11 @@ class MealPlannerAgent:
             # 🆕 메뉴 다양성을 위한 재료 그룹 추적
             used_ingredient_groups = global_used_groups if global_used_groups is not None else set()
             
-            # 각 식사별로 한 번에 여러 개 검색
-            meal_collections = {}
             days_count = len(structure)
             
+            from collections import Counter
+            slot_queries = {}
             for slot in ['breakfast', 'lunch', 'dinner']:
-                print(f"🔍 {slot} 레시피 {days_count}개 검색 중...")
-                
                 # AI 구조에서 가장 많이 나온 키워드 추출
                 slot_keywords = []
                 for day_plan in structure:
@@ -1318,24 +1032,21 @@ class MealPlannerAgent:
                 
                 # 가장 많이 나온 키워드로 검색
                 if slot_keywords:
-                    # 가장 많이 나온 키워드 선택
-                    from collections import Counter
                     most_common = Counter(slot_keywords).most_common(1)[0][0]
                     search_query = f"{most_common} 키토 {slot}"
                 else:
                     search_query = f"키토 {slot}"
-                
-                search_results = await self._search_with_diversity(
-                    search_query, constraints, user_id, used_recipes, max_results=days_count * 5,  # 더 많은 후보
-                    allergies=allergies, dislikes=dislikes
-                )
-
+                slot_queries[slot] = [(search_query, days_count * 5)]  # 더 많은 후보
+            
+            # 3개 슬롯을 한 번에 검색 (슬롯 간 중복 제거 포함)
+            print(f"🔍 식사 슬롯 {len(slot_queries)}개 레시피 {days_count}개씩 배치 검색 중...")
+            meal_collections = await hybrid_search_tool.batch_search(
+                slot_queries, user_id=user_id, allergies=allergies, dislikes=dislikes, used_recipes=used_recipes
+            )
+            for slot, search_results in meal_collections.items():
                 if search_results:
-                    # _search_with_diversity에서 이미 중복 제거 완료
-                    meal_collections[slot] = search_results
                     print(f"✅ {slot} 레시피 {len(search_results)}개 수집 완료")
                 else:
-                    meal_collections[slot] = []
                     print(f"❌ {slot} 레시피 검색 실패")
             
             # 7일 식단표 구성
@@ -1350,40 +1061,7 @@ class MealPlannerAgent:
                     else:
                         if slot in meal_collections and len(meal_collections[slot]) > day_idx:
                             # 🆕 다양성 필터링 적용
-                            def get_main_ingredient_group(title):
-                                """메뉴 제목에서 주요 재료 그룹 추출"""
-                                title_lower = title.lower()
-                                
-                                # 계란 그룹 (완전 포괄적인 키워드)
-                                if any(keyword in title_lower for keyword in ['달걀', '계란', 'egg', '에그', '계란말이', '달걀찜', '스크램블', 'scramble', '달갈', '계란볶음', '달걀볶음', '계란샐러드', '달걀샐러드', '삶은달걀', '삶은계란', '프리타타', 'frittata', '지단', '계란지단', '달걀지단', '오믈렛', 'omelette', '동그랑땡', '동그랑떵', '계란탕']):
-                                    return 'egg_group'
-                                
-                                # 닭고기 그룹
-                                if any(keyword in title_lower for keyword in ['닭', '치킨', '닭가슴', '닭다리', '닭날개']):
-                                    return 'chicken_group'
-                                
-                                # 돼지고기 그룹
-                                if any(keyword in title_lower for keyword in ['돼지', '돼지고기', '삼겹', '목살', '베이컨']):
-                                    return 'pork_group'
-                                
-                                # 소고기 그룹
-                                if any(keyword in title_lower for keyword in ['소고기', '소', '한우', '쇠고기', '스테이크']):
-                                    return 'beef_group'
-                                
-                                # 생선 그룹
-                                if any(keyword in title_lower for keyword in ['생선', '연어', '참치', '고등어', '광어', '오징어']):
-                                    return 'fish_group'
-                                
-                                # 김밥 그룹
-                                if any(keyword in title_lower for keyword in ['김밥', '초밥', '롤']):
-                                    return 'gimbap_group'
-                                
-                                # 샐러드 그룹
-                                if any(keyword in title_lower for keyword in ['샐러드', '무침', '채소']):
-                                    return 'salad_group'
-                                
-                                # 기타 (고유 그룹)
-                                return f'other_{hash(title) % 1000}'
+                            get_main_ingredient_group = self._main_ingredient_group
                             
                             # 사용 가능한 레시피들
                             available_recipes = meal_collections[slot]
@@ -2239,6 +1917,12 @@ class MealPlannerAgent:
         """
         print(f"🍽️ 식단 요청 처리 시작: '{message}'")
         
+        # 0. 이전 식단이 있는 스레드의 부분 수정 요청이면 필요한 슬롯만 재계산 (일수 파싱/전체 검색 생략)
+        constraints = self._extract_all_constraints(message, state)
+        edit_result = await self._handle_meal_plan_edit(message, state, constraints)
+        if edit_result is not None:
+            return edit_result
+        
         # 🆕 전역 다양성 추적을 위한 재료 그룹 세트
         global_used_ingredient_groups = set()
         
@@ -2262,11 +1946,17 @@ class MealPlannerAgent:
         print(f"📅 최종 일수: {days}일")
         
         # 🚀 식단 생성 캐싱 로직 (정확 캐시 + 시맨틱 캐시)
-        constraints = self._extract_all_constraints(message, state)
-        cache_key = f"meal_plan_{days}_{constraints.get('kcal_target', '')}_{constraints.get('carbs_max', 30)}_{hash(tuple(sorted(constraints.get('allergies', []))))}_{hash(tuple(sorted(constraints.get('dislikes', []))))}_{state.get('profile', {}).get('user_id', '')}"
+        cache_key = make_key(
+            "meal_plan", days,
+            kcal_target=constraints.get('kcal_target', ''),
+            carbs_max=constraints.get('carbs_max', 30),
+            allergies=normalize_terms(constraints.get('allergies', [])),
+            dislikes=normalize_terms(constraints.get('dislikes', [])),
+            user_id=state.get('profile', {}).get('user_id', ''),
+        )
         
         # 1) Redis 정확 캐시 확인
-        cached_result = redis_cache.get(cache_key)
+        cached_result = await redis_cache.aget(cache_key)
         if cached_result:
             print(f"    📊 Redis 식단 생성 캐시 히트: {days}일 식단 (풀 재조합)")
             try:
@@ -2289,6 +1979,7 @@ class MealPlannerAgent:
                     "formatted_response": formatted_response,
                     "meal_plan_days": days,
                     "meal_plan_data": reshuffled_plan,
+                    "short_circuit": "meal_pool_recombine",  # 캐시 재조합 → 오케스트레이터 answer 노드 생략
                     "tool_calls": [{
                         "tool": "meal_planner",
                         "method": "handle_meal_request(pool_recombine)",
@@ -2297,6 +1988,7 @@ class MealPlannerAgent:
                         "personalized": state.get("use_personalized", False)
                     }]
                 }
+                await self._save_thread_plan(state, reshuffled_plan, constraints)
                 return result_data
             except Exception as e:
                 print(f"  ⚠️ 풀 재조합 실패, 일반 생성으로 폴백: {e}")
@@ -2307,7 +1999,7 @@ class MealPlannerAgent:
                 user_id = state.get("profile", {}).get("user_id", "")
                 model_ver = f"meal_planner_{settings.llm_model}"
                 # 식단 생성의 경우 일수는 제외하고 다른 제약조건만으로 유사도 판단
-                opts_hash = f"meal_plan_{constraints.get('kcal_target', '')}_{constraints.get('carbs_max', 30)}_{hash(tuple(sorted(constraints.get('allergies', []))))}_{hash(tuple(sorted(constraints.get('dislikes', []))))}"
+                opts_hash = f"meal_plan_{constraints.get('kcal_target', '')}_{constraints.get('carbs_max', 30)}_{digest(normalize_terms(constraints.get('allergies', [])), normalize_terms(constraints.get('dislikes', [])), length=16)}"
                 
                 semantic_result = await semantic_cache_service.semantic_lookup(
                     message, user_id, model_ver, opts_hash
@@ -2322,7 +2014,8 @@ class MealPlannerAgent:
                             "type": "meal_plan",
                             "formatted_response": semantic_result
                         }],
-                        "source": "semantic_cache"
+                        "source": "semantic_cache",
+                        "short_circuit": "semantic_cache"
                     }
             except Exception as e:
                 print(f"  ⚠️ 시맨틱 캐시 조회 오류: {e}")
@@ -2467,9 +2160,12 @@ class MealPlannerAgent:
             }]
         }
         
+        # 부분 수정 요청에 대비해 스레드별 최근 식단 기록
+        await self._save_thread_plan(state, meal_plan, constraints)
+        
         # 🚀 풀 캐시 저장 (TTL: 5분) - 최종 결과가 아니라 풀로 저장하여 재조합에 사용
         try:
-            redis_cache.set(cache_key, result_data, ttl=300)
+            await redis_cache.aset(cache_key, result_data, ttl=300)
             print(f"    💾 풀 캐시 저장: {days}일 식단 (TTL 300s)")
         except Exception as e:
             print(f"  ⚠️ 풀 캐시 저장 실패: {e}")
@@ -2480,7 +2176,7 @@ class MealPlannerAgent:
                 user_id = state.get("profile", {}).get("user_id", "")
                 model_ver = f"meal_planner_{settings.llm_model}"
                 # 식단 생성의 경우 일수는 제외하고 다른 제약조건만으로 유사도 판단
-                opts_hash = f"meal_plan_{constraints.get('kcal_target', '')}_{constraints.get('carbs_max', 30)}_{hash(tuple(sorted(constraints.get('allergies', []))))}_{hash(tuple(sorted(constraints.get('dislikes', []))))}"
+                opts_hash = f"meal_plan_{constraints.get('kcal_target', '')}_{constraints.get('carbs_max', 30)}_{digest(normalize_terms(constraints.get('allergies', [])), normalize_terms(constraints.get('dislikes', [])), length=16)}"
                 
                 meta = {
                     "route": "meal_plan",
@@ -2505,6 +2201,282 @@ class MealPlannerAgent:
         
         return result_data
 
+    # ==========================================
+    # 식단 부분 수정 (증분 재생성)
+    # ==========================================
+    
+    PLAN_SLOT_NAMES = {'아침': 'breakfast', '점심': 'lunch', '저녁': 'dinner', '간식': 'snack'}
+    _EDIT_VERB_RE = re.compile(r'바꿔|바꾸|변경|교체|다른\s*(?:걸|것|거|메뉴)|대신|빼|말고|수정|다시')
+    _DAY_SLOT_RE = re.compile(r'(\d+)\s*일\s*차\s*(아침|점심|저녁|간식)?')
+    _ALL_DAYS_RE = re.compile(r'전부|모두|모든|매일|다\s*바')
+    # 기간 명시 ("3일치", "5일", "하루", "일주일") → 새 식단 요청 ("3일차" 같은 일차 지정은 제외)
+    _PLAN_DURATION_RE = re.compile(r'\d+\s*일(?!\s*차)|하루|이틀|사흘|나흘|일주일|한\s*주|주간')
+    # 생성 동사 ("만들어줘", "짜줘", "추천해줘") → 슬롯 지정이 없으면 새 식단 요청
+    _NEW_PLAN_RE = re.compile(r'만들|짜\s*(?:줘|주세요|봐)|생성|추천')
+    
+    @staticmethod
+    def _main_ingredient_group(title):
+        """메뉴 제목에서 주요 재료 그룹 추출"""
+        title_lower = title.lower()
+        
+        # 계란 그룹 (완전 포괄적인 키워드)
+        if any(keyword in title_lower for keyword in ['달걀', '계란', 'egg', '에그', '계란말이', '달걀찜', '스크램블', 'scramble', '달갈', '계란볶음', '달걀볶음', '계란샐러드', '달걀샐러드', '삶은달걀', '삶은계란', '프리타타', 'frittata', '지단', '계란지단', '달걀지단', '오믈렛', 'omelette', '동그랑땡', '동그랑떵', '계란탕']):
+            return 'egg_group'
+        
+        # 닭고기 그룹
+        if any(keyword in title_lower for keyword in ['닭', '치킨', '닭가슴', '닭다리', '닭날개']):
+            return 'chicken_group'
+        
+        # 돼지고기 그룹
+        if any(keyword in title_lower for keyword in ['돼지', '돼지고기', '삼겹', '목살', '베이컨']):
+            return 'pork_group'
+        
+        # 소고기 그룹
+        if any(keyword in title_lower for keyword in ['소고기', '소', '한우', '쇠고기', '스테이크']):
+            return 'beef_group'
+        
+        # 생선 그룹
+        if any(keyword in title_lower for keyword in ['생선', '연어', '참치', '고등어', '광어', '오징어']):
+            return 'fish_group'
+        
+        # 김밥 그룹
+        if any(keyword in title_lower for keyword in ['김밥', '초밥', '롤']):
+            return 'gimbap_group'
+        
+        # 샐러드 그룹
+        if any(keyword in title_lower for keyword in ['샐러드', '무침', '채소']):
+            return 'salad_group'
+        
+        # 기타 (고유 그룹)
+        return f'other_{hash(title) % 1000}'
+    
+    def _parse_plan_edit(self, message: str) -> Optional[Dict[str, Any]]:
+        """
+        식단 부분 수정 요청 파싱 ("3일차 저녁 바꿔줘", "저녁 전부 다른 걸로", "오이 빼줘")
+        기간을 명시하거나 슬롯 지정 없이 생성을 요청하면 ("오이 빼고 3일치 만들어줘") 새 식단으로 처리
+        
+        Returns:
+            {"targets": [(day_idx, slot), ...], "temp_dislikes": [...]} 또는 None (전체 생성)
+        """
+        if self._PLAN_DURATION_RE.search(message):
+            return None
+        has_edit_verb = bool(self._EDIT_VERB_RE.search(message))
+        mentioned_slots = [slot for name, slot in self.PLAN_SLOT_NAMES.items() if name in message]
+        
+        targets = []
+        day_matches = self._DAY_SLOT_RE.findall(message)
+        single_day = len({day_str for day_str, _ in day_matches}) == 1
+        for day_str, slot_name in day_matches:
+            if slot_name and not single_day:
+                slots = [self.PLAN_SLOT_NAMES[slot_name]]
+            else:
+                # 하루만 지정했으면 언급된 슬롯 전체 ("2일차 아침이랑 점심"), 슬롯 언급이 없으면 그날 전체
+                slots = mentioned_slots or list(self.PLAN_SLOT_NAMES.values())
+            targets.extend((int(day_str) - 1, slot) for slot in slots)
+        if not day_matches and mentioned_slots and self._ALL_DAYS_RE.search(message):
+            # 일차 없이 "저녁 전부 바꿔줘" → 모든 날의 해당 슬롯
+            targets = [(day_idx, slot) for day_idx in range(MAX_MEAL_PLAN_DAYS) for slot in mentioned_slots]
+        
+        temp_dislikes = self.temp_dislikes_extractor.extract_from_message(message)
+        if targets and has_edit_verb:
+            return {"targets": list(dict.fromkeys(targets)), "temp_dislikes": temp_dislikes}
+        if temp_dislikes and not self._NEW_PLAN_RE.search(message):
+            # 슬롯 지정 없이 임시 불호만 추가 → 새 제약을 위반하는 슬롯만 재계산
+            return {"targets": [], "temp_dislikes": temp_dislikes}
+        return None
+    
+    async def _load_previous_plan(self, state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """이전 식단 기록 (스레드 상태의 meal_plan_data 우선, 없으면 스레드별 Redis 기록)"""
+        thread_id = state.get("thread_id")
+        record = await redis_cache.aget(make_key("meal_plan_thread", thread_id)) if thread_id else None
+        record = dict(record) if isinstance(record, dict) else {}
+        
+        state_plan = state.get("meal_plan_data")
+        if isinstance(state_plan, dict) and state_plan.get("days"):
+            record["meal_plan_data"] = state_plan
+        
+        plan = record.get("meal_plan_data")
+        if not isinstance(plan, dict) or not plan.get("days"):
+            return None
+        return record
+    
+    async def _save_thread_plan(self, state: Dict[str, Any], meal_plan: Dict[str, Any], constraints: Dict[str, Any]) -> None:
+        """스레드별 최근 식단 기록 (부분 수정 시 재사용)"""
+        thread_id = state.get("thread_id")
+        if not thread_id or not meal_plan:
+            return
+        record = {
+            "meal_plan_data": {k: v for k, v in meal_plan.items() if k != "used_groups"},
+            "allergies": list(constraints.get("allergies") or []),
+            "dislikes": list(constraints.get("dislikes") or []),
+        }
+        try:
+            await redis_cache.aset(make_key("meal_plan_thread", thread_id), record, ttl=86400)
+        except Exception as e:
+            print(f"  ⚠️ 스레드 식단 기록 저장 실패: {e}")
+    
+    def _pick_replacement(self, candidates: List[Dict[str, Any]], used_ids: set, used_groups: set) -> Optional[Dict[str, Any]]:
+        """후보 중 미사용 + 재료 그룹이 겹치지 않는 레시피 선택 (유사도 상위 5개 중 랜덤)"""
+        unused = [r for r in candidates if r.get('id') not in used_ids]
+        diverse = [r for r in unused if self._main_ingredient_group(r.get('title', '')) not in used_groups] or unused
+        if not diverse:
+            return None
+        diverse = sorted(diverse, key=lambda x: x.get('similarity', 0.0), reverse=True)
+        return random.choice(diverse[:5])
+    
+    async def _regenerate_plan_slots(self, record: Dict[str, Any], targets: List[tuple],
+                                     constraints: Dict[str, Any]) -> tuple:
+        """
+        이전 식단에서 지정 슬롯 + 새 제약조건 위반 슬롯만 다시 선택
+        
+        나머지 슬롯은 그대로 두고, 그 레시피 ID/재료 그룹을 사용 중으로 간주해 다양성을 유지한다.
+        계란 아침이 있던 날은 계란 후보에서 다시 골라 계란 배치 날짜를 유지한다.
+        
+        Returns:
+            (새 식단, 변경된 (day_idx, slot) 목록)
+        """
+        import copy
+        from app.tools.meal.korean_search import korean_search_tool
+        from app.tools.meal.exclusion_matcher import get_matcher
+        
+        plan = copy.deepcopy(record["meal_plan_data"])
+        plan_days = plan["days"]
+        allergies = constraints.get("allergies") or []
+        dislikes = constraints.get("dislikes") or []
+        
+        expanded_allergens, expanded_dislikes = korean_search_tool._expand_exclusions(allergies, dislikes)
+        allergen_matcher, dislike_matcher = get_matcher(expanded_allergens), get_matcher(expanded_dislikes)
+        
+        def violates(item):
+            return isinstance(item, dict) and korean_search_tool._is_excluded_row(item, allergen_matcher, dislike_matcher)
+        
+        # 1. 재계산 대상: 지정 슬롯 + 새 제약조건을 위반하는 슬롯
+        targets = [(d, s) for d, s in targets if 0 <= d < len(plan_days)]
+        for day_idx, day in enumerate(plan_days):
+            for slot, item in (day or {}).items():
+                if (day_idx, slot) not in targets and violates(item):
+                    targets.append((day_idx, slot))
+        if not targets:
+            return plan, []
+        
+        # 2. 후보 풀: 새 선호의 풀 → 이전 식단의 풀을 새 제약으로 필터링 → 새로 생성
+        pool = None
+        if settings.meal_pool_enabled:
+            pool = await meal_candidate_pool.get(allergies, dislikes)
+            if pool is None and "allergies" in record:
+                original_pool = await meal_candidate_pool.get(record.get("allergies"), record.get("dislikes"))
+                if original_pool is not None:
+                    pool = {slot: [r for r in items if not violates(r)] for slot, items in original_pool.items()}
+        if pool is None:
+            strategies = self._get_default_meal_strategies()["meal_strategies"]
+            if settings.meal_pool_enabled:
+                pool = await meal_candidate_pool.build(strategies, allergies, dislikes)
+            else:
+                pool = await search_meal_candidates(strategies, len(plan_days), allergies=allergies, dislikes=dislikes)
+        
+        # 3. 유지되는 슬롯 기준으로 사용 중 ID/재료 그룹 구성 (교체 대상의 기존 레시피도 다시 고르지 않음)
+        target_set = set(targets)
+        used_ids, used_groups = set(), set()
+        for day_idx, day in enumerate(plan_days):
+            for slot, item in (day or {}).items():
+                if not isinstance(item, dict):
+                    continue
+                if item.get('id'):
+                    used_ids.add(item['id'])
+                if (day_idx, slot) not in target_set:
+                    used_groups.add(self._main_ingredient_group(item.get('title', '')))
+        
+        changed = []
+        for day_idx, slot in targets:
+            day = plan_days[day_idx] if isinstance(plan_days[day_idx], dict) else {}
+            plan_days[day_idx] = day
+            current = day.get(slot)
+            
+            is_egg_day = (slot == 'breakfast' and isinstance(current, dict)
+                          and self._main_ingredient_group(current.get('title', '')) == 'egg_group')
+            candidates = [r for r in (pool.get(EGG_SLOT) or []) if not violates(r)] if is_egg_day else []
+            if not candidates:
+                candidates = pool.get(slot) or []
+                if slot == 'breakfast':
+                    # 계란 아침은 하루만 (다른 날 아침은 계란 제외)
+                    candidates = [r for r in candidates if self._main_ingredient_group(r.get('title', '')) != 'egg_group'] or candidates
+            
+            selected_recipe = self._pick_replacement(candidates, used_ids, used_groups)
+            if selected_recipe is None:
+                if violates(current):
+                    day[slot] = None
+                    changed.append((day_idx, slot))
+                continue
+            
+            used_ids.add(selected_recipe.get('id'))
+            used_groups.add(self._main_ingredient_group(selected_recipe.get('title', '')))
+            day[slot] = {
+                "type": "recipe",
+                "id": selected_recipe.get('id', f"embedded_{slot}_{day_idx}"),
+                "title": selected_recipe.get('title', f"키토 {slot}"),
+                "content": selected_recipe.get('content', ''),
+                "similarity": selected_recipe.get('similarity', 0.0),
+                "url": selected_recipe.get('url'),
+                "metadata": selected_recipe.get('metadata', {}),
+                "allergens": selected_recipe.get('allergens', []),
+                "ingredients": selected_recipe.get('ingredients', [])
+            }
+            changed.append((day_idx, slot))
+        
+        plan["total_macros"] = self._calculate_total_macros(plan_days)
+        return plan, changed
+    
+    async def _handle_meal_plan_edit(self, message: str, state: Dict[str, Any],
+                                     constraints: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """식단 부분 수정 요청이면 이전 식단에서 필요한 슬롯만 다시 계산 (아니면 None → 전체 생성)"""
+        # 이전 식단이 없는 스레드는 파싱 없이 바로 전체 생성 (신규 요청 경로에 비용 추가 없음)
+        record = await self._load_previous_plan(state)
+        if record is None:
+            return None
+        edit = self._parse_plan_edit(message)
+        if edit is None:
+            return None
+        
+        # 이전 요청의 임시 불호도 유지 (이번 메시지의 임시 불호 + 프로필과 합침)
+        constraints = dict(constraints)
+        constraints["dislikes"] = list(dict.fromkeys([*(record.get("dislikes") or []), *(constraints.get("dislikes") or [])]))
+        
+        print(f"🔄 식단 부분 수정: 지정 슬롯 {len(edit['targets'])}개, 임시 불호 {edit['temp_dislikes']}")
+        meal_plan, changed = await self._regenerate_plan_slots(record, edit["targets"], constraints)
+        days = len(meal_plan.get("days", []))
+        
+        slot_names = {slot: name for name, slot in self.PLAN_SLOT_NAMES.items()}
+        if changed:
+            changed_text = ", ".join(f"{day_idx + 1}일차 {slot_names.get(slot, slot)}" for day_idx, slot in changed)
+            notice = f"🔄 {changed_text} 메뉴를 새로 골랐어요. 나머지 식단은 그대로 유지했습니다."
+        else:
+            notice = "✅ 바꿀 메뉴가 없어요. 현재 식단이 이미 요청 조건을 만족합니다."
+        formatted_response = notice + "\n\n" + self.response_formatter.format_meal_plan(meal_plan, days)
+        
+        await self._save_thread_plan(state, meal_plan, constraints)
+        return {
+            "results": [{
+                "type": "meal_plan",
+                "days": meal_plan.get("days", []),
+                "duration_days": days,
+                "total_macros": meal_plan.get("total_macros"),
+                "notes": meal_plan.get("notes", []),
+                "source": "meal_planner(incremental)"
+            }],
+            "response": formatted_response,
+            "formatted_response": formatted_response,
+            "meal_plan_days": days,
+            "meal_plan_data": meal_plan,
+            "short_circuit": "meal_plan_edit",
+            "tool_calls": [{
+                "tool": "meal_planner",
+                "method": "handle_meal_request(incremental)",
+                "days": days,
+                "changed_slots": len(changed),
+                "personalized": state.get("use_personalized", False)
+            }]
+        }
+    
     def _reshuffle_meal_plan_from_pool(self, base_plan: Dict[str, Any], days: int) -> Dict[str, Any]:
         """캐시된 식단 풀에서 빠르게 재조합하여 새 식단을 생성.
         - 슬롯별 후보를 모아 랜덤 샘플링
@@ -2559,11 +2531,7 @@ class MealPlannerAgent:
         user_id = profile.get("user_id") or ""
 
         def _stable_hash(obj: Any) -> str:
-            import hashlib, json
-            try:
-                return hashlib.sha256(json.dumps(obj, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
-            except Exception:
-                return str(hash(str(obj)))
+            return digest(obj)
 
         def _normalize_msg(msg: str) -> str:
             import re
@@ -2580,10 +2548,9 @@ class MealPlannerAgent:
             "allergies": sorted(constraints.get("allergies", [])),
             "dislikes": sorted(constraints.get("dislikes", [])),
         }
-        stable_key = _stable_hash(stable_key_payload)
-        pool_key = f"recipe_pool:{stable_key}"
-        used_key = f"recipe_pool_used:{stable_key}"
-        last_top3_key = f"recipe_pool_last_top3:{stable_key}"
+        pool_key = make_key("recipe_pool", stable_key_payload)
+        used_key = f"{pool_key}:used"
+        last_top3_key = f"{pool_key}:last_top3"
         TTL_SECONDS = 3600
 
         def _item_id(it: Dict[str, Any]) -> str:
@@ -2659,9 +2626,11 @@ class MealPlannerAgent:
                     if it not in sel: sel.append(it)
             return sel[:3]
 
-        pool: List[Dict[str, Any]] = redis_cache.get(pool_key) or []
-        used_ids: List[str] = redis_cache.get(used_key) or []
-        last_top3_ids: List[str] = redis_cache.get(last_top3_key) or []
+        # 풀/사용 이력/직전 TOP3를 한 번의 왕복(MGET)으로 조회
+        cached_pool, cached_used, cached_last3 = await redis_cache.amget([pool_key, used_key, last_top3_key])
+        pool: List[Dict[str, Any]] = cached_pool or []
+        used_ids: List[str] = cached_used or []
+        last_top3_ids: List[str] = cached_last3 or []
 
         # 풀이 없으면 초기화 (RAG TopN 수집) 후 상위 3개 즉시 반환
         if not pool:
@@ -2672,12 +2641,14 @@ class MealPlannerAgent:
             if not results:
                 return {"results": [], "response": "조건에 맞는 레시피를 찾지 못했어요.", "tool_calls": []}
             pool = results
-            redis_cache.set(pool_key, pool, ttl=TTL_SECONDS)
             first3 = pool[:3]
             new_used = used_ids + [_item_id(it) for it in first3]
             keep_n = max(0, len(pool) - 1)
-            redis_cache.set(used_key, new_used[-keep_n:], ttl=TTL_SECONDS)
-            redis_cache.set(last_top3_key, [_item_id(it) for it in first3], ttl=TTL_SECONDS)
+            await redis_cache.amset({
+                pool_key: pool,
+                used_key: new_used[-keep_n:],
+                last_top3_key: [_item_id(it) for it in first3],
+            }, ttl=TTL_SECONDS)
             return {
                 "results": [
                     {
@@ -2704,7 +2675,7 @@ class MealPlannerAgent:
                     if iid not in seen:
                         pool.append(it)
                         seen.add(iid)
-                redis_cache.set(pool_key, pool, ttl=TTL_SECONDS)
+                await redis_cache.aset(pool_key, pool, ttl=TTL_SECONDS)
                 print(f"🔄 레시피 풀 자동 보충: {len(pool)}개")
             except Exception:
                 pass
@@ -2717,8 +2688,10 @@ class MealPlannerAgent:
 
         new_used = used_ids + [_item_id(it) for it in selection]
         keep_n = max(0, len(pool) - 1)
-        redis_cache.set(used_key, new_used[-keep_n:], ttl=TTL_SECONDS)
-        redis_cache.set(last_top3_key, [_item_id(it) for it in selection], ttl=TTL_SECONDS)
+        await redis_cache.amset({
+            used_key: new_used[-keep_n:],
+            last_top3_key: [_item_id(it) for it in selection],
+        }, ttl=TTL_SECONDS)
 
         return {
             "results": [
@@ -2845,19 +2818,14 @@ class MealPlannerAgent:
         Returns:
             bool: fast_mode 여부
         """
-        # 정확한 검색이 필요한 키워드
-        accurate_keywords = ["정확한", "자세한", "맞춤", "개인", "추천", "최적"]
-        
-        # 빠른 응답이 필요한 키워드
-        fast_keywords = ["빠르게", "간단히", "대충", "아무거나", "급해"]
-        
-        message_lower = message.lower()
+        matches = keyword_router.scan(message)
         
-        if any(keyword in message_lower for keyword in accurate_keywords):
+        # 정확한 검색 키워드 우선
+        if matches.has("planner_fast_mode.accurate"):
             print("🔍 정확한 검색 모드")
             return False
         
-        if any(keyword in message_lower for keyword in fast_keywords):
+        if matches.has("planner_fast_mode.fast"):
             print("⚡ 빠른 검색 모드")
             return True
         
@@ -22,8 +22,7 @@ from app.core.config import settings
 from config import get_personal_configs, get_agent_config
 from app.core.llm_factory import create_chat_llm
 from app.core.redis_cache import redis_cache
-import hashlib
-import json
+from app.core.cache_keys import make_key
 import random
 import re
 
@@ -267,22 +266,24 @@ class PlaceSearchAgent:
                 "radius_km": radius_km,
                 "user_id": user_id,
             }
-            stable_key = hashlib.sha256(json.dumps(stable_key_obj, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
-            pool_key = f"place_pool:{stable_key}"
-            idx_key = f"place_pool_idx:{stable_key}"
-            pool_data = redis_cache.get(pool_key) if redis_cache else None
+            pool_key = make_key("place_pool", stable_key_obj)
+            idx_key = f"{pool_key}:idx"
+            used_key = f"{idx_key}:used"
+            last_top3_key = f"{idx_key}:last_top3"
+            # 풀/사용 이력/직전 TOP3를 한 번의 왕복(MGET)으로 조회
+            pool_data, used_list, last_top3 = (
+                await redis_cache.amget([pool_key, used_key, last_top3_key])
+                if redis_cache else (None, None, None)
+            )
             if pool_data and isinstance(pool_data, dict):
                 pool = pool_data.get("pool", [])
                 if pool:
                     # 사용 이력 기반 다양성 보장(미사용 우선 → 부족 시 재사용)
-                    used_key = f"{idx_key}:used"
-                    last_top3_key = f"{idx_key}:last_top3"
-                    used_list = redis_cache.get(used_key) or []
+                    used_list = used_list or []
                     last_top3_pairs = set()
                     try:
-                        last_top3 = redis_cache.get(last_top3_key) or []
                         # 저장 형태: "placeId|menuKey" 리스트
-                        last_top3_pairs = set(str(x) for x in last_top3)
+                        last_top3_pairs = set(str(x) for x in (last_top3 or []))
                     except Exception:
                         last_top3_pairs = set()
                     try:
@@ -389,12 +390,11 @@ class PlaceSearchAgent:
                     if len(used_list) > max_used:
                         used_list = used_list[-max_used:]
                     ttl = pool_data.get("ttl", 1800)
-                    redis_cache.set(used_key, used_list, ttl=ttl)
-                    # 직전 TOP3 메뉴 갱신
-                    try:
-                        redis_cache.set(last_top3_key, picked_top3_pairs[:3], ttl=ttl)
-                    except Exception:
-                        pass
+                    # 사용 이력 + 직전 TOP3 메뉴 갱신 (파이프라인 1회)
+                    await redis_cache.amset({
+                        used_key: used_list,
+                        last_top3_key: picked_top3_pairs[:3],
+                    }, ttl=ttl)
                     print(f"    📦 장소 풀 캐시 히트: {len(pool)}개 중 선택 {selected} (상위 3 슬롯에 배치)")
                     return result
         except Exception as e:
@@ -568,8 +568,10 @@ class PlaceSearchAgent:
 
                 if pool_candidates:
                     ttl = 1800  # 30분
-                    redis_cache.set(pool_key, {"pool": pool_candidates, "ttl": ttl}, ttl=ttl)
-                    redis_cache.set(idx_key, 0, ttl=ttl)
+                    await redis_cache.amset({
+                        pool_key: {"pool": pool_candidates, "ttl": ttl},
+                        idx_key: 0,
+                    }, ttl=ttl)
                     print(f"    💾 장소 풀 캐시 저장: {len(pool_candidates)}개")
             except Exception as e:
                 print(f"    ⚠️ 장소 풀 캐시 저장 오류: {e}")
@@ -0,0 +1,180 @@
+"""
+캐시 값 코덱 (Redis 저장용 바이너리 직렬화)
+- float32 packed 벡터 (임베딩)
+- msgpack (dict/list, 미설치 시 JSON 바이트로 대체)
+- 임계 크기 이상이면 zlib 압축
+- 헤더가 없는 기존 JSON 문자열 값도 그대로 읽을 수 있음
+"""
+
+import json
+import logging
+import sys
+import zlib
+from array import array
+from typing import Any, Dict, Optional
+
+try:
+    import msgpack  # type: ignore
+except ImportError:  # 선택 의존성
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+# 헤더: MAGIC(1) + codec_id(1) + flags(1)
+# 0xC1 은 UTF-8 에서 절대 나오지 않는 바이트라 기존 JSON 텍스트와 충돌하지 않는다.
+MAGIC = 0xC1
+FLAG_ZLIB = 0x01
+
+# 이 길이 이상인 float 리스트만 벡터 코덱으로 저장 (점수 리스트 등 짧은 값은 정밀도 유지)
+VECTOR_MIN_DIM = 64
+
+
+class Codec:
+    """코덱 기본 클래스"""
+
+    codec_id: int = 0
+    name: str = ""
+
+    def matches(self, value: Any) -> bool:
+        return False
+
+    def dumps(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+
+class Float32VectorCodec(Codec):
+    """float 리스트 → float32 little-endian 바이트 (1536차원 ≈ 6KB)"""
+
+    codec_id = ord("v")
+    name = "float32"
+
+    def matches(self, value: Any) -> bool:
+        return (
+            isinstance(value, list)
+            and len(value) >= VECTOR_MIN_DIM
+            and all(type(x) is float for x in value)
+        )
+
+    def dumps(self, value: Any) -> bytes:
+        arr = array("f", value)
+        if sys.byteorder != "little":
+            arr.byteswap()
+        return arr.tobytes()
+
+    def loads(self, data: bytes) -> Any:
+        arr = array("f")
+        arr.frombytes(data)
+        if sys.byteorder != "little":
+            arr.byteswap()
+        return arr.tolist()
+
+
+class MsgpackCodec(Codec):
+    """dict/list 등 일반 값 (msgpack)"""
+
+    codec_id = ord("m")
+    name = "msgpack"
+
+    def matches(self, value: Any) -> bool:
+        return msgpack is not None
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+class JsonCodec(Codec):
+    """JSON UTF-8 바이트 (최종 폴백)"""
+
+    codec_id = ord("j")
+    name = "json"
+
+    def matches(self, value: Any) -> bool:
+        return True
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data.decode("utf-8"))
+
+
+# 자동 선택 순서 (앞에서부터 matches 검사)
+_CODECS = [Float32VectorCodec(), MsgpackCodec(), JsonCodec()]
+_CODECS_BY_ID: Dict[int, Codec] = {c.codec_id: c for c in _CODECS}
+_CODECS_BY_NAME: Dict[str, Codec] = {c.name: c for c in _CODECS}
+
+
+def register_codec(codec: Codec, first: bool = False) -> None:
+    """코덱 추가 등록 (first=True 이면 자동 선택 우선순위 최상단)"""
+    if codec.codec_id in _CODECS_BY_ID and _CODECS_BY_ID[codec.codec_id] is not codec:
+        raise ValueError(f"이미 등록된 codec_id: {codec.codec_id!r}")
+    if first:
+        _CODECS.insert(0, codec)
+    else:
+        _CODECS.insert(len(_CODECS) - 1, codec)  # JSON 폴백 앞
+    _CODECS_BY_ID[codec.codec_id] = codec
+    _CODECS_BY_NAME[codec.name] = codec
+
+
+def encode(value: Any, codec: Optional[str] = None, compress_threshold: int = 4096) -> bytes:
+    """값을 헤더 포함 바이트로 인코딩
+
+    Args:
+        value: 저장할 값
+        codec: 강제할 코덱 이름 ("float32", "msgpack", "json"), None 이면 자동 선택
+        compress_threshold: 이 크기(바이트) 이상이면 zlib 압축, 0 이하이면 압축 안 함
+    """
+    if codec:
+        candidates = [_CODECS_BY_NAME[codec]]
+    else:
+        candidates = [c for c in _CODECS if c.matches(value)]
+
+    payload = b""
+    chosen: Optional[Codec] = None
+    for candidate in candidates:
+        try:
+            payload = candidate.dumps(value)
+            chosen = candidate
+            break
+        except Exception as e:
+            # msgpack 이 처리하지 못하는 타입 등 → 다음 코덱으로
+            logger.debug("캐시 코덱 %s 인코딩 실패, 다음 코덱 시도: %r", candidate.name, e)
+    if chosen is None:
+        payload = JsonCodec().dumps(value)  # 여기서도 실패하면 예외를 호출자에 전달
+        chosen = _CODECS_BY_ID[JsonCodec.codec_id]
+
+    flags = 0
+    if compress_threshold > 0 and len(payload) >= compress_threshold:
+        compressed = zlib.compress(payload, 1)
+        if len(compressed) < len(payload):
+            payload = compressed
+            flags |= FLAG_ZLIB
+
+    return bytes((MAGIC, chosen.codec_id, flags)) + payload
+
+
+def decode(raw: Any) -> Any:
+    """encode() 결과 또는 기존 JSON 문자열을 값으로 복원"""
+    if raw is None:
+        return None
+    if isinstance(raw, str):
+        return json.loads(raw)
+    data = bytes(raw)
+    if len(data) < 3 or data[0] != MAGIC:
+        # 헤더 없는 기존 포맷 (json.dumps 문자열)
+        return json.loads(data.decode("utf-8"))
+
+    codec_id, flags = data[1], data[2]
+    payload = data[3:]
+    if flags & FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+    codec = _CODECS_BY_ID.get(codec_id)
+    if codec is None:
+        raise ValueError(f"알 수 없는 캐시 코덱: {codec_id!r}")
+    return codec.loads(payload)
@@ -0,0 +1,86 @@
+"""
+캐시 키 생성 모듈
+프로세스/워커와 무관하게 항상 같은 키를 만든다 (Python 내장 hash()는 프로세스마다 salt가 달라 사용 금지)
+
+키 형식: {namespace}:v{버전}:{digest}
+- 버전 = 전역 CACHE_KEY_VERSION + 네임스페이스별 버전
+- 배포 시 CACHE_NAMESPACE_VERSIONS="search=2,query_emb=3" 처럼 올리면
+  해당 네임스페이스의 기존 키는 더 이상 조회되지 않고 TTL로 자연 소멸한다.
+"""
+
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, Optional
+
+# 네임스페이스별 스키마 버전 (값 구조가 바뀌면 코드에서 올린다)
+NAMESPACE_VERSIONS: Dict[str, int] = {
+    "search": 2,            # KoreanSearchTool 검색 후보 풀 (v2: 다양성 적용 전 후보 풀 저장)
+    "query_emb": 2,         # 쿼리 임베딩 (v2: EmbeddingService 공용 키, 원문 NFC 기준)
+    "intent": 1,            # IntentClassifier LLM 분류 결과 (정규화 문장 기준)
+    "general_chat": 1,      # ChatAgent 일반 대화 결과
+    "general_chat_resp": 1, # ChatAgent 일반 대화 응답 텍스트
+    "meal_plan": 1,         # 식단 생성 풀 캐시
+    "meal_plan_thread": 1,  # 스레드별 최근 식단 (부분 수정용)
+    "recipe_pool": 1,       # 레시피 회전 풀
+    "meal_candidates": 1,   # 선호 해시별 식단 슬롯 후보 풀
+    "place_pool": 1,        # 장소 회전 풀
+    "restaurant": 1,        # 식당 검색 풀/회전 이력
+}
+
+_WS_RE = re.compile(r"\s+")
+
+
+def _load_overrides(raw: str) -> Dict[str, int]:
+    """"search=2,query_emb=3" 형식의 환경변수 파싱"""
+    overrides: Dict[str, int] = {}
+    for item in (raw or "").split(","):
+        name, sep, value = item.partition("=")
+        if sep and name.strip() and value.strip().isdigit():
+            overrides[name.strip()] = int(value.strip())
+    return overrides
+
+
+GLOBAL_VERSION: str = os.getenv("CACHE_KEY_VERSION", "1").strip() or "1"
+NAMESPACE_VERSIONS.update(_load_overrides(os.getenv("CACHE_NAMESPACE_VERSIONS", "")))
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """키 생성용 텍스트 정규화 (NFC + 소문자 + 공백 정리)"""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFC", str(text))
+    return _WS_RE.sub(" ", text).strip().lower()
+
+
+def normalize_terms(terms: Optional[Iterable[str]]) -> list:
+    """알레르기/비선호 같은 단어 집합 정규화 (순서·중복·대소문자 무관)"""
+    return sorted({normalize_text(t) for t in (terms or []) if t and normalize_text(t)})
+
+
+def digest(*parts: Any, length: int = 32) -> str:
+    """임의 값들의 안정적인 해시 (JSON 정렬 직렬화 → blake2b)"""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=max(8, length // 2)).hexdigest()[:length]
+
+
+def namespace_version(namespace: str) -> str:
+    return f"v{GLOBAL_VERSION}.{NAMESPACE_VERSIONS.get(namespace, 1)}"
+
+
+def make_key(namespace: str, *parts: Any, **fields: Any) -> str:
+    """네임스페이스 + 버전 + digest 로 캐시 키 생성
+
+    Example:
+        make_key("query_emb", normalize_text(query))
+        make_key("search", normalize_text(query), k=5, allergies=normalize_terms(allergies))
+    """
+    return f"{namespace}:{namespace_version(namespace)}:{digest(list(parts), fields)}"
+
+
+def bump_namespace(namespace: str) -> str:
+    """현재 프로세스에서 네임스페이스 버전 증가 (테스트/운영 스크립트용), 새 버전 반환"""
+    NAMESPACE_VERSIONS[namespace] = NAMESPACE_VERSIONS.get(namespace, 1) + 1
+    return namespace_version(namespace)
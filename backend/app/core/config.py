@@ -4,6 +4,7 @@
 """
 
 import os
+from pathlib import Path
 try:
     from pydantic_settings import BaseSettings, SettingsConfigDict
 except ImportError:
@@ -23,6 +24,16 @@ class Settings(BaseSettings):
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
     embedding_model: str = os.getenv("EMBEDDING_MODEL", "")
     
+    # 임베딩 서비스 (요청 배치/병합 + 캐시)
+    embedding_batch_window_ms: float = float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "10"))
+    embedding_max_batch: int = int(os.getenv("EMBEDDING_MAX_BATCH", "64"))
+    embedding_cache_ttl: int = int(os.getenv("EMBEDDING_CACHE_TTL", str(7 * 24 * 3600)))  # 0이면 캐시 안 함
+    embedding_store_enabled: bool = os.getenv("EMBEDDING_STORE_ENABLED", "true").lower() == "true"  # 로컬 mmap 영구 저장소
+    embedding_store_dir: str = os.getenv(
+        "EMBEDDING_STORE_DIR", str(Path(__file__).resolve().parents[2] / "data" / "embedding_store")
+    )
+    embedding_store_max_rows: int = int(os.getenv("EMBEDDING_STORE_MAX_ROWS", "50000"))  # 모델별 행 수 상한, 넘으면 빈 세대로 재구축 (0이면 무제한)
+    
     # 공통 LLM 설정
     llm_provider: str = os.getenv("LLM_PROVIDER", "gemini").lower()
     llm_model: str = os.getenv(
@@ -92,6 +103,9 @@ class Settings(BaseSettings):
     intent_classifier_temperature: float = float(os.getenv("INTENT_CLASSIFIER_TEMPERATURE", "0.0"))
     intent_classifier_max_tokens: int = int(os.getenv("INTENT_CLASSIFIER_MAX_TOKENS", "1024"))
     intent_classifier_timeout: int = int(os.getenv("INTENT_CLASSIFIER_TIMEOUT", "5"))
+    intent_fast_path_enabled: bool = os.getenv("INTENT_FAST_PATH_ENABLED", "true").lower() == "true"  # 로컬 빠른 분류 (모델 파일이 있을 때만)
+    intent_cache_ttl: int = int(os.getenv("INTENT_CACHE_TTL", "7200"))  # LLM 의도 분류 결과 캐시(초)
+    intent_cache_negative_ttl: int = int(os.getenv("INTENT_CACHE_NEGATIVE_TTL", "300"))  # 분류 실패(폴백) 결과 캐시(초)
     
     # 외부 API 설정
     kakao_rest_key: str = os.getenv("KAKAO_REST_KEY", "")
@@ -103,6 +117,14 @@ class Settings(BaseSettings):
     # RAG 설정
     max_search_results: int = int(os.getenv("MAX_SEARCH_RESULTS", "5"))
     similarity_threshold: float = float(os.getenv("SIMILARITY_THRESHOLD", "0.7"))
+    korean_search_leg_timeout: float = float(os.getenv("KOREAN_SEARCH_LEG_TIMEOUT", "8"))  # 검색 레그별 타임아웃(초)
+    fused_search_enabled: bool = os.getenv("FUSED_SEARCH_ENABLED", "true").lower() == "true"  # fused_recipe_search RPC 우선 사용
+    fused_search_mode: str = os.getenv("FUSED_SEARCH_MODE", "weighted")  # weighted | rrf
+    ingredient_mask_rpc_enabled: bool = os.getenv("INGREDIENT_MASK_RPC_ENABLED", "false").lower() == "true"  # recipe_ingredient_mask.sql 적용 후 활성화
+    recipe_ann_enabled: bool = os.getenv("RECIPE_ANN_ENABLED", "false").lower() == "true"  # 로컬 레시피 벡터 인덱스
+    recipe_ann_sync_interval: float = float(os.getenv("RECIPE_ANN_SYNC_INTERVAL", "300"))  # 증분 동기화 주기(초)
+    meal_pool_enabled: bool = os.getenv("MEAL_POOL_ENABLED", "true").lower() == "true"  # 선호별 식단 후보 풀 (빠른 모드)
+    meal_pool_refresh_interval: float = float(os.getenv("MEAL_POOL_REFRESH_INTERVAL", "600"))  # 레시피 변경 확인 주기(초)
     
     # 캐시 설정
     enable_cache: bool = os.getenv("ENABLE_CACHE", "true").lower() == "true"
@@ -111,6 +133,21 @@ class Settings(BaseSettings):
     # Redis 설정
     redis_url: str = os.getenv("REDIS_URL", "")
     redis_enabled: bool = os.getenv("REDIS_ENABLED", "false").lower() == "true"
+    redis_max_connections: int = int(os.getenv("REDIS_MAX_CONNECTIONS", "20"))
+    cache_compress_threshold: int = int(os.getenv("CACHE_COMPRESS_THRESHOLD", "4096"))  # bytes, 0이면 압축 안 함
+    
+    # 프로세스 내 L1 메모리 캐시 설정 (RedisCache 앞단)
+    memory_cache_max_entries: int = int(os.getenv("MEMORY_CACHE_MAX_ENTRIES", "2000"))
+    memory_cache_max_bytes: int = int(os.getenv("MEMORY_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))  # 64MB
+    memory_cache_sweep_interval: float = float(os.getenv("MEMORY_CACHE_SWEEP_INTERVAL", "60"))
+    memory_cache_backfill_ttl: float = float(os.getenv("MEMORY_CACHE_BACKFILL_TTL", "300"))  # Redis 히트 값을 L1 에 채울 때 최대 TTL(초)
+    
+    # 지연 시간 추적 (span) 설정
+    tracing_enabled: bool = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+    trace_window_seconds: float = float(os.getenv("TRACE_WINDOW_SECONDS", "900"))  # /admin/latency 백분위 집계 구간(초)
+    trace_json_path: str = os.getenv("TRACE_JSON_PATH", "")  # 지정 시 span 을 JSON Lines 로 기록
+    trace_otel_enabled: bool = os.getenv("TRACE_OTEL_ENABLED", "false").lower() == "true"  # opentelemetry 설치 필요
+    trace_breakdown_min_ms: float = float(os.getenv("TRACE_BREAKDOWN_MIN_MS", "1000"))  # 이보다 느린 요청만 구간별 요약 출력
     
     # 시맨틱 캐시 설정
     semantic_cache_enabled: bool = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
@@ -0,0 +1,240 @@
+"""
+공용 임베딩 서비스
+OpenAI 임베딩 호출을 한 곳으로 모아 배치/중복 제거/캐싱을 적용한다.
+
+- 짧은 시간 창(batch window) 안에 들어온 요청을 input=[...] 한 번의 호출로 묶음
+- 같은 텍스트가 이미 요청 중이면 기존 Future 를 공유 (in-flight 중복 제거)
+- 결과는 로컬 mmap 저장소(EmbeddingStore) + RedisCache(L1 메모리 + Redis, float32 코덱)에 저장해
+  재시작/새 워커에서도 OpenAI 호출 없이 재사용
+"""
+
+import asyncio
+import logging
+import unicodedata
+from typing import Dict, List, Optional, Sequence
+
+import openai
+
+from app.core.cache_keys import make_key
+from app.core.config import settings
+from app.core.embedding_store import EmbeddingStore
+from app.core.redis_cache import redis_cache
+from app.core.tracing import span
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = "text-embedding-3-small"
+
+
+class EmbeddingService:
+    """배치 + 요청 병합(coalescing) 임베딩 서비스
+
+    - batch_window: 첫 요청 이후 추가 요청을 기다리는 시간(초)
+    - max_batch: 한 번의 API 호출에 담을 최대 텍스트 수 (가득 차면 즉시 전송)
+    - cache_ttl: 임베딩 캐시 TTL(초), 0 이하이면 캐시 사용 안 함
+    - store: 로컬 영구 저장소 (None 이면 Redis 캐시만 사용)
+    """
+
+    def __init__(self, model: Optional[str] = None, batch_window: float = 0.01,
+                 max_batch: int = 64, cache_ttl: int = 7 * 24 * 3600,
+                 store: Optional[EmbeddingStore] = None):
+        self.model = model or settings.embedding_model or DEFAULT_EMBEDDING_MODEL
+        self.batch_window = max(0.0, float(batch_window))
+        self.max_batch = max(1, int(max_batch))
+        self.cache_ttl = int(cache_ttl)
+        self.store = store
+        self._client: Optional[openai.AsyncOpenAI] = None
+
+        # 이벤트 루프별 상태 (Future 는 생성된 루프에서만 사용 가능)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._queue: List[str] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+        # 카운터 (상태 엔드포인트 노출용)
+        self.requested = 0
+        self.store_hits = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.api_calls = 0
+        self.api_texts = 0
+        self.api_errors = 0
+
+    # ---------- 공개 API ----------
+
+    async def embed(self, text: str) -> List[float]:
+        """텍스트 1개 임베딩 (실패 시 예외 전달)"""
+        return (await self.embed_many([text]))[0]
+
+    async def embed_many(self, texts: Sequence[str]) -> List[List[float]]:
+        """텍스트 여러 개 임베딩 (입력 순서대로 반환, 빈 텍스트는 [])"""
+        normalized = [self._normalize(t) for t in texts]
+        unique = [t for t in dict.fromkeys(normalized) if t]
+        self.requested += len(unique)
+
+        resolved: Dict[str, List[float]] = {}
+        misses = unique
+        if misses and self.store is not None:
+            # 1. 로컬 mmap 저장소 (네트워크 왕복 없음)
+            # 저장소 락은 다른 스레드의 put_many(파일 락 대기/쓰기) 동안 잡혀 있을 수 있으므로 스레드에서 조회
+            stored = await asyncio.to_thread(self.store.get_many, self.model, misses)
+            resolved.update((t, v) for t, v in zip(misses, stored) if v)
+            misses = [t for t in misses if t not in resolved]
+            self.store_hits += len(resolved)
+
+        if misses and self.cache_ttl > 0:
+            # 2. Redis (다른 호스트의 워커가 만든 임베딩)
+            cached = await redis_cache.amget([self._cache_key(t) for t in misses])
+            from_redis = {t: v for t, v in zip(misses, cached) if v}
+            if from_redis:
+                resolved.update(from_redis)
+                misses = [t for t in misses if t not in from_redis]
+                self.cache_hits += len(from_redis)
+                await self._persist_local(from_redis)
+
+        if misses:
+            # 다른 요청과 배치로 묶이므로 대기 시간(배치 윈도 포함)을 측정
+            with span("embedding", model=self.model, texts=len(misses)):
+                # 공유 Future 는 shield: 이 호출자가 취소돼도 같은 텍스트를 기다리는 다른 호출자에게 전파되지 않음
+                futures = [asyncio.shield(self._enqueue(t)) for t in misses]
+                results = await asyncio.gather(*futures)
+            resolved.update(zip(misses, results))
+
+        return [resolved.get(t, []) if t else [] for t in normalized]
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "model": self.model,
+            "requested": self.requested,
+            "store_hits": self.store_hits,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "api_calls": self.api_calls,
+            "api_texts": self.api_texts,
+            "api_errors": self.api_errors,
+            "avg_batch_size": round(self.api_texts / self.api_calls, 2) if self.api_calls else 0.0,
+            "inflight": len(self._inflight),
+            "store": self.store.stats() if self.store is not None else None,
+        }
+
+    # ---------- 내부 유틸 ----------
+
+    @staticmethod
+    def _normalize(text: Optional[str]) -> str:
+        # 임베딩 입력 자체는 바꾸지 않도록 NFC + 양끝 공백만 정리
+        return unicodedata.normalize("NFC", text or "").strip()
+
+    def _cache_key(self, text: str) -> str:
+        return make_key("query_emb", self.model, text)
+
+    async def _persist_local(self, items: Dict[str, List[float]]) -> None:
+        if self.store is not None and items:
+            # 파일 락/쓰기는 스레드에서 (이벤트 루프 차단 방지)
+            await asyncio.to_thread(self.store.put_many, self.model, items)
+
+    def _get_client(self) -> openai.AsyncOpenAI:
+        if self._client is None:
+            self._client = openai.AsyncOpenAI(api_key=settings.openai_api_key)
+        return self._client
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # 스크립트의 asyncio.run() 반복 호출 등으로 루프가 바뀌면 상태 초기화
+            self._loop = loop
+            self._inflight = {}
+            self._queue = []
+            self._flush_handle = None
+            self._tasks = set()
+            self._client = None
+        return loop
+
+    def _enqueue(self, text: str) -> asyncio.Future:
+        loop = self._bind_loop()
+        future = self._inflight.get(text)
+        if future is not None:
+            self.coalesced += 1
+            return future
+
+        future = loop.create_future()
+        self._inflight[text] = future
+        self._queue.append(text)
+
+        if len(self._queue) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        while self._queue:
+            batch, self._queue = self._queue[:self.max_batch], self._queue[self.max_batch:]
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[str]) -> None:
+        self.api_calls += 1
+        self.api_texts += len(batch)
+        try:
+            response = await self._get_client().embeddings.create(model=self.model, input=batch)
+            embeddings = [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+            if len(embeddings) != len(batch):
+                raise RuntimeError(f"임베딩 응답 개수 불일치: 요청 {len(batch)}개, 응답 {len(embeddings)}개")
+        except Exception as e:
+            self.api_errors += 1
+            logger.warning("임베딩 배치 호출 실패 (%d개): %r", len(batch), e)
+            for text in batch:
+                future = self._inflight.pop(text, None)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+            return
+
+        for text, embedding in zip(batch, embeddings):
+            future = self._inflight.pop(text, None)
+            if future is not None and not future.done():
+                future.set_result(embedding)
+
+        fresh = dict(zip(batch, embeddings))
+        await self._persist_local(fresh)
+        if self.cache_ttl > 0:
+            try:
+                await redis_cache.amset(
+                    {self._cache_key(t): e for t, e in fresh.items()},
+                    ttl=self.cache_ttl, codec="float32",
+                )
+            except Exception as e:
+                logger.warning("임베딩 캐시 저장 실패: %r", e)
+
+
+# 모든 모델이 공유하는 로컬 영구 저장소 (모델별 파일)
+embedding_store: Optional[EmbeddingStore] = (
+    EmbeddingStore(settings.embedding_store_dir, settings.embedding_store_max_rows) if settings.embedding_store_enabled else None
+)
+
+
+def _create_service(model: Optional[str] = None) -> EmbeddingService:
+    return EmbeddingService(
+        model=model,
+        batch_window=settings.embedding_batch_window_ms / 1000.0,
+        max_batch=settings.embedding_max_batch,
+        cache_ttl=settings.embedding_cache_ttl,
+        store=embedding_store,
+    )
+
+
+# 기본 인스턴스 (settings.embedding_model)
+embedding_service = _create_service()
+_services: Dict[str, EmbeddingService] = {embedding_service.model: embedding_service}
+
+
+def get_embedding_service(model: Optional[str] = None) -> EmbeddingService:
+    """모델별 임베딩 서비스 (DB 임베딩과 모델을 맞춰야 하는 검색 도구용)"""
+    name = model or embedding_service.model
+    if name not in _services:
+        _services[name] = _create_service(name)
+    return _services[name]
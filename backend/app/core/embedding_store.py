@@ -0,0 +1,297 @@
+"""
+로컬 영구 임베딩 저장소
+append-only float32 행렬 파일을 mmap 으로 읽어 재시작/새 워커에서도 즉시 캐시 히트
+
+파일 구성 (모델별):
+- {model}.f32  : float32 little-endian 행렬 (행 = 임베딩 1개, append-only)
+- {model}.idx  : 16바이트 키 digest 레코드 (i번째 레코드 ↔ i번째 행, append-only)
+- {model}.dim  : 벡터 차원 (첫 append 시 기록)
+- {model}.lock : 다중 워커 append 직렬화용 (fcntl.flock)
+- {model}.gen  : 현재 세대 번호 (없으면 0, 세대 N>0 의 파일은 {model}.N.f32 / {model}.N.idx)
+
+읽기는 락 없이 mmap(ACCESS_READ)으로 하고, 다른 워커가 추가한 행은
+인덱스 파일 크기가 늘어난 것을 보고 꼬리 부분만 다시 읽는다.
+행 수가 max_rows 를 넘으면 새 세대의 빈 파일로 다시 시작한다 (이전 세대 파일은 삭제,
+이미 mmap 한 워커는 다음 조회 실패 시 세대 변경을 보고 새 파일로 전환).
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import re
+import sys
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import fcntl  # type: ignore
+except ImportError:  # Windows: 프로세스 간 락 없이 단일 워커 기준으로 동작
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+KEY_BYTES = 16
+_SAFE_NAME_RE = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def _key_digest(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=KEY_BYTES).digest()
+
+
+class _ModelStore:
+    """모델 1개 분량의 행렬 + 인덱스 파일"""
+
+    def __init__(self, directory: Path, model: str, max_rows: int = 0):
+        self.directory = directory
+        self.name = _SAFE_NAME_RE.sub("_", model)
+        self.max_rows = max_rows
+        self.dim_path = directory / f"{self.name}.dim"
+        self.lock_path = directory / f"{self.name}.lock"
+        self.gen_path = directory / f"{self.name}.gen"
+
+        self.dim: Optional[int] = None
+        self._mm: Optional[mmap.mmap] = None
+        self._mm_size = 0
+        self._lock = threading.RLock()
+        self.rebuilds = 0
+        self._switch_generation(0)
+
+    # ---------- 세대 ----------
+
+    def _read_generation(self) -> int:
+        try:
+            return int(self.gen_path.read_text().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _switch_generation(self, gen: int) -> None:
+        """세대 파일로 전환 (읽은 인덱스/mmap 초기화)"""
+        suffix = f".{gen}" if gen else ""
+        self.generation = gen
+        self.data_path = self.directory / f"{self.name}{suffix}.f32"
+        self.index_path = self.directory / f"{self.name}{suffix}.idx"
+        self._rows: Dict[bytes, int] = {}
+        self._index_offset = 0  # 이미 읽은 인덱스 파일 바이트 수
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+            self._mm_size = 0
+
+    def _rebuild_locked(self) -> None:
+        """행 수 상한 초과 → 새 세대의 빈 파일로 교체 (파일 락 보유 상태에서 호출)"""
+        old_paths = (self.data_path, self.index_path)
+        gen = self.generation + 1
+        tmp_path = self.gen_path.with_suffix(".gen.tmp")
+        tmp_path.write_text(str(gen))
+        os.replace(tmp_path, self.gen_path)
+        for path in old_paths:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        self._switch_generation(gen)
+        self.rebuilds += 1
+        logger.info("임베딩 저장소 행 수 상한(%d) 초과 → 세대 %d 로 재구축", self.max_rows, gen)
+
+    # ---------- 읽기 ----------
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        with self._lock:
+            digests = [_key_digest(t) for t in texts]
+            if any(d not in self._rows for d in digests):
+                self._refresh()
+            return [self._read_row(self._rows[d]) if d in self._rows else None for d in digests]
+
+    def _refresh(self) -> None:
+        """다른 워커가 추가한 인덱스 레코드 / 세대 변경 반영"""
+        gen = self._read_generation()
+        if gen != self.generation:
+            self._switch_generation(gen)
+        try:
+            size = self.index_path.stat().st_size
+        except FileNotFoundError:
+            return
+        size -= size % KEY_BYTES
+        if size <= self._index_offset:
+            return
+        with open(self.index_path, "rb") as f:
+            f.seek(self._index_offset)
+            chunk = f.read(size - self._index_offset)
+        start_row = self._index_offset // KEY_BYTES
+        for i in range(len(chunk) // KEY_BYTES):
+            self._rows.setdefault(chunk[i * KEY_BYTES:(i + 1) * KEY_BYTES], start_row + i)
+        self._index_offset = size
+        if self.dim is None and self.dim_path.exists():
+            self.dim = int(self.dim_path.read_text().strip() or 0) or None
+
+    def _read_row(self, row: int) -> Optional[List[float]]:
+        if not self.dim:
+            return None
+        row_bytes = self.dim * 4
+        end = (row + 1) * row_bytes
+        if self._mm is None or end > self._mm_size:
+            self._remap()
+            if end > self._mm_size:
+                return None
+        arr = array("f")
+        arr.frombytes(self._mm[row * row_bytes:end])
+        if sys.byteorder != "little":
+            arr.byteswap()
+        return arr.tolist()
+
+    def _remap(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+            self._mm_size = 0
+        try:
+            with open(self.data_path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size:
+                    self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    self._mm_size = size
+        except FileNotFoundError:
+            pass
+
+    # ---------- 쓰기 ----------
+
+    def put_many(self, items: Dict[str, List[float]]) -> int:
+        """새 임베딩 추가 (이미 있는 키/차원 불일치는 건너뜀), 추가 개수 반환"""
+        with self._lock:
+            self._refresh()
+            fresh = {}
+            for text, vector in items.items():
+                digest = _key_digest(text)
+                if not vector or digest in self._rows or digest in fresh:
+                    continue
+                if self.dim is None:
+                    self.dim = len(vector)
+                if len(vector) != self.dim:
+                    logger.warning("임베딩 차원 불일치로 저장 생략: %d != %d", len(vector), self.dim)
+                    continue
+                fresh[digest] = vector
+            if not fresh:
+                return 0
+
+            self.data_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.lock_path, "a+b") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    return self._append_locked(fresh)
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _append_locked(self, fresh: Dict[bytes, List[float]]) -> int:
+        if self.dim_path.exists():
+            stored_dim = int(self.dim_path.read_text().strip() or 0)
+            if stored_dim and stored_dim != self.dim:
+                logger.warning("임베딩 저장소 차원 불일치로 저장 생략: %d != %d", self.dim, stored_dim)
+                return 0
+        else:
+            self.dim_path.write_text(str(self.dim))
+        # 락을 잡기 전 다른 워커가 추가한 키 / 재구축한 세대 반영
+        self._refresh()
+        fresh = {d: v for d, v in fresh.items() if d not in self._rows}
+        if not fresh:
+            return 0
+        if self.max_rows and self._index_offset // KEY_BYTES + len(fresh) > self.max_rows:
+            self._rebuild_locked()
+            fresh = dict(list(fresh.items())[:self.max_rows])
+
+        row_bytes = self.dim * 4
+        with open(self.data_path, "ab") as data_file, open(self.index_path, "ab") as index_file:
+            # 중단된 append 정리: 인덱스 레코드가 있는 행까지만 유효
+            rows = index_file.seek(0, os.SEEK_END) // KEY_BYTES
+            index_file.truncate(rows * KEY_BYTES)
+            if data_file.seek(0, os.SEEK_END) != rows * row_bytes:
+                data_file.truncate(rows * row_bytes)
+
+            payload = array("f")
+            for vector in fresh.values():
+                payload.extend(vector)
+            if sys.byteorder != "little":
+                payload.byteswap()
+            # 행렬 먼저, 인덱스 나중 → 인덱스에 보이는 키는 항상 데이터가 있음
+            data_file.write(payload.tobytes())
+            data_file.flush()
+            index_file.write(b"".join(fresh.keys()))
+            index_file.flush()
+
+        for i, digest in enumerate(fresh):
+            self._rows[digest] = rows + i
+        self._index_offset = (rows + len(fresh)) * KEY_BYTES
+        return len(fresh)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._mm is not None:
+                self._mm.close()
+                self._mm = None
+                self._mm_size = 0
+
+
+class EmbeddingStore:
+    """모델별 영구 임베딩 저장소 (키: 모델명 + 정규화된 텍스트, 모델별 max_rows 초과 시 재구축)"""
+
+    def __init__(self, directory: str, max_rows: int = 0):
+        self.directory = Path(directory)
+        self.max_rows = max_rows
+        self._stores: Dict[str, _ModelStore] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+
+    def _store(self, model: str) -> _ModelStore:
+        with self._lock:
+            if model not in self._stores:
+                self._stores[model] = _ModelStore(self.directory, model, self.max_rows)
+            return self._stores[model]
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        try:
+            results = self._store(model).get_many(texts)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("임베딩 저장소 조회 실패: %r", e)
+            return [None] * len(texts)
+        found = sum(1 for r in results if r is not None)
+        self.hits += found
+        self.misses += len(texts) - found
+        return results
+
+    def put_many(self, model: str, items: Dict[str, List[float]]) -> int:
+        try:
+            written = self._store(model).put_many(items)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("임베딩 저장소 저장 실패: %r", e)
+            return 0
+        self.writes += written
+        return written
+
+    def close(self) -> None:
+        for store in self._stores.values():
+            store.close()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "directory": str(self.directory),
+            "models": {model: len(store) for model, store in self._stores.items()},
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "errors": self.errors,
+            "max_rows": self.max_rows,
+            "rebuilds": sum(store.rebuilds for store in self._stores.values()),
+        }
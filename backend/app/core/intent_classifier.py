@@ -10,7 +10,11 @@ from langchain.schema import HumanMessage
 import re
 import json
 
+from app.core.cache_keys import make_key, normalize_text
 from app.core.config import settings
+from app.core.intent_fast_path import fast_intent_model
+from app.core.redis_cache import redis_cache
+from app.shared.utils.keyword_router import keyword_router
 from app.prompts.chat.intent_classification import get_intent_prompt
 from app.core.llm_factory import create_chat_llm
 
@@ -25,6 +29,85 @@ class Intent(Enum):
     GENERAL = "general"                 # 일반 대화
 
 
+class IntentResultCache:
+    """
+    LLM 의도 분류 결과 캐시 (공유 redis_cache: L1 메모리 + Redis)
+    
+    - 키: 정규화 문장(NFC/소문자/공백·문장부호 제거) digest → "식단표 만들어줘!" 와 "식단표 만들어 줘" 가 같은 키
+    - 값: Intent enum 을 문자열로 저장 (JSON/msgpack 직렬화 가능)
+    - 분류 실패(폴백) 결과는 짧은 TTL 로 저장 (장애 시 LLM 재호출 폭주 방지)
+    - 히트율 카운터는 분류기 인스턴스와 무관하게 프로세스 단위로 집계
+    """
+    
+    _PUNCT_RE = re.compile(r"[\s.,!?~…·'\"`^()\[\]{}]+")
+    
+    def __init__(self, ttl: int, negative_ttl: int):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.errors = 0
+    
+    @classmethod
+    def normalize(cls, text: str) -> str:
+        return cls._PUNCT_RE.sub("", normalize_text(text))
+    
+    def key(self, text: str) -> str:
+        return make_key("intent", self.normalize(text))
+    
+    async def get(self, text: str) -> Optional[Dict[str, Any]]:
+        try:
+            cached = await redis_cache.aget(self.key(text))
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️ 의도 분류 캐시 조회 오류: {e}")
+            return None
+        if not isinstance(cached, dict) or "intent" not in cached:
+            self.misses += 1
+            return None
+        
+        if cached.get("negative"):
+            self.negative_hits += 1
+        else:
+            self.hits += 1
+        try:
+            intent = Intent(cached["intent"])
+        except ValueError:
+            intent = Intent.GENERAL
+        result = {k: v for k, v in cached.items() if k != "negative"}
+        result["intent"] = intent
+        result["cached"] = True
+        return result
+    
+    async def set(self, text: str, result: Dict[str, Any], negative: bool = False) -> None:
+        encoded = dict(result)
+        encoded["intent"] = getattr(result["intent"], "value", result["intent"])
+        if negative:
+            encoded["negative"] = True
+        try:
+            if await redis_cache.aset(self.key(text), encoded, ttl=self.negative_ttl if negative else self.ttl):
+                self.stores += 1
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️ 의도 분류 캐시 저장 오류: {e}")
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.negative_hits) / lookups, 4) if lookups else 0.0,
+            "stores": self.stores,
+            "errors": self.errors,
+        }
+
+
+intent_result_cache = IntentResultCache(settings.intent_cache_ttl, settings.intent_cache_negative_ttl)
+
+
 class IntentClassifier:
     """자연어 의도 분류기 - LLM 우선 방식"""
     
@@ -51,21 +134,14 @@ class IntentClassifier:
             print(f"   - 타임아웃: {settings.intent_classifier_timeout}")
             self.llm = None
         
-        # 캐시 초기화
-        try:
-            from app.core.redis_cache import RedisCache
-            self.cache = RedisCache()
-            print("[OK] IntentClassifier 캐시 초기화 성공")
-        except Exception as e:
-            print(f"[WARNING] IntentClassifier 캐시 초기화 실패: {e}")
-            self.cache = None
+        # 결과 캐시는 프로세스 공용 (워커당 Redis 연결 1개 유지)
+        self.cache = intent_result_cache
         
         # 최소한의 핵심 키워드만 유지 - LLM이 90% 담당
+        # (키워드 목록은 keyword_router 의 intent.* 규칙 집합)
         self.critical_keywords = {
-            "calendar_save": ["캘린더에 저장", "캘린더에 저장해줘", "저장해줘", "일정 등록", "캘린더 추가", "캘린더에", "저장", "넣어줘", "넣어", "추가해줘", "추가해", "캘린더", "일정에", "일정에 저장"],
-            "recipe_search": ["레시피", "조리법"],
-            "meal_plan": ["식단표", "식단 계획", "일주일", "7일", "만들어줘"],
-            "place_search": ["맛집", "식당", "근처"]
+            intent_name: keyword_router.rules[f"intent.{intent_name}"]
+            for intent_name in ("calendar_save", "recipe_search", "meal_plan", "place_search")
         }
     
     async def classify(self, user_input: str, context: str = "") -> Dict[str, Any]:
@@ -95,7 +171,12 @@ class IntentClassifier:
             print(f"    [KEYWORD] 식단표 키워드 감지: {keyword_result['intent'].value} (신뢰도: {keyword_result['confidence']:.2f})")
             return keyword_result
         
-        # 2. LLM 분류 시도 (나머지 90% 담당)
+        # 2. 로컬 빠른 분류 (보정된 임계값 이상이면 LLM 호출 생략)
+        fast_result = self._fast_path_classify(text)
+        if fast_result is not None:
+            return fast_result
+        
+        # 3. LLM 분류 시도 (빠른 분류 신뢰도 미달분 담당)
         if self.llm:
             try:
                 print(f"🔍 LLM 분류 시도: '{text}'")
@@ -114,11 +195,34 @@ class IntentClassifier:
         else:
             print("❌ LLM이 초기화되지 않음")
         
-        # 2. LLM 실패시에만 최소한의 키워드 분류 사용 (10% 담당)
+        # 4. LLM 실패시에만 최소한의 키워드 분류 사용
         keyword_result = self._minimal_keyword_classify(text)
         print(f"    [KEYWORD] 키워드 분류: {keyword_result['intent'].value} (신뢰도: {keyword_result['confidence']:.2f})")
         return keyword_result
     
+    def _fast_path_classify(self, text: str) -> Optional[Dict[str, Any]]:
+        """로컬 해시 n-gram 선형 모델 분류 (임계값 미달이거나 모델이 없으면 None → LLM)"""
+        if not settings.intent_fast_path_enabled or fast_intent_model is None:
+            return None
+        
+        label, confidence = fast_intent_model.predict(text)
+        if confidence < fast_intent_model.threshold:
+            print(f"    [FAST] 신뢰도 부족: {label} ({confidence:.2f} < {fast_intent_model.threshold:.2f}) → LLM")
+            return None
+        
+        try:
+            intent = Intent(label)
+        except ValueError:
+            return None
+        print(f"    [FAST] 로컬 분류: {intent.value} (신뢰도: {confidence:.2f})")
+        # 신뢰도는 모델의 실제 확률, 임계값 이상 예측의 교차검증 정확도는 별도 필드로 보고
+        return {
+            "intent": intent,
+            "confidence": confidence,
+            "cv_accepted_accuracy": fast_intent_model.metrics.get("cv_accepted_accuracy"),
+            "method": "fast_path"
+        }
+    
     def _minimal_keyword_classify(self, text: str) -> Dict[str, Any]:
         """최소한의 키워드만으로 분류 - LLM 실패시에만 사용"""
         
@@ -127,11 +231,12 @@ class IntentClassifier:
         # 우선순위 순서로 키워드 검사 (calendar_save 최우선)
         priority_order = ["calendar_save", "meal_plan", "place_search", "recipe_search"]
         
+        # 한 번의 스캔으로 모든 의도의 매칭 키워드 수집
+        matches = keyword_router.scan(text)
+        
         for intent_name in priority_order:
             if intent_name in self.critical_keywords:
-                keywords = self.critical_keywords[intent_name]
-                print(f"🔍 {intent_name} 키워드 검사: {keywords}")
-                matched_keywords = [kw for kw in keywords if kw in text]
+                matched_keywords = list(matches.get(f"intent.{intent_name}"))
                 if matched_keywords:
                     print(f"✅ {intent_name} 매칭됨: {matched_keywords}")
                     intent_map = {
@@ -165,15 +270,10 @@ class IntentClassifier:
         """LLM 기반 정확한 분류 - 프롬프트 파일 사용 (캐시 적용)"""
         
         # 캐시 확인
-        cache_key = f"intent_classify:{hash(user_input)}"
-        if self.cache:
-            try:
-                cached_result = self.cache.get(cache_key)
-                if cached_result:
-                    print(f"✅ 의도 분류 캐시 히트: {cache_key}")
-                    return cached_result
-            except Exception as cache_error:
-                print(f"⚠️ 의도 분류 캐시 조회 오류: {cache_error}")
+        cached_result = await self.cache.get(user_input)
+        if cached_result:
+            print(f"✅ 의도 분류 캐시 히트: {cached_result['intent'].value}")
+            return cached_result
         
         # intent_classification.py의 프롬프트 사용
         prompt = get_intent_prompt(user_input)
@@ -211,12 +311,7 @@ class IntentClassifier:
                 }
                 
                 # 결과를 캐시에 저장
-                if self.cache:
-                    try:
-                        self.cache.set(cache_key, classification_result, ttl=7200)  # 2시간 캐시
-                        print(f"✅ 의도 분류 결과 캐시 저장: {cache_key}")
-                    except Exception as cache_error:
-                        print(f"⚠️ 의도 분류 캐시 저장 오류: {cache_error}")
+                await self.cache.set(user_input, classification_result)
                 
                 return classification_result
         except Exception as e:
@@ -230,13 +325,8 @@ class IntentClassifier:
             "reasoning": "LLM 분류 실패"
         }
         
-        # 실패 결과도 캐시에 저장 (짧은 시간)
-        if self.cache:
-            try:
-                self.cache.set(cache_key, fallback_result, ttl=300)  # 5분 캐시
-                print(f"✅ 의도 분류 실패 결과 캐시 저장: {cache_key}")
-            except Exception as cache_error:
-                print(f"⚠️ 의도 분류 실패 캐시 저장 오류: {cache_error}")
+        # 실패 결과도 캐시에 저장 (짧은 TTL)
+        await self.cache.set(user_input, fallback_result, negative=True)
         
         return fallback_result
     
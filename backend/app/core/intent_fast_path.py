@@ -0,0 +1,200 @@
+"""
+로컬 의도 분류 빠른 경로
+LLM 호출 전에 문자 n-gram 해시 임베딩 + 소형 선형 모델(softmax 회귀)로 의도를 분류한다.
+
+- 특징: 정규화한 문장의 문자 1~3gram + 단어를 crc32 로 FEATURE_DIM 버킷에 해싱 (외부 API 호출 없음)
+- 추론: 희소 특징 × 가중치 행렬 → softmax, 1ms 미만
+- 보정된 신뢰도 임계값(threshold) 이상일 때만 사용하고, 미만이면 기존 LLM 분류로 넘긴다
+- 모델은 scripts/train_intent_fast_path.py 로 학습/교차검증/보정 후 app/data/intent_fast_path.npz 로 내보낸다
+  (파일이 없으면 빠른 경로 비활성)
+"""
+
+import logging
+import math
+import re
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MODEL_FILE = Path(__file__).parent.parent / 'data' / 'intent_fast_path.npz'
+
+# 특징 추출 방식이 바뀌면 올려서 이전 모델을 무효화
+FEATURE_VERSION = 1
+FEATURE_DIM = 1 << 14
+NGRAM_SIZES = (1, 2, 3)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _bucket(token: str) -> int:
+    # 내장 hash() 는 프로세스마다 달라 학습/서빙 간 재현이 안 되므로 crc32 사용
+    return zlib.crc32(token.encode('utf-8')) % FEATURE_DIM
+
+
+def featurize(text: str) -> Tuple[np.ndarray, np.ndarray]:
+    """문장 → (버킷 인덱스, L2 정규화된 값) 희소 벡터"""
+    normalized = _WHITESPACE_RE.sub(' ', text.lower()).strip()
+    counts: Dict[int, int] = {}
+    padded = f' {normalized} '
+    for n in NGRAM_SIZES:
+        for i in range(len(padded) - n + 1):
+            gram = padded[i:i + n]
+            if gram.strip():
+                bucket = _bucket(f'c{n}:{gram}')
+                counts[bucket] = counts.get(bucket, 0) + 1
+    for word in normalized.split(' '):
+        if word:
+            bucket = _bucket(f'w:{word}')
+            counts[bucket] = counts.get(bucket, 0) + 1
+
+    if not counts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+    # 서브리니어 TF 후 L2 정규화
+    values = np.fromiter((1.0 + math.log(c) for c in counts.values()), dtype=np.float32, count=len(counts))
+    values /= np.linalg.norm(values)
+    return indices, values
+
+
+def _dense_features(texts: Sequence[str]) -> np.ndarray:
+    matrix = np.zeros((len(texts), FEATURE_DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        indices, values = featurize(text)
+        matrix[row, indices] = values
+    return matrix
+
+
+def _softmax(scores: np.ndarray) -> np.ndarray:
+    scores = scores - scores.max(axis=-1, keepdims=True)
+    exp = np.exp(scores)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+class FastIntentModel:
+    """해시 n-gram softmax 회귀 의도 분류기"""
+
+    def __init__(self, labels: Sequence[str], weights: np.ndarray, bias: np.ndarray,
+                 threshold: float, metrics: Optional[Dict[str, float]] = None):
+        self.labels = list(labels)
+        self.weights = np.ascontiguousarray(weights, dtype=np.float32)  # (라벨 수, FEATURE_DIM)
+        self.bias = np.asarray(bias, dtype=np.float32)
+        self.threshold = float(threshold)
+        self.metrics = dict(metrics or {})
+
+    def predict_proba(self, text: str) -> np.ndarray:
+        indices, values = featurize(text)
+        return _softmax(self.weights[:, indices] @ values + self.bias)
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """(의도, 확률)"""
+        proba = self.predict_proba(text)
+        best = int(np.argmax(proba))
+        return self.labels[best], float(proba[best])
+
+    # ---------- 학습 ----------
+
+    @classmethod
+    def train(cls, examples: Iterable[Tuple[str, str]], labels: Optional[Sequence[str]] = None,
+              epochs: int = 300, learning_rate: float = 0.5, l2: float = 1e-4,
+              threshold: float = 1.0) -> 'FastIntentModel':
+        """전체 배치 경사하강으로 softmax 회귀 학습 (학습 데이터가 수백~수천 문장 규모라 충분히 빠름)"""
+        examples = list(examples)
+        labels = list(labels) if labels else sorted({label for _, label in examples})
+        label_index = {label: i for i, label in enumerate(labels)}
+
+        features = _dense_features([text for text, _ in examples])
+        targets = np.zeros((len(examples), len(labels)), dtype=np.float32)
+        targets[np.arange(len(examples)), [label_index[label] for _, label in examples]] = 1.0
+
+        weights = np.zeros((len(labels), FEATURE_DIM), dtype=np.float32)
+        bias = np.zeros(len(labels), dtype=np.float32)
+        for _ in range(epochs):
+            grad = (_softmax(features @ weights.T + bias) - targets) / len(examples)
+            weights -= learning_rate * (grad.T @ features + l2 * weights)
+            bias -= learning_rate * grad.sum(axis=0)
+        return cls(labels, weights, bias, threshold)
+
+    # ---------- 저장/로드 ----------
+
+    def save(self, path: Path = MODEL_FILE) -> None:
+        metric_names = sorted(self.metrics)
+        np.savez_compressed(
+            path,
+            feature_version=np.int64(FEATURE_VERSION),
+            feature_dim=np.int64(FEATURE_DIM),
+            labels=np.array(self.labels),
+            weights=self.weights.astype(np.float16),  # 배포 크기 절감 (추론 시 float32 로 복원)
+            bias=self.bias,
+            threshold=np.float64(self.threshold),
+            metric_names=np.array(metric_names),
+            metric_values=np.array([self.metrics[name] for name in metric_names], dtype=np.float64),
+        )
+
+    @classmethod
+    def load(cls, path: Path = MODEL_FILE) -> Optional['FastIntentModel']:
+        """모델 로드 (파일이 없거나 특징 버전이 다르면 None → 빠른 경로 비활성)"""
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data['feature_version']) != FEATURE_VERSION or int(data['feature_dim']) != FEATURE_DIM:
+                    print(f"⚠️ 의도 빠른 분류 모델 버전 불일치 - 재학습 필요: {path}")
+                    return None
+                metrics = dict(zip(data['metric_names'].tolist(), data['metric_values'].tolist()))
+                model = cls(data['labels'].tolist(), data['weights'].astype(np.float32), data['bias'],
+                            float(data['threshold']), metrics)
+        except Exception as e:
+            logger.warning("의도 빠른 분류 모델 로드 실패: %r", e)
+            return None
+        print(f"✅ 의도 빠른 분류 모델 로드: 라벨 {len(model.labels)}개, 임계값 {model.threshold:.2f}")
+        return model
+
+
+def calibrate_threshold(confidences: Sequence[float], correct: Sequence[bool],
+                        target_precision: float = 0.95, min_support: int = 5) -> float:
+    """
+    교차검증 예측으로 임계값 보정
+    신뢰도 ≥ 임계값인 예측의 정확도가 target_precision 이상인 가장 낮은 임계값 (없으면 1.0 초과 → 빠른 경로 미사용)
+    """
+    order = np.argsort(-np.asarray(confidences, dtype=np.float64), kind='stable')
+    sorted_conf = np.asarray(confidences, dtype=np.float64)[order]
+    hits = np.cumsum(np.asarray(correct, dtype=np.float64)[order])
+    precision = hits / np.arange(1, len(order) + 1)
+
+    threshold = 1.01
+    for i in range(len(order)):
+        # 같은 신뢰도 묶음의 마지막 위치에서만 판단 (임계값은 묶음 단위로만 나눌 수 있음)
+        if i + 1 < len(order) and sorted_conf[i + 1] == sorted_conf[i]:
+            continue
+        if i + 1 >= min_support and precision[i] >= target_precision:
+            threshold = float(sorted_conf[i])
+    return threshold
+
+
+def cross_validate(examples: Sequence[Tuple[str, str]], folds: int = 5, seed: int = 0,
+                   **train_kwargs) -> List[Tuple[str, str, float]]:
+    """층화 k-fold 교차검증 → 문장별 (정답, 예측, 신뢰도)"""
+    rng = np.random.default_rng(seed)
+    labels = sorted({label for _, label in examples})
+    fold_of = np.zeros(len(examples), dtype=np.int64)
+    for label in labels:
+        positions = np.array([i for i, (_, l) in enumerate(examples) if l == label])
+        rng.shuffle(positions)
+        fold_of[positions] = np.arange(len(positions)) % folds
+
+    predictions: List[Optional[Tuple[str, str, float]]] = [None] * len(examples)
+    for fold in range(folds):
+        train_set = [examples[i] for i in range(len(examples)) if fold_of[i] != fold]
+        model = FastIntentModel.train(train_set, labels=labels, **train_kwargs)
+        for i in np.flatnonzero(fold_of == fold):
+            text, expected = examples[i]
+            predicted, confidence = model.predict(text)
+            predictions[i] = (expected, predicted, confidence)
+    return predictions
+
+
+fast_intent_model = FastIntentModel.load()
@@ -4,8 +4,35 @@
 """
 
 from typing import Any, Dict, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
 
 from app.core.config import settings
+from app.core.tracing import tracer
+
+
+class LLMSpanCallback(BaseCallbackHandler):
+    """LLM 호출 1회를 llm.<모델> span 으로 기록 (invoke/ainvoke/astream 모두)"""
+
+    # 호출한 코루틴과 같은 컨텍스트에서 실행해야 부모 span/요청 id 가 이어짐
+    run_inline = True
+
+    def __init__(self, model: str):
+        self.model = model
+        self._runs: Dict[UUID, Any] = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs: Any) -> None:
+        self._runs[run_id] = tracer.begin(f"llm.{self.model}")
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs: Any) -> None:
+        self._runs[run_id] = tracer.begin(f"llm.{self.model}")
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs: Any) -> None:
+        tracer.end(self._runs.pop(run_id, None))
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        tracer.end(self._runs.pop(run_id, None), error)
 
 
 def create_chat_llm(
@@ -47,6 +74,7 @@ def create_chat_llm(
             max_tokens=int(selected_max_tokens),  # 명시적으로 max_tokens 설정
             model=selected_model,
             temperature=float(selected_temperature),
+            callbacks=[LLMSpanCallback(selected_model)],
         )
 
     # 기본: Gemini
@@ -79,5 +107,6 @@ def create_chat_llm(
     return ChatGoogleGenerativeAI(
         google_api_key=settings.google_api_key,
         timeout=float(selected_timeout),
+        callbacks=[LLMSpanCallback(selected_model)],
         **common_kwargs,
     )
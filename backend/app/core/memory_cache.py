@@ -0,0 +1,193 @@
+"""
+프로세스 내 L1 메모리 캐시
+RedisCache 앞단에서 동작하는 LRU + TTL 캐시 (바이트 예산/항목 수 제한, 백그라운드 만료 정리)
+"""
+
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_size(value: Any) -> int:
+    """값이 차지하는 메모리 크기(바이트) 근사치 계산
+
+    dict/list/tuple/set 은 재귀적으로 합산한다.
+    정확한 값이 아니라 바이트 예산 관리용 추정치이다.
+    """
+    seen = set()
+    stack = [value]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        obj_id = id(obj)
+        if obj_id in seen:
+            continue
+        seen.add(obj_id)
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+    return total
+
+
+class MemoryCache:
+    """LRU + TTL 메모리 캐시
+
+    - max_entries: 최대 항목 수
+    - max_bytes: 최대 바이트 예산 (estimate_size 기준)
+    - sweep_interval: 만료 항목 정리 주기(초), 0 이하이면 백그라운드 정리 비활성
+    """
+
+    def __init__(self, max_entries: int = 2000, max_bytes: int = 64 * 1024 * 1024, sweep_interval: float = 60.0):
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self.sweep_interval = float(sweep_interval)
+
+        # key: (value, expire_time, size)
+        self._data: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._current_bytes = 0
+
+        # 카운터 (상태 엔드포인트 노출용)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.oversize_rejects = 0
+
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        if self.sweep_interval > 0:
+            self._start_sweeper()
+
+    # ---------- 기본 연산 ----------
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """(hit 여부, 값) 반환 — None 값도 캐싱 가능하도록 hit 플래그를 분리"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            value, expire_time, _ = entry
+            if time.time() >= expire_time:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def set(self, key: str, value: Any, ttl: int) -> bool:
+        """값 저장 (예산 초과 시 LRU 항목부터 제거)"""
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            # 단일 항목이 예산보다 크면 L1에 두지 않는다 (Redis에만 저장)
+            with self._lock:
+                self._remove(key)
+                self.oversize_rejects += 1
+            logger.debug("메모리 캐시 크기 초과로 저장 생략: %s (%d bytes)", key, size)
+            return False
+
+        with self._lock:
+            self._remove(key)
+            self._data[key] = (value, time.time() + ttl, size)
+            self._current_bytes += size
+            self._evict_if_needed()
+        return True
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._remove(key)
+
+    def contains(self, key: str) -> bool:
+        """만료 여부를 반영한 존재 확인 (hit/miss 카운터에는 반영하지 않음)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False
+            if time.time() >= entry[1]:
+                self._remove(key)
+                self.expirations += 1
+                return False
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._current_bytes = 0
+
+    def __contains__(self, key: str) -> bool:
+        return self.contains(key)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    # ---------- 내부 유틸 ----------
+
+    def _remove(self, key: str) -> bool:
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return False
+        self._current_bytes -= entry[2]
+        return True
+
+    def _evict_if_needed(self) -> None:
+        while self._data and (len(self._data) > self.max_entries or self._current_bytes > self.max_bytes):
+            _, (_, _, size) = self._data.popitem(last=False)
+            self._current_bytes -= size
+            self.evictions += 1
+
+    def sweep_expired(self) -> int:
+        """만료된 항목 일괄 제거, 제거 개수 반환"""
+        now = time.time()
+        with self._lock:
+            expired_keys = [k for k, (_, expire_time, _) in self._data.items() if now >= expire_time]
+            for k in expired_keys:
+                self._remove(k)
+            self.expirations += len(expired_keys)
+        if expired_keys:
+            logger.debug("메모리 캐시 만료 정리: %d개 제거", len(expired_keys))
+        return len(expired_keys)
+
+    def _start_sweeper(self) -> None:
+        def _run():
+            while not self._stop_event.wait(self.sweep_interval):
+                try:
+                    self.sweep_expired()
+                except Exception as e:
+                    logger.warning("메모리 캐시 만료 정리 오류: %r", e)
+
+        self._sweeper = threading.Thread(target=_run, name="memory-cache-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop(self) -> None:
+        """백그라운드 정리 스레드 중지"""
+        self._stop_event.set()
+
+    # ---------- 상태 ----------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "bytes": self._current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "oversize_rejects": self.oversize_rejects,
+                "sweep_interval": self.sweep_interval,
+            }
@@ -21,8 +21,12 @@ from app.agents.meal_planner import MealPlannerAgent
 from app.agents.chat_agent import SimpleKetoCoachAgent
 from app.agents.place_search_agent import PlaceSearchAgent
 from app.core.semantic_cache import semantic_cache_service
+from app.core.stream_events import chunk_markdown, emit, is_streaming, open_stream
+from app.core.cache_keys import digest, normalize_terms
 from app.core.config import settings
+from app.core.tracing import current_request_id, format_breakdown, traced, tracer
 from app.shared.utils.calendar_utils import CalendarUtils
+from app.shared.utils.keyword_router import keyword_router
 from app.tools.calendar.calendar_saver import CalendarSaver
 from app.core.llm_factory import create_chat_llm
 
@@ -65,6 +69,7 @@ class AgentState(TypedDict):
     use_meal_planner_recipe: NotRequired[bool]  # MealPlannerAgent 레시피 사용 플래그
     fast_mode: NotRequired[bool]  # 빠른 모드 플래그
     formatted_response: NotRequired[str]  # 포맷된 응답
+    short_circuit: NotRequired[str]  # 응답 확정 사유 (설정 시 answer 노드 대신 finalize 로 바로 종료)
 
 class KetoCoachAgent:
     """키토 코치 메인 에이전트 (LangGraph 오케스트레이터)"""
@@ -101,14 +106,19 @@ class KetoCoachAgent:
         
         workflow = StateGraph(AgentState)
         
-        # 노드 추가
-        workflow.add_node("router", self._router_node)
-        workflow.add_node("recipe_search", self._recipe_search_node)
-        workflow.add_node("place_search", self._place_search_node)
-        workflow.add_node("meal_plan", self._meal_plan_node)
-        workflow.add_node("calendar_save", self._calendar_save_node)  # 새로 추가!
-        workflow.add_node("general", self._general_chat_node)
-        workflow.add_node("answer", self._answer_node)
+        # 노드 추가 (노드별 소요 시간은 node.<이름> span 으로 기록)
+        nodes = {
+            "router": self._router_node,
+            "recipe_search": self._recipe_search_node,
+            "place_search": self._place_search_node,
+            "meal_plan": self._meal_plan_node,
+            "calendar_save": self._calendar_save_node,
+            "general": self._general_chat_node,
+            "answer": self._answer_node,
+            "finalize": self._finalize_node,
+        }
+        for name, node in nodes.items():
+            workflow.add_node(name, traced(f"node.{name}")(node))
         
         # 시작점 설정
         workflow.set_entry_point("router")
@@ -122,37 +132,37 @@ class KetoCoachAgent:
                 "place_search": "place_search", 
                 "meal_plan": "meal_plan",
                 "calendar_save": "calendar_save",
-                "general": "general"
+                "general": "general",
+                "finalize": "finalize"  # 라우터에서 응답 확정 (게스트 캘린더 저장 등)
             }
         )
         
-        # 모든 노드에서 answer로 (general은 직접 END로)
-        workflow.add_edge("recipe_search", "answer")
+        # 캐시 히트/결정적 응답은 answer 를 건너뛰고 finalize 로 (general은 직접 END로)
+        for name in ("recipe_search", "meal_plan"):
+            workflow.add_conditional_edges(
+                name,
+                self._answer_condition,
+                {"answer": "answer", "finalize": "finalize"}
+            )
         workflow.add_edge("place_search", "answer")
-        workflow.add_edge("meal_plan", "answer")
         workflow.add_edge("calendar_save", "answer")  # 새로 추가!
         workflow.add_edge("general", END)
         workflow.add_edge("answer", END)
+        workflow.add_edge("finalize", END)
         
         return workflow.compile()
     
     def _determine_fast_mode(self, message: str) -> bool:
         """메시지 내용에 따라 fast_mode 동적 결정"""
         
-        # 정확한 검색이 필요한 키워드
-        accurate_keywords = ["정확한", "자세한", "맞춤", "개인", "추천", "최적", "신중하게", "꼼꼼하게"]
-        
-        # 빠른 응답이 필요한 키워드
-        fast_keywords = ["빠르게", "간단히", "대충", "아무거나", "급해", "빨리", "간단하게"]
+        matches = keyword_router.scan(message)
         
-        message_lower = message.lower()
-        
-        # 명시적 키워드 확인
-        if any(keyword in message_lower for keyword in accurate_keywords):
+        # 명시적 키워드 확인 (정확한 검색 키워드 우선)
+        if matches.has("fast_mode.accurate"):
             print("🔍 정확한 검색 모드 활성화")
             return False
         
-        if any(keyword in message_lower for keyword in fast_keywords):
+        if matches.has("fast_mode.fast"):
             print("⚡ 빠른 검색 모드 활성화")
             return True
         
@@ -176,30 +186,18 @@ class KetoCoachAgent:
         - GENERAL -> general
         """
         
-        if intent_enum == Intent.MEAL_PLANNING:
-            # 식단표 관련 키워드로 세분화
-            mealplan_keywords = [
-                "식단표", "식단 만들", "식단 생성", "식단 짜",
-                "일주일", "하루치", "이틀치", "3일치", "사흘치",
-                "주간", "일주일치", "메뉴 계획", "한주", "한 주",
-                "이번주", "다음주", "meal plan", "weekly"
-            ]
-            
-            recipe_keywords = [
-                "레시피", "조리법", "만드는 법", "어떻게 만들",
-                "요리 방법", "조리 방법", "recipe", "how to make"
-            ]
-            
-            # 메시지에서 키워드 확인
-            message_lower = message.lower()
+        matches = keyword_router.scan(message)
+        
+        if intent_enum == Intent.MEAL_PLAN:
+            # 식단표/레시피 키워드로 세분화 (route.mealplan, route.recipe 규칙 집합)
             
             # 명확한 식단표 요청
-            if any(keyword in message_lower for keyword in mealplan_keywords):
+            if matches.has("route.mealplan"):
                 print(f"  🗓️ 식단표 키워드 감지 → mealplan")
                 return "mealplan"
             
             # 명확한 레시피 요청
-            if any(keyword in message_lower for keyword in recipe_keywords):
+            if matches.has("route.recipe"):
                 print(f"  🍳 레시피 키워드 감지 → recipe")
                 return "recipe"
             
@@ -217,8 +215,7 @@ class KetoCoachAgent:
         
         elif intent_enum == Intent.BOTH:
             # 식당 키워드가 더 강하면 place, 아니면 recipe
-            place_keywords = ["식당", "맛집", "음식점", "카페", "레스토랑", "근처", "주변"]
-            if any(keyword in message for keyword in place_keywords):
+            if matches.has("route.place"):
                 print(f"  🏪 BOTH → 식당 우선")
                 return "place"
             print(f"  🍳 BOTH → 레시피 우선")
@@ -260,6 +257,7 @@ class KetoCoachAgent:
                         print("❌ Guest 사용자 - 캘린더 저장 불가")
                         state["intent"] = "general"
                         state["response"] = "🔒 캘린더에 저장하려면 로그인이 필요합니다. 로그인 후 시도해주세요!"
+                        state["short_circuit"] = "guest_calendar_save"
                         return state
                     
                     print("✅ 로그인 사용자 확인 - 캘린더 저장 진행")
@@ -396,11 +394,25 @@ class KetoCoachAgent:
         
         return initial_intent
     
+    def _answer_condition(self, state: AgentState) -> str:
+        """검색/식단 노드 이후 조건: 응답이 확정됐으면 finalize, 아니면 answer
+        
+        캘린더 저장 키워드가 있으면 answer 노드의 저장 처리를 거쳐야 하므로 확정 응답이어도 answer 로
+        """
+        if not (state.get("short_circuit") and state.get("response")):
+            return "answer"
+        message = state["messages"][-1].content if state["messages"] else ""
+        if keyword_router.has(message, "answer.calendar_save"):
+            return "answer"
+        return "finalize"
+    
     # _find_recent_meal_plan 함수 제거 - CalendarUtils로 이동
 
     def _route_condition(self, state: AgentState) -> str:
         """라우팅 조건 함수"""
         intent = state["intent"]
+        if state.get("short_circuit") and state.get("response"):
+            return "finalize"
         if state.get("calendar_save_request", False):
             return "calendar_save"
         
@@ -429,7 +441,7 @@ class KetoCoachAgent:
                     model_ver = f"recipe_search_{settings.llm_model}"
                     allergies = profile.get("allergies", []) if profile else []
                     dislikes = profile.get("dislikes", []) if profile else []
-                    opts_hash = f"{hash(tuple(sorted(allergies)))}_{hash(tuple(sorted(dislikes)))}"
+                    opts_hash = digest(normalize_terms(allergies), normalize_terms(dislikes), length=16)
                     tmp_sem = await semantic_cache_service.semantic_lookup(
                         message, user_id, model_ver, opts_hash
                     )
@@ -455,6 +467,7 @@ class KetoCoachAgent:
                             if template:
                                 # 템플릿 기반 빠른 응답 (0.1초)
                                 state["response"] = format_guest_recipe_template(template)
+                                state["short_circuit"] = "guest_recipe_template"
                                 state["tool_calls"].append({
                                     "tool": "guest_recipe_template",
                                     "ingredient": ingredient,
@@ -747,6 +760,23 @@ class KetoCoachAgent:
     
     
     
+    async def _generate_llm_text(self, prompt: str) -> str:
+        """
+        LLM 응답 텍스트 생성
+        스트리밍 요청이면 astream 으로 받아 토큰마다 token 이벤트를 전달 (첫 토큰 시간 = 체감 지연)
+        """
+        messages = [HumanMessage(content=prompt)]
+        if not is_streaming():
+            response = await self.llm.ainvoke(messages)
+            return response.content
+        
+        parts = []
+        async for chunk in self.llm.astream(messages):
+            if chunk.content:
+                parts.append(chunk.content)
+                emit("token", content=chunk.content)
+        return "".join(parts)
+    
     async def _general_chat_node(self, state: AgentState) -> AgentState:
         """일반 채팅 노드 (대화 맥락 고려)"""
         
@@ -915,8 +945,7 @@ class KetoCoachAgent:
 
             # 공통 LLM 직접 사용 (간단하고 빠름) - 안전한 호출
             try:
-                response = await self.llm.ainvoke([HumanMessage(content=prompt)])
-                state["response"] = response.content
+                state["response"] = await self._generate_llm_text(prompt)
             except Exception as llm_error:
                 print(f"LLM 호출 오류: {llm_error}")
                 print(f"LLM 오류 타입: {type(llm_error)}")
@@ -1059,6 +1088,19 @@ class KetoCoachAgent:
     
     # 기존 _handle_calendar_save_request 함수 제거됨 - 위의 새 버전 사용
     
+    @staticmethod
+    def _ensure_heading(response: str) -> str:
+        """캘린더/오류 단문도 MD 제목으로 보장"""
+        if not response.lstrip().startswith(("#", "##")):
+            return f"## ℹ️ 안내\n\n{response}"
+        return response
+    
+    async def _finalize_node(self, state: AgentState) -> AgentState:
+        """확정 응답 빠른 종료 노드 (answer 노드의 키워드 검사/LLM 래핑 생략)"""
+        print(f"⚡ 빠른 종료: {state.get('short_circuit')} → answer 노드 생략")
+        state["response"] = self._ensure_heading(state["response"])
+        return state
+    
     async def _answer_node(self, state: AgentState) -> AgentState:
         """최종 응답 생성 노드"""
         
@@ -1072,13 +1114,7 @@ class KetoCoachAgent:
             
             # 캘린더 저장 요청 감지 및 처리 (메시지 내용으로 직접 확인) - 우선 처리
             # 더 강력한 키워드 매칭
-            calendar_keywords = [
-                "캘린더에 저장", "캘린더 저장", "저장해줘", "저장해", 
-                "캘린더에", "캘린더에 추가", "캘린더 추가", 
-                "캘린더에 저장해줘", "캘린더에 저장해", "저장해줘", "저장해",
-                "캘린더", "저장", "넣어줘", "넣어", "추가해줘", "추가해"
-            ]
-            is_calendar_save = any(keyword in message for keyword in calendar_keywords)
+            is_calendar_save = keyword_router.has(message, "answer.calendar_save")
             
             # 추가: 더 강력한 부분 매칭
             if not is_calendar_save:
@@ -1103,9 +1139,7 @@ class KetoCoachAgent:
             # 이미 응답이 설정되어 있으면 그대로 사용 (router 선차단/노드 처리 등)
             if state.get("response"):
                 print("✅ 기존 응답 사용 (이미 설정됨)")
-                # 캘린더/오류 단문도 MD 제목으로 보장
-                if not state["response"].lstrip().startswith(("#", "##")):
-                    state["response"] = f"## ℹ️ 안내\n\n{state['response']}"
+                state["response"] = self._ensure_heading(state["response"])
                 return state
             
             # MealPlannerAgent/PlaceSearchAgent가 포맷한 응답이 있으면 공통 템플릿으로 래핑
@@ -1121,9 +1155,8 @@ class KetoCoachAgent:
                         location=location_info,
                         context=formatted
                     )
-                    response = await self.llm.ainvoke([HumanMessage(content=answer_prompt)])
                     # 가독성 향상을 위한 경량 후처리: 개인 맞춤 조언 섹션을 명확히 구분
-                    place_text = response.content or ""
+                    place_text = await self._generate_llm_text(answer_prompt) or ""
                     # '개인 맞춤 조언' 구간을 굵은 제목과 구분선으로 감싸 가독성 개선
                     if "개인 맞춤 조언" in place_text:
                         try:
@@ -1517,7 +1550,7 @@ class KetoCoachAgent:
                                 model_ver = f"recipe_search_{settings.llm_model}"
                                 allergies = profile.get("allergies", []) if profile else []
                                 dislikes = profile.get("dislikes", []) if profile else []
-                                opts_hash = f"{hash(tuple(sorted(allergies)))}_{hash(tuple(sorted(dislikes)))}"
+                                opts_hash = digest(normalize_terms(allergies), normalize_terms(dislikes), length=16)
                                 
                                 meta = {
                                     "route": "recipe_search",
@@ -1707,8 +1740,7 @@ class KetoCoachAgent:
                     # 식당 검색 결과가 없는 경우
                     answer_prompt = PLACE_SEARCH_FAILURE_PROMPT.format(message=message)
             
-            response = await self.llm.ainvoke([HumanMessage(content=answer_prompt)])
-            state["response"] = response.content
+            state["response"] = await self._generate_llm_text(answer_prompt)
             
         except Exception as e:
             print(f"❌ Answer generation error: {e}")
@@ -1797,9 +1829,9 @@ class KetoCoachAgent:
     ) -> Dict[str, Any]:
         """메시지 처리 메인 함수"""
         
-        # 성능 측정 시작
+        # 성능 측정 시작 (API 레이어에서 연결한 요청 id 가 있으면 그대로 사용)
         start_time = time.time()
-        request_id = f"req_{int(start_time * 1000)}"
+        request_id = current_request_id() or f"req_{int(start_time * 1000)}"
         
         # 대화 히스토리를 메시지에 포함
         messages = []
@@ -1847,8 +1879,9 @@ class KetoCoachAgent:
             "chat_history": [msg.message for msg in chat_history] if chat_history else []  # chat_history 추가
         }
         
-        # 워크플로우 실행
-        final_state = await self.workflow.ainvoke(initial_state)
+        # 워크플로우 실행 (요청 단위 span 트리 수집)
+        with tracer.start_request(request_id) as trace:
+            final_state = await self.workflow.ainvoke(initial_state)
         
         # 성능 측정 완료
         end_time = time.time()
@@ -1860,6 +1893,8 @@ class KetoCoachAgent:
         tool_calls_count = len(final_state.get("tool_calls", []))
         
         print(f"📊 PERFORMANCE [{request_id}] | Intent: {intent} | Time: {total_time:.2f}s | Results: {results_count} | Tools: {tool_calls_count}")
+        if tracer.enabled and total_time * 1000 >= settings.trace_breakdown_min_ms:
+            print(f"🔥 구간별 소요 시간 [{request_id}]\n{format_breakdown(trace)}")
         
         # 상세 성능 로그 (개발용)
         logging.info(f"PERF_DETAIL [{request_id}] | Message: {message[:50]}... | Profile: {bool(profile)} | History: {len(chat_history) if chat_history else 0}")
@@ -1880,42 +1915,77 @@ class KetoCoachAgent:
         radius_km: float = 5.0,
         profile: Optional[Dict[str, Any]] = None
     ) -> AsyncGenerator[Dict[str, Any], None]:
-        """스트리밍 응답 생성"""
+        """
+        스트리밍 응답 생성
         
-        # 노드별 스트리밍 이벤트 생성
-        yield {"event": "start", "message": "처리를 시작합니다..."}
+        처리 중 에이전트가 emit 한 중간 이벤트(LLM 토큰, 식단 일차 완성 등)를 준비되는 즉시 전달하고,
+        토큰으로 보내지 않은 나머지 응답은 문단 단위 content 청크로 보낸 뒤 complete 이벤트로 마무리한다.
+        """
         
-        # 의도 분류
+        yield {"event": "start", "message": "처리를 시작합니다..."}
         yield {"event": "routing", "message": "의도를 분석하고 있습니다..."}
         
-        # 워크플로우 실행
-        result = await self.process_message(message, location, radius_km, profile)
+        # 큐를 연 컨텍스트에서 태스크 생성 → 워크플로우 노드의 emit 이 이 큐로 전달됨
+        streamed = []  # LLM 토큰 이벤트로 이미 보낸 텍스트
+        with open_stream() as queue:
+            task = asyncio.create_task(self.process_message(message, location, radius_km, profile))
+        
+        try:
+            while True:
+                getter = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait({task, getter}, return_when=asyncio.FIRST_COMPLETED)
+                if getter in done:
+                    event = getter.result()
+                    if event["event"] == "token":
+                        streamed.append(event["content"])
+                    yield event
+                    continue
+                getter.cancel()
+                break
+            # 완료 직전에 쌓인 이벤트까지 전달
+            while not queue.empty():
+                event = queue.get_nowait()
+                if event["event"] == "token":
+                    streamed.append(event["content"])
+                yield event
+            result = task.result()
+        finally:
+            if not task.done():
+                task.cancel()
         
         # 도구 실행 이벤트들
+        tool_messages = {
+            "router": "의도 분석 완료",
+            "recipe_search": "레시피 검색 완료",
+            "place_search": "주변 식당 검색 완료",
+            "meal_planner": "식단표 생성 완료"
+        }
         for tool_call in result.get("tool_calls", []):
             tool_name = tool_call["tool"]
-            tool_messages = {
-                "router": "의도 분석 완료",
-                "recipe_search": "레시피를 검색하고 있습니다...",
-                "place_search": "주변 식당을 찾고 있습니다...",
-                "meal_planner": "식단표를 생성하고 있습니다..."
-            }
-            
             yield {
                 "event": "tool_execution",
                 "tool": tool_name,
-                "message": tool_messages.get(tool_name, f"{tool_name} 실행 중...")
+                "message": tool_messages.get(tool_name, f"{tool_name} 실행 완료")
             }
-            
-            # 약간의 지연 추가 (UX 개선)
-            await asyncio.sleep(0.5)
+        
+        # 최종 응답 본문: 토큰으로 보낸 부분 이후만 문단 단위 청크로 전송
+        # (후처리로 앞부분이 달라졌으면 content_reset 후 전체를 다시 보냄)
+        response_text = result.get("response") or ""
+        streamed_text = "".join(streamed)
+        if response_text.startswith(streamed_text):
+            response_text = response_text[len(streamed_text):]
+        else:
+            yield {"event": "content_reset"}
+        for chunk in chunk_markdown(response_text):
+            yield {"event": "content", "content": chunk}
         
         # 최종 응답
         yield {
             "event": "complete",
             "response": result["response"],
             "intent": result["intent"],
-            "results": result["results"]
+            "results": result["results"],
+            "meal_plan_data": result.get("meal_plan_data")
         }
 
 
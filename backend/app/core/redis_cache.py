@@ -3,14 +3,17 @@ Redis 캐시 관리 클래스
 서버리스/컨테이너 환경에서도 안전하게 동작하도록 초기화/로깅 강화
 """
 
-import json
+import asyncio
 import logging
-import time
-from typing import Any, Optional, Dict, Tuple
+from typing import Any, Optional, Dict, Iterable, List
 
 import redis
+import redis.asyncio as aioredis
 
+from app.core import cache_codec
 from app.core.config import settings
+from app.core.memory_cache import MemoryCache
+from app.core.tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -23,8 +26,25 @@ class RedisCache:
         self.enabled: bool = False
         self.init_error: Optional[str] = None  # ⬅ 초기화 실패 원인 저장(상태 엔드포인트 노출용)
         
-        # 🚀 로컬용 메모리 캐시 추가
-        self.memory_cache: Dict[str, Tuple[Any, float]] = {}  # key: (value, expire_time)
+        # 🚀 L1 메모리 캐시 (LRU + TTL, 바이트 예산/항목 수 제한, 백그라운드 만료 정리)
+        self.memory_cache = MemoryCache(
+            max_entries=getattr(settings, "memory_cache_max_entries", 2000),
+            max_bytes=getattr(settings, "memory_cache_max_bytes", 64 * 1024 * 1024),
+            sweep_interval=getattr(settings, "memory_cache_sweep_interval", 60.0),
+        )
+        # Redis 히트 값을 L1 에 다시 채울 때의 최대 TTL (남은 Redis TTL 이 더 짧으면 그 값)
+        self.backfill_ttl: float = float(getattr(settings, "memory_cache_backfill_ttl", 300.0))
+        # Redis(L2) 조회 카운터
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self.redis_errors = 0
+        self.compress_threshold: int = int(getattr(settings, "cache_compress_threshold", 4096))
+
+        # asyncio 클라이언트 (이벤트 루프별로 지연 생성, 커넥션 풀 공유)
+        self._redis_url: str = ""
+        self._client_kwargs: Dict[str, Any] = {}
+        self._async_client: Optional[aioredis.Redis] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
 
         # 설정값 읽기
         redis_url: str = (getattr(settings, "redis_url", "") or "").strip()
@@ -50,11 +70,13 @@ class RedisCache:
 
                 # redis-py는 rediss:// 스킴이면 내부적으로 TLS 적용
                 client_kwargs = dict(
-                    decode_responses=True,
+                    decode_responses=False,  # 값은 cache_codec 바이너리 포맷으로 저장
                     socket_timeout=socket_timeout,
                     socket_connect_timeout=socket_timeout,
                     health_check_interval=30,
                     retry_on_timeout=True,
+                    # 워커당 커넥션 풀 상한 (sync/async 각각 적용)
+                    max_connections=int(getattr(settings, "redis_max_connections", 20)),
                 )
 
                 # 인증서 검증 이슈(Managed Redis/프록시 환경 등) 있을 때만 임시 완화
@@ -63,11 +85,13 @@ class RedisCache:
                     client_kwargs["ssl_cert_reqs"] = None  # 구버전 호환 목적
 
                 self.redis_client = redis.from_url(redis_url, **client_kwargs)
+                self._redis_url = redis_url
+                self._client_kwargs = client_kwargs
 
                 # 연결 확인 + 간단한 read/write 검증
                 self.redis_client.ping()
                 self.redis_client.setex("healthcheck", 30, "ok")
-                assert self.redis_client.get("healthcheck") == "ok"
+                assert self.redis_client.get("healthcheck") == b"ok"
 
                 self.enabled = True
                 self.init_error = None
@@ -97,51 +121,66 @@ class RedisCache:
             self.init_error = f"disabled_by_gate({','.join(reasons)})"
             logger.info("ℹ️ Redis 비활성: %s", self.init_error)
 
+    # ---------- 직렬화 ----------
+
+    def _serialize(self, value: Any, codec: Optional[str] = None) -> bytes:
+        """cache_codec 으로 인코딩 (벡터=float32, 일반 값=msgpack, 큰 값은 zlib 압축)"""
+        return cache_codec.encode(value, codec=codec, compress_threshold=self.compress_threshold)
+
+    @staticmethod
+    def _deserialize(raw: Any) -> Any:
+        """cache_codec 디코딩 (헤더 없는 기존 JSON 값도 처리)"""
+        return cache_codec.decode(raw)
+
+    # ---------- 동기 API ----------
+
     def get(self, key: str) -> Optional[Any]:
-        """캐시에서 값 가져오기 (JSON 역직렬화)"""
+        """캐시에서 값 가져오기 (역직렬화)"""
         # 🚀 메모리 캐시 먼저 확인
-        if key in self.memory_cache:
-            value, expire_time = self.memory_cache[key]
-            if time.time() < expire_time:
-                logger.debug("메모리 캐시 히트: %s", key)
-                return value
-            else:
-                # 만료된 캐시 삭제
-                del self.memory_cache[key]
+        hit, value = self.memory_cache.get(key)
+        if hit:
+            logger.debug("메모리 캐시 히트: %s", key)
+            return value
         
         # Redis 캐시 확인
         if not self.enabled or not self.redis_client:
             return None
         try:
-            value = self.redis_client.get(key)
-            return json.loads(value) if value else None
+            # GET + PTTL 을 한 번에 (남은 TTL 로 L1 채움)
+            raw, pttl = self.redis_client.pipeline(transaction=False).get(key).pttl(key).execute()
+            if not raw:
+                self.redis_misses += 1
+                return None
+            self.redis_hits += 1
+            value = self._deserialize(raw)
+            self._backfill(key, value, pttl)
+            return value
         except Exception as e:
+            self.redis_errors += 1
             logger.warning("Redis GET 오류: %r", e)
             return None
 
-    def set(self, key: str, value: Any, ttl: int = 3600) -> bool:
-        """캐시에 값 저장 (JSON 직렬화)"""
+    def set(self, key: str, value: Any, ttl: int = 3600, codec: Optional[str] = None) -> bool:
+        """캐시에 값 저장 (직렬화, codec 지정 시 해당 코덱 강제)"""
         # 🚀 메모리 캐시에도 저장
-        expire_time = time.time() + ttl
-        self.memory_cache[key] = (value, expire_time)
+        self.memory_cache.set(key, value, ttl)
         logger.debug("메모리 캐시 저장: %s (TTL: %ds)", key, ttl)
         
         # Redis 캐시 저장
         if not self.enabled or not self.redis_client:
             return True  # 메모리 캐시는 성공했으므로 True 반환
         try:
-            serialized_value = json.dumps(value, ensure_ascii=False)
-            self.redis_client.setex(key, ttl, serialized_value)
+            self.redis_client.setex(key, ttl, self._serialize(value, codec))
             return True
         except Exception as e:
+            self.redis_errors += 1
             logger.warning("Redis SET 오류: %r", e)
             return True  # 메모리 캐시는 성공했으므로 True 반환
 
     def delete(self, key: str) -> bool:
         """캐시에서 값 삭제"""
         # 🚀 메모리 캐시에서도 삭제
-        if key in self.memory_cache:
-            del self.memory_cache[key]
+        if self.memory_cache.delete(key):
             logger.debug("메모리 캐시 삭제: %s", key)
         
         # Redis 캐시 삭제
@@ -157,13 +196,8 @@ class RedisCache:
     def exists(self, key: str) -> bool:
         """키 존재 여부"""
         # 🚀 메모리 캐시 먼저 확인
-        if key in self.memory_cache:
-            value, expire_time = self.memory_cache[key]
-            if time.time() < expire_time:
-                return True
-            else:
-                # 만료된 캐시 삭제
-                del self.memory_cache[key]
+        if self.memory_cache.contains(key):
+            return True
         
         # Redis 캐시 확인
         if not self.enabled or not self.redis_client:
@@ -174,6 +208,230 @@ class RedisCache:
             logger.warning("Redis EXISTS 오류: %r", e)
             return False
 
+    def mget(self, keys: Iterable[str]) -> List[Optional[Any]]:
+        """여러 키를 한 번에 조회 (메모리 미스분만 Redis MGET 1회)"""
+        keys = list(keys)
+        results: List[Optional[Any]] = [None] * len(keys)
+        missing = self._fill_from_memory(keys, results)
+        if not missing or not self.enabled or not self.redis_client:
+            return results
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            self._queue_mget(pipe, [keys[i] for i in missing])
+            raw_values, *pttls = pipe.execute()
+            self._fill_from_redis(keys, missing, raw_values, pttls, results)
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning("Redis MGET 오류: %r", e)
+        return results
+
+    def mset(self, mapping: Dict[str, Any], ttl: int = 3600, codec: Optional[str] = None) -> bool:
+        """여러 키를 한 번에 저장 (파이프라인 SETEX, 왕복 1회)"""
+        for key, value in mapping.items():
+            self.memory_cache.set(key, value, ttl)
+        if not mapping or not self.enabled or not self.redis_client:
+            return True
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, value in mapping.items():
+                pipe.setex(key, ttl, self._serialize(value, codec))
+            pipe.execute()
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning("Redis MSET(pipeline) 오류: %r", e)
+        return True
+
+    def _fill_from_memory(self, keys: List[str], results: List[Optional[Any]]) -> List[int]:
+        """메모리 캐시로 결과를 채우고, 미스난 인덱스 목록 반환"""
+        missing = []
+        for i, key in enumerate(keys):
+            hit, value = self.memory_cache.get(key)
+            if hit:
+                results[i] = value
+            else:
+                missing.append(i)
+        return missing
+
+    @staticmethod
+    def _queue_mget(pipe: Any, keys: List[str]) -> None:
+        """파이프라인에 MGET 1회 + 키별 PTTL 추가 (왕복은 1회)"""
+        pipe.mget(keys)
+        for key in keys:
+            pipe.pttl(key)
+
+    def _backfill(self, key: str, value: Any, pttl: Any) -> None:
+        """Redis 히트 값을 L1 에 채움 (다른 워커가 쓴 키도 이후엔 메모리에서 조회)
+
+        pttl: -1 은 만료 없음 → backfill_ttl, -2/0 이하는 이미 만료 → 채우지 않음
+        """
+        try:
+            pttl = int(pttl)
+        except (TypeError, ValueError):
+            return
+        if pttl == -1:
+            ttl = self.backfill_ttl
+        elif pttl > 0:
+            ttl = min(self.backfill_ttl, pttl / 1000)
+        else:
+            return
+        if ttl > 0:
+            self.memory_cache.set(key, value, ttl)
+
+    def _fill_from_redis(self, keys: List[str], indices: List[int], raw_values: List[Any],
+                         pttls: List[Any], results: List[Optional[Any]]) -> None:
+        for i, raw, pttl in zip(indices, raw_values, pttls):
+            if not raw:
+                self.redis_misses += 1
+                continue
+            try:
+                results[i] = self._deserialize(raw)
+                self.redis_hits += 1
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning("Redis 값 역직렬화 오류: %r", e)
+                continue
+            self._backfill(keys[i], results[i], pttl)
+
+    # ---------- 비동기 API (redis.asyncio + 커넥션 풀) ----------
+
+    def _get_async_client(self) -> Optional[aioredis.Redis]:
+        """현재 이벤트 루프에 바인딩된 asyncio 클라이언트 반환 (없으면 생성)"""
+        if not self.enabled or not self._redis_url:
+            return None
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            # 루프가 바뀌면(스크립트의 asyncio.run 반복 등) 새 풀을 만든다
+            self._async_client = aioredis.from_url(self._redis_url, **self._client_kwargs)
+            self._async_loop = loop
+        return self._async_client
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """비동기 get — 이벤트 루프를 블로킹하지 않음"""
+        hit, value = self.memory_cache.get(key)
+        if hit:
+            return value
+        try:
+            client = self._get_async_client()
+            if client is None:
+                return None
+            with span("redis.get", ns=key.split(":", 1)[0]):
+                async with client.pipeline(transaction=False) as pipe:
+                    raw, pttl = await pipe.get(key).pttl(key).execute()
+            if not raw:
+                self.redis_misses += 1
+                return None
+            value = self._deserialize(raw)
+            self.redis_hits += 1
+            self._backfill(key, value, pttl)
+            return value
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning("Redis async GET 오류: %r", e)
+            return None
+
+    async def aset(self, key: str, value: Any, ttl: int = 3600, codec: Optional[str] = None) -> bool:
+        """비동기 set"""
+        self.memory_cache.set(key, value, ttl)
+        try:
+            client = self._get_async_client()
+            if client is None:
+                return True
+            await client.setex(key, ttl, self._serialize(value, codec))
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning("Redis async SET 오류: %r", e)
+        return True
+
+    async def adelete(self, *keys: str) -> bool:
+        """비동기 delete (여러 키 한 번에)"""
+        for key in keys:
+            self.memory_cache.delete(key)
+        try:
+            client = self._get_async_client()
+            if client is None or not keys:
+                return True
+            await client.delete(*keys)
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning("Redis async DELETE 오류: %r", e)
+        return True
+
+    async def aexists(self, key: str) -> bool:
+        """비동기 exists"""
+        if self.memory_cache.contains(key):
+            return True
+        try:
+            client = self._get_async_client()
+            if client is None:
+                return False
+            return bool(await client.exists(key))
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning("Redis async EXISTS 오류: %r", e)
+            return False
+
+    async def amget(self, keys: Iterable[str]) -> List[Optional[Any]]:
+        """비동기 다건 조회 (메모리 미스분만 MGET 왕복 1회)"""
+        keys = list(keys)
+        results: List[Optional[Any]] = [None] * len(keys)
+        missing = self._fill_from_memory(keys, results)
+        if not missing:
+            return results
+        try:
+            client = self._get_async_client()
+            if client is None:
+                return results
+            with span("redis.mget", ns=keys[missing[0]].split(":", 1)[0], keys=len(missing)):
+                async with client.pipeline(transaction=False) as pipe:
+                    self._queue_mget(pipe, [keys[i] for i in missing])
+                    raw_values, *pttls = await pipe.execute()
+            self._fill_from_redis(keys, missing, raw_values, pttls, results)
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning("Redis async MGET 오류: %r", e)
+        return results
+
+    async def amset(self, mapping: Dict[str, Any], ttl: int = 3600, codec: Optional[str] = None) -> bool:
+        """비동기 다건 저장 (파이프라인 SETEX, 왕복 1회)"""
+        for key, value in mapping.items():
+            self.memory_cache.set(key, value, ttl)
+        try:
+            client = self._get_async_client()
+            if client is None or not mapping:
+                return True
+            async with client.pipeline(transaction=False) as pipe:
+                for key, value in mapping.items():
+                    pipe.setex(key, ttl, self._serialize(value, codec))
+                await pipe.execute()
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning("Redis async MSET(pipeline) 오류: %r", e)
+        return True
+
+    async def aclose(self) -> None:
+        """asyncio 커넥션 풀 정리 (앱 종료 시)"""
+        client, self._async_client, self._async_loop = self._async_client, None, None
+        if client is not None:
+            try:
+                closer = getattr(client, "aclose", None) or client.close  # redis-py < 5.0.1 은 close()
+                await closer()
+            except Exception as e:
+                logger.warning("Redis async 클라이언트 종료 오류: %r", e)
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 계층별 통계 (상태 엔드포인트 노출용)"""
+        redis_lookups = self.redis_hits + self.redis_misses
+        return {
+            "memory": self.memory_cache.stats(),
+            "redis": {
+                "enabled": bool(self.enabled),
+                "hits": self.redis_hits,
+                "misses": self.redis_misses,
+                "errors": self.redis_errors,
+                "hit_rate": round(self.redis_hits / redis_lookups, 4) if redis_lookups else 0.0,
+            },
+        }
+
 
 # 전역 단일 인스턴스 — 상태 엔드포인트 등에서 반드시 이걸 참조
 redis_cache = RedisCache()
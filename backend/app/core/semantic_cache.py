@@ -7,9 +7,10 @@ import hashlib
 import json
 import time
 from typing import Optional, List, Dict, Any
-import openai
 from app.core.config import settings
+from app.core.embedding_service import embedding_service
 from app.core.database import supabase
+from app.core.tracing import span, traced
 
 
 class SemanticCacheService:
@@ -17,7 +18,6 @@ class SemanticCacheService:
     
     def __init__(self):
         self.supabase = supabase
-        self.openai_client = openai.OpenAI(api_key=settings.openai_api_key)
         self.threshold = 0.90  # 유사도 임계값
         self.window_seconds = 24 * 3600  # 24시간
     
@@ -54,11 +54,7 @@ class SemanticCacheService:
         """텍스트를 임베딩으로 변환"""
         try:
             print(f"📊 시맨틱 캐시 임베딩 생성: {text[:50]}...")
-            response = self.openai_client.embeddings.create(
-                model=settings.embedding_model,
-                input=text
-            )
-            embedding = response.data[0].embedding
+            embedding = await embedding_service.embed(text)
             print(f"✅ 시맨틱 캐시 임베딩 완료: {len(embedding)}차원")
             return embedding
         except Exception as e:
@@ -82,6 +78,7 @@ class SemanticCacheService:
                         return False
         return True
     
+    @traced("cache.semantic_lookup")
     async def semantic_lookup(
         self, 
         text: str, 
@@ -100,14 +97,15 @@ class SemanticCacheService:
                 return None
             
             # Supabase RPC 호출
-            response = self.supabase.rpc("sc_match", {
-                "query_vec": query_vec,
-                "p_user": user_id,
-                "p_model_ver": model_ver,
-                "p_opts_hash": opts_hash,
-                "p_window_seconds": self.window_seconds,
-                "p_limit": 1
-            }).execute()
+            with span("supabase.rpc.sc_match"):
+                response = self.supabase.rpc("sc_match", {
+                    "query_vec": query_vec,
+                    "p_user": user_id,
+                    "p_model_ver": model_ver,
+                    "p_opts_hash": opts_hash,
+                    "p_window_seconds": self.window_seconds,
+                    "p_limit": 1
+                }).execute()
             
             rows = getattr(response, "data", []) or []
             if not rows:
@@ -0,0 +1,50 @@
+"""
+스트리밍 이벤트 채널
+요청 처리 중간 결과(식단 일차 완성 등)를 /chat/stream SSE 로 바로 흘려보내기 위한 컨텍스트 로컬 큐
+
+- stream_response 가 open_stream() 으로 큐를 연 뒤 process_message 를 태스크로 실행
+- 그래프 노드/에이전트는 emit() 만 호출 (스트리밍 요청이 아니면 아무 일도 하지 않음)
+- ContextVar 라서 동시에 처리 중인 다른 요청의 스트림과 섞이지 않는다
+  (asyncio 태스크는 생성 시점의 컨텍스트를 복사하므로 LangGraph 노드 태스크까지 전달됨)
+"""
+
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+_stream_queue: ContextVar[Optional[asyncio.Queue]] = ContextVar("stream_queue", default=None)
+
+
+def is_streaming() -> bool:
+    """현재 요청이 스트리밍 요청인지 (이벤트 생성 비용을 아낄 때 사용)"""
+    return _stream_queue.get() is not None
+
+
+def emit(event: str, **payload: Any) -> None:
+    """현재 스트림에 이벤트 1개 전달 (스트림이 없으면 무시)"""
+    queue = _stream_queue.get()
+    if queue is not None:
+        queue.put_nowait({"event": event, **payload})
+
+
+@contextmanager
+def open_stream() -> Iterator[asyncio.Queue]:
+    """현재 컨텍스트에 이벤트 큐 연결 (with 블록 안에서 만든 태스크가 emit 한 이벤트를 받음)"""
+    queue: asyncio.Queue = asyncio.Queue()
+    token = _stream_queue.set(queue)
+    try:
+        yield queue
+    finally:
+        _stream_queue.reset(token)
+
+
+def chunk_markdown(text: str) -> Iterator[str]:
+    """마크다운 응답을 문단 단위 청크로 분할 (이어 붙이면 원문과 같음)"""
+    start = 0
+    while start < len(text):
+        end = text.find("\n\n", start)
+        end = len(text) if end == -1 else end + 2
+        yield text[start:end]
+        start = end
+
@@ -0,0 +1,314 @@
+"""
+요청 단위 지연 시간 추적 (span)
+그래프 노드 / LLM 호출 / 임베딩 / Supabase RPC / 캐시 조회 구간을 span 으로 기록해
+느린 요청이 어디서 시간을 썼는지 나눠 본다.
+
+- span() 컨텍스트 매니저 / traced() 데코레이터로 구간 측정, 부모-자식 관계는 ContextVar 로 전파
+  (asyncio 태스크는 생성 시점 컨텍스트를 복사하므로 gather/LangGraph 노드 태스크까지 이어짐)
+- start_request() 로 요청 id 를 묶고, 끝나면 flame 형태 요약(format_breakdown)을 로그로 남김
+- 완료된 span 은 최근 구간(rolling window) 통계에 쌓여 /admin/latency 에서 p50/p95/p99 조회
+- 내보내기: TRACE_JSON_PATH 지정 시 JSON Lines 파일, TRACE_OTEL_ENABLED 시 OpenTelemetry tracer
+  (opentelemetry 패키지가 설치된 경우에만, SDK/exporter 설정은 배포 환경에서)
+"""
+
+import json
+import logging
+import math
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Span:
+    name: str
+    span_id: str
+    parent_id: Optional[str]
+    request_id: Optional[str]
+    start: float                      # time.time()
+    duration_ms: float = 0.0
+    status: str = "ok"
+    attrs: Dict[str, Any] = field(default_factory=dict)
+    otel_span: Any = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "request_id": self.request_id,
+            "start": round(self.start, 6),
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "attrs": self.attrs,
+        }
+
+
+@dataclass
+class RequestTrace:
+    request_id: str
+    started: float
+    spans: List[Span] = field(default_factory=list)
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+_current_request: ContextVar[Optional[RequestTrace]] = ContextVar("current_request", default=None)
+_bound_request_id: ContextVar[Optional[str]] = ContextVar("bound_request_id", default=None)
+
+
+# ==========================================
+# 통계 / 내보내기
+# ==========================================
+
+class LatencyWindow:
+    """span 이름별 최근 window_seconds 동안의 소요 시간 샘플"""
+
+    def __init__(self, window_seconds: float, max_samples: int = 4096):
+        self.window_seconds = window_seconds
+        self.max_samples = max_samples
+        self._samples: Dict[str, Deque[Tuple[float, float]]] = {}
+        self._errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, span: Span) -> None:
+        end = span.start + span.duration_ms / 1000
+        with self._lock:
+            samples = self._samples.get(span.name)
+            if samples is None:
+                samples = self._samples[span.name] = deque(maxlen=self.max_samples)
+            samples.append((end, span.duration_ms))
+            if span.status != "ok":
+                self._errors[span.name] = self._errors.get(span.name, 0) + 1
+
+    @staticmethod
+    def _percentile(sorted_values: List[float], q: float) -> float:
+        # nearest-rank
+        return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+    def summary(self, prefix: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        cutoff = time.time() - self.window_seconds
+        result: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for name, samples in self._samples.items():
+                while samples and samples[0][0] < cutoff:
+                    samples.popleft()
+                if not samples or (prefix and not name.startswith(prefix)):
+                    continue
+                values = sorted(ms for _, ms in samples)
+                result[name] = {
+                    "count": len(values),
+                    "p50_ms": round(self._percentile(values, 0.50), 2),
+                    "p95_ms": round(self._percentile(values, 0.95), 2),
+                    "p99_ms": round(self._percentile(values, 0.99), 2),
+                    "max_ms": round(values[-1], 2),
+                    "avg_ms": round(sum(values) / len(values), 2),
+                    "errors": self._errors.get(name, 0),
+                }
+        return dict(sorted(result.items(), key=lambda item: -item[1]["p95_ms"]))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._errors.clear()
+
+
+class JsonSpanSink:
+    """완료된 span 을 JSON Lines 로 파일에 추가 (요청 단위로 한 번에 기록)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.errors = 0
+
+    def export(self, spans: List[Span]) -> None:
+        if not spans:
+            return
+        lines = "".join(json.dumps(s.to_dict(), ensure_ascii=False, default=str) + "\n" for s in spans)
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError as e:
+            self.errors += 1
+            logger.warning("span JSON 기록 실패: %r", e)
+
+
+def _load_otel_tracer():
+    if not settings.trace_otel_enabled:
+        return None
+    try:
+        from opentelemetry import trace as otel_trace
+    except ImportError:
+        print("⚠️ TRACE_OTEL_ENABLED 이지만 opentelemetry 패키지가 없어 OTel 내보내기 비활성")
+        return None
+    return otel_trace
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = settings.tracing_enabled
+        self.window = LatencyWindow(settings.trace_window_seconds)
+        self.json_sink = JsonSpanSink(settings.trace_json_path) if settings.trace_json_path else None
+        self._otel = _load_otel_tracer()
+        self._otel_tracer = self._otel.get_tracer("ketohelper") if self._otel else None
+        self.requests = 0
+
+    # ---------- span ----------
+
+    def _start(self, name: str, attrs: Dict[str, Any]) -> Span:
+        parent = _current_span.get()
+        request = _current_request.get()
+        span = Span(
+            name=name,
+            span_id=uuid.uuid4().hex[:16],
+            parent_id=parent.span_id if parent else None,
+            request_id=request.request_id if request else _bound_request_id.get(),
+            start=time.time(),
+            attrs=attrs,
+        )
+        if self._otel_tracer is not None:
+            parent_ctx = self._otel.set_span_in_context(parent.otel_span) if parent and parent.otel_span else None
+            otel_attrs = {k: v for k, v in attrs.items() if isinstance(v, (str, bool, int, float))}
+            if span.request_id:
+                otel_attrs["request.id"] = span.request_id
+            span.otel_span = self._otel_tracer.start_span(name, context=parent_ctx, attributes=otel_attrs)
+        return span
+
+    def begin(self, name: str, **attrs: Any) -> Optional[Tuple[Span, float]]:
+        """콜백 기반 계측용 수동 시작 (현재 span 으로 설정하지 않음, end() 로 종료)"""
+        if not self.enabled:
+            return None
+        return self._start(name, attrs), time.perf_counter()
+
+    def end(self, handle: Optional[Tuple[Span, float]], error: Optional[BaseException] = None) -> None:
+        if handle is not None:
+            self._finish(handle[0], handle[1], error)
+
+    def _finish(self, span: Span, started: float, error: Optional[BaseException] = None) -> None:
+        span.duration_ms = (time.perf_counter() - started) * 1000
+        if error is not None:
+            span.status = "error"
+            span.attrs["error"] = type(error).__name__
+        if span.otel_span is not None:
+            if error is not None:
+                span.otel_span.record_exception(error)
+            span.otel_span.end()
+            span.otel_span = None
+        self.window.add(span)
+        request = _current_request.get()
+        if request is not None:
+            request.spans.append(span)
+        elif self.json_sink is not None:
+            self.json_sink.export([span])
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[Optional[Span]]:
+        """구간 측정 (비활성 시 아무 것도 하지 않음)"""
+        if not self.enabled:
+            yield None
+            return
+        span = self._start(name, attrs)
+        token = _current_span.set(span)
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            self._finish(span, started, e)
+            raise
+        else:
+            self._finish(span, started)
+        finally:
+            _current_span.reset(token)
+
+    def traced(self, name: str, **attrs: Any) -> Callable:
+        """async 함수 전체를 span 으로 감싸는 데코레이터"""
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                with self.span(name, **attrs):
+                    return await func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    # ---------- 요청 ----------
+
+    @contextmanager
+    def start_request(self, request_id: Optional[str] = None) -> Iterator[RequestTrace]:
+        """요청 단위 trace 시작 (중첩 호출 시 바깥 trace 재사용)"""
+        existing = _current_request.get()
+        if existing is not None:
+            yield existing
+            return
+        trace = RequestTrace(request_id=request_id or _bound_request_id.get() or uuid.uuid4().hex[:8],
+                             started=time.time())
+        token = _current_request.set(trace)
+        try:
+            with self.span("request", request_id=trace.request_id):
+                yield trace
+        finally:
+            _current_request.reset(token)
+            self.requests += 1
+            if self.json_sink is not None:
+                self.json_sink.export(trace.spans)
+
+    def stats(self, prefix: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "window_seconds": self.window.window_seconds,
+            "requests": self.requests,
+            "json_sink": self.json_sink.path if self.json_sink else None,
+            "json_sink_errors": self.json_sink.errors if self.json_sink else 0,
+            "otel": self._otel_tracer is not None,
+            "spans": self.window.summary(prefix),
+        }
+
+
+def bind_request_id(request_id: str) -> None:
+    """API 레이어에서 만든 요청 id 를 현재 컨텍스트에 연결 (이후 start_request / span 이 사용)"""
+    _bound_request_id.set(request_id)
+
+
+def current_request_id() -> Optional[str]:
+    request = _current_request.get()
+    return request.request_id if request else _bound_request_id.get()
+
+
+def format_breakdown(trace: RequestTrace, min_ms: float = 1.0) -> str:
+    """요청 span 트리를 flame 형태 텍스트로 (자식은 부모 아래 들여쓰기, 시작 순서)"""
+    children: Dict[Optional[str], List[Span]] = {}
+    for s in trace.spans:
+        children.setdefault(s.parent_id, []).append(s)
+    known = {s.span_id for s in trace.spans}
+    roots = [s for s in trace.spans if s.parent_id not in known]
+    total = max((s.duration_ms for s in roots), default=0.0) or 1.0
+
+    lines: List[str] = []
+
+    def walk(s: Span, depth: int) -> None:
+        if s.duration_ms < min_ms and depth > 0:
+            return
+        bar = "█" * max(1, int(20 * s.duration_ms / total))
+        detail = " ".join(f"{k}={v}" for k, v in s.attrs.items() if k != "request_id")
+        status = " ❌" if s.status != "ok" else ""
+        lines.append(f"{'  ' * depth}{s.name:<{max(1, 28 - 2 * depth)}} {s.duration_ms:9.1f}ms {bar}{status}"
+                     + (f"  ({detail})" if detail else ""))
+        for child in sorted(children.get(s.span_id, []), key=lambda c: c.start):
+            walk(child, depth + 1)
+
+    for root in sorted(roots, key=lambda r: r.start):
+        walk(root, 0)
+    return "\n".join(lines)
+
+
+tracer = Tracer()
+span = tracer.span
+traced = tracer.traced
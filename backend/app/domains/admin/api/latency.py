@@ -0,0 +1,23 @@
+"""
+구간별 지연 시간 API
+최근 구간(TRACE_WINDOW_SECONDS) 동안 span 이름별 p50/p95/p99
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Query
+
+from app.core.tracing import tracer
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/latency")
+async def get_latency_breakdown(
+    prefix: Optional[str] = Query(None, description="span 이름 접두사 필터 (예: node., llm., supabase.)")
+):
+    """span 이름별 지연 시간 백분위 (p95 내림차순)"""
+    return {
+        "success": True,
+        "data": tracer.stats(prefix),
+    }
@@ -10,6 +10,9 @@ from fastapi import APIRouter, HTTPException
 
 from app.core.config import settings
 from app.core.redis_cache import redis_cache
+from app.core.embedding_service import embedding_service
+from app.core.intent_classifier import intent_result_cache
+from app.tools.meal.meal_candidate_pool import meal_candidate_pool
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -32,6 +35,10 @@ async def check_redis_status():
             "test_result": None,
             "error": None,
             "init_error": redis_cache.init_error,  # ⬅ 초기화 실패 원인을 그대로 노출
+            "cache_stats": redis_cache.stats(),  # L1 메모리/Redis 히트·미스·축출 카운터
+            "embedding_stats": embedding_service.stats(),  # 임베딩 배치/병합/캐시 카운터
+            "meal_pool_stats": meal_candidate_pool.stats(),  # 식단 후보 풀 히트/생성/갱신 카운터
+            "intent_cache_stats": intent_result_cache.stats(),  # 의도 분류 캐시 히트율
         }
 
         # 실제 연결/테스트
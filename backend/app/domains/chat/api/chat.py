@@ -12,6 +12,7 @@ from datetime import datetime
 
 from app.shared.models.schemas import ChatMessage, ChatResponse, ChatThread, ChatHistory
 from app.core.orchestrator import KetoCoachAgent
+from app.core.tracing import bind_request_id
 from app.core.database import supabase
 from app.tools.shared.profile_tool import user_profile_tool
 import os
@@ -139,6 +140,7 @@ async def chat_endpoint(request: ChatMessage):
     """
     import uuid
     request_id = str(uuid.uuid4())[:8]
+    bind_request_id(request_id)  # 오케스트레이터 span/성능 로그에 같은 id 사용
     
     # 중복 요청 방지 임시 비활성화 (게스트 사용자 테스트용)
     # raw_user = request.user_id or request.guest_id or "anon"
@@ -489,6 +491,8 @@ async def chat_stream(request: ChatMessage):
     """
     print(f"🌊 DEBUG: chat_stream 진입! 메시지: '{request.message}'")
     async def generate_response() -> AsyncGenerator[str, None]:
+        # 제너레이터는 응답 전송 시점에 실행되므로 여기서 요청 id 연결
+        bind_request_id(str(uuid.uuid4())[:8])
         try:
             # 스레드 확인/생성
             thread = await ensure_thread(request.user_id, request.guest_id, request.thread_id)
@@ -533,10 +537,16 @@ async def chat_stream(request: ChatMessage):
                 radius_km=request.radius_km or 5.0,
                 profile=profile_with_user_id
             ):
-                full_response += chunk.get("content", "")
+                if chunk.get("event") == "content_reset":
+                    full_response = ""
+                elif chunk.get("event") == "complete":
+                    # 저장은 스트림이 끝난 뒤 최종 응답 기준
+                    full_response = chunk.get("response") or full_response
+                else:
+                    full_response += chunk.get("content", "")
                 yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
             
-            # AI 응답 저장
+            # AI 응답 저장 (스트림 완료 후)
             await insert_chat_message(
                 thread_id=thread_id,
                 role="assistant",
@@ -561,6 +571,7 @@ async def chat_stream(request: ChatMessage):
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",  # 프록시 버퍼링 없이 이벤트 즉시 전달
         }
     )
 
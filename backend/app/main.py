@@ -21,6 +21,7 @@ from app.domains.restaurant.api import places
 from app.domains.meal.api import plans
 from app.domains.profile.api import profile
 from app.domains.admin.api import metrics as admin_metrics
+from app.domains.admin.api import latency as admin_latency
 from app.domains.admin.api.redis_status import router as redis_status_router
 from app.shared.api import auth as auth_api
 from app.core.config import settings
@@ -35,9 +36,27 @@ async def lifespan(app: FastAPI):
     # 데이터베이스 초기화
     asyncio.create_task(init_db())
     
+    # 로컬 레시피 벡터 인덱스 (선택) - 백그라운드 주기 동기화
+    if settings.recipe_ann_enabled:
+        from app.tools.meal.recipe_vector_index import recipe_vector_index
+        recipe_vector_index.start(settings.recipe_ann_sync_interval)
+    
+    # 선호별 식단 후보 풀 - 레시피 변경 시 백그라운드 재생성
+    if settings.meal_pool_enabled:
+        from app.tools.meal.meal_candidate_pool import meal_candidate_pool
+        meal_candidate_pool.start(settings.meal_pool_refresh_interval)
+    
     yield
     
     # 종료 시
+    if settings.recipe_ann_enabled:
+        from app.tools.meal.recipe_vector_index import recipe_vector_index
+        await recipe_vector_index.stop()
+    if settings.meal_pool_enabled:
+        from app.tools.meal.meal_candidate_pool import meal_candidate_pool
+        await meal_candidate_pool.stop()
+    from app.core.redis_cache import redis_cache
+    await redis_cache.aclose()
     print("⏹️ 키토 코치 API 서버 종료")
 
 # FastAPI 앱 생성
@@ -96,6 +115,7 @@ app.include_router(places.router, prefix="/api/v1")
 app.include_router(plans.router, prefix="/api/v1")
 app.include_router(profile.router, prefix="/api/v1")
 app.include_router(admin_metrics.router, prefix="/api/v1")
+app.include_router(admin_latency.router, prefix="/api/v1")
 app.include_router(redis_status_router, prefix="/api/v1", tags=["admin"])
 app.include_router(auth_api.router, prefix="/api/v1")
 print("✅ DEBUG: 모든 라우터 등록 완료")
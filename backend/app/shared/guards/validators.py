@@ -8,6 +8,7 @@ from typing import Dict, List, Any, Optional, Tuple
 from ..models.guard_models import (
     ErrorCode, IntentType, GuardConfig, StockMessages
 )
+from ..utils.keyword_router import keyword_router
 
 
 def clamp(value: int, min_val: int, max_val: int) -> int:
@@ -39,43 +40,24 @@ def sanitize_str_list(values: List[str]) -> List[str]:
 
 def detect_safety(utterance: str) -> bool:
     """안전성 위반 키워드 탐지"""
-    utterance_lower = utterance.lower()
-    
-    for keyword in GuardConfig.FORBIDDEN_KEYWORDS:
-        if keyword in utterance_lower:
-            return True
-    
-    return False
+    return keyword_router.has(utterance, "guard.forbidden")
 
 
 def detect_off_topic(utterance: str) -> bool:
     """오프토픽 키워드 탐지"""
-    utterance_lower = utterance.lower()
-    
-    # 키토/식단 관련 키워드가 있는지 확인
-    keto_keywords = ["키토", "저탄고지", "식단", "레시피", "식당", "맛집", "음식", "요리"]
-    has_keto_keyword = any(keyword in utterance_lower for keyword in keto_keywords)
+    matches = keyword_router.scan(utterance)
     
-    if has_keto_keyword:
-        return False  # 키토 관련이면 오프토픽 아님
+    # 키토/식단 관련 키워드가 있으면 오프토픽 아님
+    if matches.has("guard.keto"):
+        return False
     
     # 오프토픽 키워드 확인
-    for keyword in GuardConfig.OFF_TOPIC_KEYWORDS:
-        if keyword in utterance_lower:
-            return True
-    
-    return False
+    return matches.has("guard.off_topic")
 
 
 def detect_injection(utterance: str) -> bool:
     """프롬프트 인젝션 패턴 탐지"""
-    utterance_lower = utterance.lower()
-    
-    for pattern in GuardConfig.INJECTION_PATTERNS:
-        if pattern in utterance_lower:
-            return True
-    
-    return False
+    return keyword_router.has(utterance, "guard.injection")
 
 
 def detect_input_too_long(utterance: str) -> bool:
@@ -0,0 +1,155 @@
+"""
+공용 키워드 라우터
+모듈마다 흩어져 있던 `any(kw in text for kw in 리스트)` 선형 스캔을 하나의 Aho-Corasick 오토마톤으로 통합
+
+- 모든 규칙 집합(family → 키워드 리스트)을 시작 시 한 번 컴파일
+- 메시지를 한 번만 훑어 모든 family 의 매칭 키워드를 반환 (겹치는 키워드도 모두 검출 → 기존 `in` 검사와 동일)
+- 같은 메시지를 라우터/분류기/답변 노드가 반복 조회하므로 최근 스캔 결과를 LRU 로 재사용
+"""
+
+from collections import deque
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Tuple
+
+from app.shared.models.guard_models import GuardConfig
+
+
+class KeywordMatches:
+    """스캔 결과 (family → 매칭 키워드, 규칙에 적힌 순서)"""
+
+    __slots__ = ("_matches",)
+
+    def __init__(self, matches: Dict[str, Tuple[str, ...]]):
+        self._matches = matches
+
+    def get(self, family: str) -> Tuple[str, ...]:
+        return self._matches.get(family, ())
+
+    def has(self, family: str) -> bool:
+        return family in self._matches
+
+    def families(self) -> FrozenSet[str]:
+        return frozenset(self._matches)
+
+    def __repr__(self) -> str:
+        return f"KeywordMatches({self._matches!r})"
+
+
+class KeywordRouter:
+    """Aho-Corasick 다중 패턴 매처 (대소문자 무시)"""
+
+    def __init__(self, rules: Mapping[str, Iterable[str]], cache_size: int = 1024):
+        self.rules: Dict[str, Tuple[str, ...]] = {
+            family: tuple(dict.fromkeys(kw.lower() for kw in keywords if kw))
+            for family, keywords in rules.items()
+        }
+        # family 별 키워드 순서 (결과를 기존 리스트 순서로 돌려주기 위함)
+        self._order = {
+            family: {kw: i for i, kw in enumerate(keywords)} for family, keywords in self.rules.items()
+        }
+
+        # 트라이: 상태별 전이(dict), 실패 링크, 출력 (family, keyword) 목록
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[str, str]]] = [[]]
+        for family, keywords in self.rules.items():
+            for kw in keywords:
+                state = 0
+                for ch in kw:
+                    nxt = self._goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(self._goto)
+                        self._goto[state][ch] = nxt
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._output.append([])
+                    state = nxt
+                self._output[state].append((family, kw))
+
+        # BFS 로 실패 링크 계산, 실패 상태의 출력을 합쳐 스캔 시 링크를 따라갈 필요 없게 함
+        queue = deque(self._goto[0].values())  # 깊이 1 상태의 실패 링크는 루트(0)
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+
+        self.scan = lru_cache(maxsize=cache_size)(self._scan)
+
+    def _scan(self, text: str) -> KeywordMatches:
+        found: Dict[str, set] = {}
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for ch in (text or "").lower():
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for family, kw in output[state]:
+                found.setdefault(family, set()).add(kw)
+        return KeywordMatches({
+            family: tuple(sorted(kws, key=self._order[family].__getitem__))
+            for family, kws in found.items()
+        })
+
+    def match(self, text: str, family: str) -> Tuple[str, ...]:
+        """family 하나의 매칭 키워드"""
+        return self.scan(text).get(family)
+
+    def has(self, text: str, family: str) -> bool:
+        return self.scan(text).has(family)
+
+
+# ==========================================
+# 규칙 집합 (family 이름 → 키워드)
+# ==========================================
+
+KEYWORD_RULES: Dict[str, List[str]] = {
+    # IntentClassifier 최소 키워드 (우선순위: calendar_save > meal_plan > place_search > recipe_search)
+    "intent.calendar_save": ["캘린더에 저장", "캘린더에 저장해줘", "저장해줘", "일정 등록", "캘린더 추가", "캘린더에", "저장", "넣어줘", "넣어", "추가해줘", "추가해", "캘린더", "일정에", "일정에 저장"],
+    "intent.recipe_search": ["레시피", "조리법"],
+    "intent.meal_plan": ["식단표", "식단 계획", "일주일", "7일", "만들어줘"],
+    "intent.place_search": ["맛집", "식당", "근처"],
+
+    # 답변 노드 캘린더 저장 요청 감지
+    "answer.calendar_save": [
+        "캘린더에 저장", "캘린더 저장", "저장해줘", "저장해",
+        "캘린더에", "캘린더에 추가", "캘린더 추가",
+        "캘린더", "저장", "넣어줘", "넣어", "추가해줘", "추가해"
+    ],
+
+    # 오케스트레이터 fast_mode
+    "fast_mode.accurate": ["정확한", "자세한", "맞춤", "개인", "추천", "최적", "신중하게", "꼼꼼하게"],
+    "fast_mode.fast": ["빠르게", "간단히", "대충", "아무거나", "급해", "빨리", "간단하게"],
+    # MealPlannerAgent fast_mode (오케스트레이터보다 좁은 목록)
+    "planner_fast_mode.accurate": ["정확한", "자세한", "맞춤", "개인", "추천", "최적"],
+    "planner_fast_mode.fast": ["빠르게", "간단히", "대충", "아무거나", "급해"],
+
+    # 의도 → 라우트 세분화
+    "route.mealplan": [
+        "식단표", "식단 만들", "식단 생성", "식단 짜",
+        "일주일", "하루치", "이틀치", "3일치", "사흘치",
+        "주간", "일주일치", "메뉴 계획", "한주", "한 주",
+        "이번주", "다음주", "meal plan", "weekly"
+    ],
+    "route.recipe": [
+        "레시피", "조리법", "만드는 법", "어떻게 만들",
+        "요리 방법", "조리 방법", "recipe", "how to make"
+    ],
+    "route.place": ["식당", "맛집", "음식점", "카페", "레스토랑", "근처", "주변"],
+
+    # 날짜 파서: "25일" 단독 표현은 캘린더 저장 요청일 때만 해석
+    "date.calendar_request": ["캘린더", "저장", "추가", "넣어", "일정"],
+    "date.meal_plan_request": ["식단표", "식단", "계획", "추천", "만들", "생성"],
+
+    # 가드레일
+    "guard.forbidden": GuardConfig.FORBIDDEN_KEYWORDS,
+    "guard.off_topic": GuardConfig.OFF_TOPIC_KEYWORDS,
+    "guard.keto": ["키토", "저탄고지", "식단", "레시피", "식당", "맛집", "음식", "요리"],
+    "guard.injection": GuardConfig.INJECTION_PATTERNS,
+}
+
+keyword_router = KeywordRouter(KEYWORD_RULES)
@@ -5,12 +5,14 @@
 - 식당 저장 기능 확장 가능
 """
 
+import asyncio
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 
 from app.shared.utils.calendar_utils import CalendarUtils
 from app.tools.shared.date_parser import DateParser
 from app.core.database import supabase
+from app.core.stream_events import emit
 
 
 class CalendarSaver:
@@ -360,29 +362,45 @@ class CalendarSaver:
                 end_date = start_date + timedelta(days=duration_days - 1)
                 print(f"🔍 DEBUG: 삭제할 기간: {start_date.date()} ~ {end_date.date()}")
                 
-                delete_result = supabase.table('meal_log').delete().eq(
+                emit("calendar_save", stage="deleting", message="기존 일정을 정리하고 있습니다...")
+                delete_query = supabase.table('meal_log').delete().eq(
                     'user_id', user_id
                 ).gte(
                     'date', start_date.date().isoformat()
                 ).lte(
                     'date', end_date.date().isoformat()
-                ).execute()
+                )
+                # 동기 클라이언트 호출은 스레드에서 실행 (이벤트 루프 블로킹 방지)
+                delete_result = await asyncio.to_thread(delete_query.execute)
                 
                 print(f"🔍 DEBUG: 기존 데이터 삭제 완료: {len(delete_result.data) if delete_result.data else 0}개")
                 
                 # 2. 새 데이터 저장
-                result = supabase.table('meal_log').insert(
-                    meal_logs_to_create
-                ).execute()
+                emit("calendar_save", stage="inserting", message="식단을 캘린더에 저장하고 있습니다...")
+                insert_query = supabase.table('meal_log').insert(meal_logs_to_create)
+                result = await asyncio.to_thread(insert_query.execute)
                 print(f"🔍 DEBUG: Supabase 저장 결과: {result}")
 
-                if result.data:
-                    # 저장 완료 확인을 위한 짧은 지연
-                    import asyncio
-                    await asyncio.sleep(0.5)  # 500ms 지연
+                # 저장 완료 확인: insert 가 반환한 행(read-after-write)으로 요청한 (날짜, 끼니)가 모두 들어갔는지 검증
+                saved_rows = result.data or []
+                expected_keys = {(log.get('date'), log.get('meal_type')) for log in meal_logs_to_create}
+                saved_keys = {(row.get('date'), row.get('meal_type')) for row in saved_rows}
+                missing_keys = expected_keys - saved_keys
+
+                if saved_rows and not missing_keys:
+                    emit("calendar_save", stage="saved", saved_count=len(saved_rows))
                     return {
                         "success": True,
-                        "message": "캘린더에 성공적으로 저장되었습니다!"
+                        "message": "캘린더에 성공적으로 저장되었습니다!",
+                        "saved_count": len(saved_rows)
+                    }
+                elif saved_rows:
+                    print(f"⚠️ 일부 식단만 저장 확인됨: {len(saved_keys)}/{len(expected_keys)} (누락: {sorted(missing_keys)})")
+                    emit("calendar_save", stage="partial", saved_count=len(saved_rows), missing_count=len(missing_keys))
+                    return {
+                        "success": False,
+                        "message": "일부 식단만 저장되었습니다. 다시 시도해주세요.",
+                        "saved_count": len(saved_rows)
                     }
                 else:
                     return {
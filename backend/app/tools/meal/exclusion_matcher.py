@@ -0,0 +1,73 @@
+"""
+알레르기/비선호 제외 매처
+확장된 금지어 집합을 한 번 컴파일해 검색 결과 행마다 한 번의 패스로 검사
+
+기존 규칙(KoreanSearchTool._exact_match_filter + 제목 부분문자열 검사)과 동일:
+- 제목: 금지어가 부분문자열로 포함되면 제외 ("계란샐러드" 등)
+- 재료: 토큰이 금지어와 정확히 일치하거나, 공백 포함 복합 금지어("sesame oil")가 포함되면 제외
+"""
+
+import re
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+# KoreanSearchTool._tokenize_ingredients 와 같은 구분자 (앞뒤가 구분자/문자열 경계인 경우만 토큰 일치)
+_NOT_SEP = r'[^,\s\(\)\[\]\{\}/]'
+_TOKEN_START = rf'(?<!{_NOT_SEP})'
+_TOKEN_END = rf'(?!{_NOT_SEP})'
+
+
+def _alternation(terms: Iterable[str]) -> str:
+    # 긴 단어 우선 → 매칭된 단어 로그가 더 구체적
+    return "|".join(re.escape(t) for t in sorted(set(terms), key=len, reverse=True))
+
+
+class ExclusionMatcher:
+    """금지어 집합 1개에 대한 컴파일된 매처"""
+
+    def __init__(self, terms: Tuple[str, ...]):
+        lowered = [t.strip().lower() for t in terms if t and t.strip()]
+        self.terms = tuple(lowered)
+        self._title_re = re.compile(_alternation(lowered)) if lowered else None
+        # 재료: 단일어는 토큰 단위 정확 일치, 공백 포함 복합어는 부분문자열 → 하나의 정규식으로 1패스
+        parts = []
+        tokens = _alternation(t for t in lowered if ' ' not in t)
+        if tokens:
+            parts.append(f"{_TOKEN_START}(?:{tokens}){_TOKEN_END}")
+        phrases = _alternation(t for t in lowered if ' ' in t)
+        if phrases:
+            parts.append(f"(?:{phrases})")
+        self._ingredient_re = re.compile("|".join(parts)) if parts else None
+
+    def __bool__(self) -> bool:
+        return bool(self.terms)
+
+    def match_title(self, title: str) -> Optional[str]:
+        """제목에 포함된 금지어 반환 (없으면 None)"""
+        if not title or self._title_re is None:
+            return None
+        m = self._title_re.search(title.lower())
+        return m.group(0) if m else None
+
+    def match_ingredients(self, ingredients: List[str]) -> Optional[str]:
+        """금지어가 들어간 첫 재료 반환 (없으면 None)"""
+        if not ingredients or self._ingredient_re is None:
+            return None
+        # 전체 재료를 한 번에 검사하고, 걸린 경우에만 어떤 재료인지 찾음
+        lowered = [ing.lower() if ing else "" for ing in ingredients]
+        if not self._ingredient_re.search("\n".join(lowered)):
+            return None
+        for ing, low in zip(ingredients, lowered):
+            if low and self._ingredient_re.search(low):
+                return ing
+        return None
+
+
+@lru_cache(maxsize=256)
+def _compile(terms: Tuple[str, ...]) -> ExclusionMatcher:
+    return ExclusionMatcher(terms)
+
+
+def get_matcher(terms: Optional[Iterable[str]]) -> ExclusionMatcher:
+    """금지어 집합별 매처 (같은 집합이면 순서와 무관하게 캐시 재사용)"""
+    return _compile(tuple(sorted({t for t in (terms or []) if t})))
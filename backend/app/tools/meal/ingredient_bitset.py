@@ -0,0 +1,97 @@
+"""
+레시피 재료 비트셋
+동의어 사전(app/data/ingredient_synonyms.json)의 표준 재료마다 비트 1개를 배정해
+레시피 → 재료 마스크(bigint), 사용자 알레르기/비선호 → 제외 마스크로 변환한다.
+
+제외 판정은 (recipe_mask & exclude_mask) != 0 한 번으로 끝나고,
+같은 마스크를 fused_recipe_search RPC 에 넘기면 DB 에서 바로 걸러진다.
+(migrations/recipe_ingredient_mask.sql, scripts/build_ingredient_masks.py 참고)
+
+비트 순서는 사전의 표준명 순서(알레르기 → 비선호)를 따르며, vocab 버전(digest)이
+다른 마스크는 신뢰하지 않고 문자열 매칭으로 폴백한다.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.cache_keys import digest
+from app.tools.meal.exclusion_matcher import ExclusionMatcher
+from app.tools.meal.synonym_index import synonym_index
+
+# Postgres bigint(부호 있음) 에 담기 위해 63비트까지만 사용
+MAX_BITS = 63
+
+
+class ExclusionMask:
+    """사용자 1명의 제외 마스크"""
+
+    def __init__(self, mask: int, unmapped: Tuple[str, ...], version: str):
+        self.mask = mask
+        self.unmapped = unmapped  # 사전에 없어 비트로 표현하지 못한 단어 (문자열 매칭 필요)
+        self.version = version
+
+    def check(self, recipe: Dict[str, Any]) -> Optional[bool]:
+        """True: 제외 확정, False: 통과 확정, None: 판단 불가 (문자열 매칭으로 폴백)"""
+        recipe_mask = recipe.get('ingredient_mask')
+        if recipe_mask is None or recipe.get('ingredient_mask_vocab') != self.version:
+            return None
+        if int(recipe_mask) & self.mask:
+            return True
+        return None if self.unmapped else False
+
+
+class IngredientVocabulary:
+    """표준 재료 ↔ 비트 매핑"""
+
+    def __init__(self, synonym_data: Dict[str, Dict[str, List[str]]]):
+        self.bits: Dict[str, int] = {}
+        self._term_to_canonical: Dict[str, str] = {}
+        groups: Dict[str, List[str]] = {}
+
+        for category in ('알레르기', '비선호'):
+            for canonical, synonyms in (synonym_data.get(category) or {}).items():
+                groups.setdefault(canonical, []).extend(synonyms or [])
+                if canonical not in self.bits and len(self.bits) < MAX_BITS:
+                    self.bits[canonical] = len(self.bits)
+
+        for canonical, synonyms in groups.items():
+            for term in [canonical, *synonyms]:
+                self._term_to_canonical.setdefault(term.strip().lower(), canonical)
+
+        # 표준명별 매처 (표준명 + 전체 동의어)
+        self._matchers = [
+            (bit, ExclusionMatcher(tuple([canonical, *groups[canonical]])))
+            for canonical, bit in self.bits.items()
+        ]
+        self.version = digest(list(self.bits.items()), {k: sorted(v) for k, v in groups.items()}, length=12)
+
+    def recipe_mask(self, title: Optional[str], ingredients: Optional[Iterable[Any]]) -> int:
+        """레시피 재료 마스크 (오프라인 인덱싱/로컬 인덱스 동기화 시 계산)"""
+        names = []
+        for item in ingredients or []:
+            if isinstance(item, dict):
+                item = item.get('name')
+            if isinstance(item, str) and item:
+                names.append(item)
+        mask = 0
+        for bit, matcher in self._matchers:
+            if matcher.match_title(title or '') or matcher.match_ingredients(names):
+                mask |= 1 << bit
+        return mask
+
+    def exclusion_mask(self, terms: Optional[Iterable[str]]) -> ExclusionMask:
+        """알레르기/비선호 단어 → 제외 마스크"""
+        mask = 0
+        unmapped = []
+        for term in terms or []:
+            if not term or not term.strip():
+                continue
+            canonical = self._term_to_canonical.get(term.strip().lower())
+            if canonical is not None and canonical in self.bits:
+                mask |= 1 << self.bits[canonical]
+            else:
+                unmapped.append(term)
+        return ExclusionMask(mask, tuple(unmapped), self.version)
+
+
+# 동의어 역색인과 같은 사전 데이터 사용 (JSON 재파싱 없음)
+ingredient_vocabulary = IngredientVocabulary(synonym_index.data)
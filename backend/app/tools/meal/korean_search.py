@@ -4,144 +4,81 @@ PostgreSQL Full-Text Search + pg_trgm + 벡터 검색 통합
 """
 
 import re
-import openai
 import asyncio
-import json
-from typing import List, Dict, Any, Optional
-from pathlib import Path
+import random
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from app.core.database import supabase
 from app.core.config import settings
 from app.core.redis_cache import redis_cache
+from app.core.cache_keys import make_key, normalize_text, normalize_terms
+from app.core.embedding_service import get_embedding_service
+from app.core.tracing import span
+from app.tools.meal.recipe_vector_index import recipe_vector_index
+from app.tools.meal.exclusion_matcher import ExclusionMatcher, get_matcher
+from app.tools.meal.ingredient_bitset import ExclusionMask, ingredient_vocabulary
+from app.tools.meal.synonym_index import synonym_index
+from app.tools.shared.result_fusion import dedupe_best, fuse_leg_scores, fuse_top_k
 
 class KoreanSearchTool:
     """한글 최적화 검색 도구 클래스"""
     
     def __init__(self):
         self.supabase = supabase
-        self.openai_client = openai.OpenAI(api_key=settings.openai_api_key)
+        # recipe_blob_emb 임베딩과 같은 모델 고정 (배치/병합/캐시는 공용 임베딩 서비스가 처리)
+        self.embedding_service = get_embedding_service("text-embedding-3-small")
         
-        # 동의어 사전 로드
-        synonym_file = Path(__file__).parent.parent.parent / 'data' / 'ingredient_synonyms.json'
-        try:
-            with open(synonym_file, 'r', encoding='utf-8') as f:
-                self.synonym_data = json.load(f)
-                print(f"✅ 동의어 사전 로드 완료: {synonym_file}")
-        except Exception as e:
-            print(f"⚠️ 동의어 사전 로드 실패: {e}")
-            self.synonym_data = {"알레르기": {}, "비선호": {}}
-        
-        # 임베딩 캐시 (성능 최적화)
-        self._embedding_cache = {}
-        self._normalization_cache = {}
-        self._expansion_cache = {}
-        self._query_embedding_cache = {}  # 쿼리 임베딩 캐시 추가
-        self._search_results_cache = {}   # 검색 결과 캐시 추가
+        # 동의어 역색인 (로드 시 1회 컴파일, 정규화/확장은 dict 조회)
+        self.synonym_index = synonym_index
+        self.synonym_data = synonym_index.data
         
-        # 캐시 크기 제한 (메모리 최적화)
-        self._max_cache_size = 100  # 최대 100개 항목
+        # fused_recipe_search RPC 미배포 감지 시 True → 이후 4개 레그 병렬 검색만 사용
+        self._fused_unavailable = False
     
-    def _manage_cache_size(self, cache_dict: dict):
-        """캐시 크기 관리 (LRU 방식)"""
-        if len(cache_dict) > self._max_cache_size:
-            # 가장 오래된 항목 제거 (FIFO)
-            oldest_key = next(iter(cache_dict))
-            del cache_dict[oldest_key]
-            print(f"    📊 캐시 크기 관리: {oldest_key[:30]}... 제거")
+    async def _execute(self, request: Any) -> Any:
+        """블로킹 supabase-py 요청(.execute())을 스레드 풀에서 실행해 이벤트 루프를 막지 않음"""
+        # postgrest 요청 경로(/rpc/함수명, /테이블명)로 span 이름 구분
+        path = str(getattr(request, "path", "") or "").strip("/")
+        name = "supabase." + (path.replace("/", ".") if path.startswith("rpc/") else f"table.{path or 'query'}")
+        with span(name):
+            return await asyncio.to_thread(request.execute)
+    
+    async def _run_leg(self, name: str, coro, timeout: float) -> Optional[List[Dict]]:
+        """검색 레그 1개 실행 (타임아웃/오류 시 None → 나머지 레그 결과만 병합)"""
+        try:
+            return await asyncio.wait_for(coro, timeout=timeout)
+        except asyncio.TimeoutError:
+            print(f"    ⏱️ {name} 타임아웃 ({timeout:.1f}s) - 부분 결과로 병합")
+            return None
+        except asyncio.CancelledError:
+            # 검색 태스크 자체가 취소된 경우는 그대로 전파, 레그 내부 작업만 취소된 경우는 부분 결과로
+            task = asyncio.current_task()
+            if task is not None and task.cancelling():
+                raise
+            print(f"    ⚠️ {name} 취소됨 - 부분 결과로 병합")
+            return None
+        except Exception as e:
+            print(f"    ⚠️ {name} 오류 - 부분 결과로 병합: {e}")
+            return None
     
     def _expand_with_synonyms(self, words: List[str], category: str) -> List[str]:
-        """단어 리스트를 동의어로 확장 (캐싱 적용)"""
+        """단어 리스트를 동의어로 확장 (표준명별 상위 5개, 역색인 조회)"""
         if not words:
             return []
-        
-        # 캐시 확인
-        cache_key = f"expand_{category}_{hash(tuple(sorted(words)))}"
-        if cache_key in self._expansion_cache:
-            print(f"📊 확장 캐시 히트: {words}")
-            return self._expansion_cache[cache_key]
-        
-        expanded = []
-        synonym_dict = self.synonym_data.get(category, {})
-        
-        for word in words:
-            expanded.append(word)  # 원래 단어 추가
-            if word in synonym_dict:
-                # 동의어 추가 (최대 5개로 제한)
-                synonyms = synonym_dict[word][:5]  # 처음 5개만 사용
-                expanded.extend(synonyms)
-        
-        # 중복 제거 (순서 유지)
-        seen = set()
-        unique_expanded = []
-        for item in expanded:
-            if item not in seen:
-                seen.add(item)
-                unique_expanded.append(item)
-        
-        # 캐시 저장
-        self._expansion_cache[cache_key] = unique_expanded
-        self._manage_cache_size(self._expansion_cache)
-        print(f"✅ 동의어 확장 완료: {words} → {len(unique_expanded)}개 (캐시 저장)")
-        print(f"    🔍 확장된 항목들: {unique_expanded[:10]}...")  # 처음 10개만 표시
-        return unique_expanded
+        return self.synonym_index.expand(words, category)
     
     def _normalize_to_canonical(self, words: List[str], category: str) -> List[str]:
-        """입력 단어 리스트를 표준명(canonical)으로 정규화 (캐싱 적용)
+        """입력 단어 리스트를 표준명(canonical)으로 정규화 (역색인 조회)
         
         Args:
             words: 입력 단어 리스트 (알레르기/비선호/검색 키워드)
             category: 카테고리 ("알레르기" 또는 "비선호")
         
         Returns:
-            표준명 리스트 (정확 비교용)
+            표준명 리스트 (정확 비교용, 사전에 없는 단어는 원본 유지)
         """
         if not words:
             return []
-        
-        # 캐시 확인
-        cache_key = f"normalize_{category}_{hash(tuple(sorted(words)))}"
-        if cache_key in self._normalization_cache:
-            print(f"📊 정규화 캐시 히트: {words}")
-            return self._normalization_cache[cache_key]
-        
-        synonym_dict = self.synonym_data.get(category, {})
-        canonicals = []
-        
-        for word in words:
-            if not word:
-                continue
-            
-            # 소문자화 및 공백 트림
-            normalized = word.strip().lower()
-            
-            # 역매핑: 동의어 → 표준명
-            found_canonical = None
-            for canonical, synonyms in synonym_dict.items():
-                # 표준명 자체와 일치하는 경우
-                if normalized == canonical.lower():
-                    found_canonical = canonical
-                    break
-                # 동의어 리스트에서 찾기
-                for syn in synonyms:
-                    if normalized == syn.lower():
-                        found_canonical = canonical
-                        break
-                if found_canonical:
-                    break
-            
-            if found_canonical:
-                canonicals.append(found_canonical)
-            else:
-                # 표준명을 찾지 못한 경우 원본 추가
-                canonicals.append(word.strip())
-        
-        # 중복 제거
-        result = list(set(canonicals))
-        
-        # 캐시 저장
-        self._normalization_cache[cache_key] = result
-        self._manage_cache_size(self._normalization_cache)
-        print(f"✅ 정규화 완료: {words} → {result} (캐시 저장)")
-        return result
+        return self.synonym_index.normalize(words, category)
     
     def _tokenize_ingredients(self, text: str) -> List[str]:
         """재료 텍스트를 토큰화
@@ -196,25 +133,10 @@ class KoreanSearchTool:
         return False
     
     async def _create_embedding(self, text: str) -> List[float]:
-        """텍스트를 임베딩으로 변환 (캐싱 적용)"""
+        """텍스트를 임베딩으로 변환 (공용 임베딩 서비스: 배치 + 요청 병합 + 캐시)"""
         try:
-            # 캐시 확인
-            cache_key = f"embedding_{hash(text)}"
-            if cache_key in self._embedding_cache:
-                print(f"📊 임베딩 캐시 히트: {text[:50]}...")
-                return self._embedding_cache[cache_key]
-            
-            print(f"📊 임베딩 생성 중: {text[:50]}...")
-            response = self.openai_client.embeddings.create(
-                model="text-embedding-3-small",
-                input=text
-            )
-            embedding = response.data[0].embedding
-            
-            # 캐시 저장
-            self._embedding_cache[cache_key] = embedding
-            self._manage_cache_size(self._embedding_cache)
-            print(f"✅ 임베딩 생성 완료: {len(embedding)}차원 (캐시 저장)")
+            embedding = await self.embedding_service.embed(text)
+            print(f"✅ 임베딩 준비 완료: {len(embedding)}차원 ({text[:30]}...)")
             return embedding
         except Exception as e:
             print(f"❌ 임베딩 생성 오류: {e}")
@@ -295,7 +217,7 @@ class KoreanSearchTool:
 
             for vq in self._generate_query_variants(query):
                 try:
-                    res = self.supabase.rpc('ilike_search', {'query_text': vq, 'match_count': k}).execute()
+                    res = await self._execute(self.supabase.rpc('ilike_search', {'query_text': vq, 'match_count': k}))
                     rows = res.data or []
                     if rows:
                         formatted = []
@@ -324,10 +246,10 @@ class KoreanSearchTool:
         try:
             if isinstance(self.supabase, type(None)) or hasattr(self.supabase, '__class__') and 'DummySupabase' in str(self.supabase.__class__):
                 return []
-            results = self.supabase.rpc('groonga_search', {
+            results = await self._execute(self.supabase.rpc('groonga_search', {
                 'query_text': query,
                 'match_count': k
-            }).execute()
+            }))
 
             formatted_results = []
             for result in results.data or []:
@@ -354,10 +276,10 @@ class KoreanSearchTool:
                 return []
             
             # Full-Text Search 실행 (RPC 함수 사용)
-            results = self.supabase.rpc('fts_search', {
+            results = await self._execute(self.supabase.rpc('fts_search', {
                 'query_text': query,
                 'match_count': k
-            }).execute()
+            }))
             
             formatted_results = []
             for result in results.data or []:
@@ -386,10 +308,10 @@ class KoreanSearchTool:
                 return []
             
             # Trigram 유사도 검색 (RPC 함수 사용)
-            results = self.supabase.rpc('trgm_search', {
+            results = await self._execute(self.supabase.rpc('trgm_search', {
                 'query_text': query,
                 'match_count': k
-            }).execute()
+            }))
             
             formatted_results = []
             for result in results.data or []:
@@ -411,6 +333,133 @@ class KoreanSearchTool:
             print(f"Trigram 유사도 검색 오류: {e}")
             return []
     
+    async def _resolve_preferences(self, user_id: Optional[str], allergies: Optional[List[str]],
+                                   dislikes: Optional[List[str]]) -> Tuple[List[str], List[str]]:
+        """알레르기/비선호 목록 결정 (파라미터 우선, 없으면 프로필 조회)"""
+        # 1. 파라미터로 전달된 allergies/dislikes가 있으면 우선 사용
+        user_allergies = allergies if allergies is not None else []
+        user_dislikes = dislikes if dislikes is not None else []
+        # print(f"    🔍 전달받은 알레르기: {user_allergies}")  # 임시 비활성화
+        # print(f"    🔍 전달받은 비선호: {user_dislikes}")  # 임시 비활성화
+        
+        # 2. 파라미터가 없으면 프로필에서 조회
+        if not user_allergies and not user_dislikes and user_id:
+            # print(f"    🔍 프로필에서 알레르기 정보 조회: user_id={user_id}")  # 임시 비활성화
+            from app.tools.shared.profile_tool import user_profile_tool
+            user_preferences = await user_profile_tool.get_user_preferences(user_id)
+            
+            if user_preferences.get("success"):
+                prefs = user_preferences["preferences"]
+                user_allergies = prefs.get("allergies", [])
+                user_dislikes = prefs.get("dislikes", [])
+                # print(f"    🔍 프로필에서 조회된 알레르기: {user_allergies}")  # 임시 비활성화
+                # print(f"    🔍 프로필에서 조회된 비선호: {user_dislikes}")  # 임시 비활성화
+            else:
+                print(f"    ⚠️ 프로필 조회 실패: {user_preferences}")
+        
+        return user_allergies, user_dislikes
+    
+    def _expand_exclusions(self, allergy_names: Optional[List[str]], dislike_names: Optional[List[str]]) -> Tuple[List[str], List[str]]:
+        """알레르기/비선호 → 표준명 정규화 → 동의어 확장"""
+        # 표준명으로 정규화 (동의어 확장 대신)
+        canonical_allergens = self._normalize_to_canonical(allergy_names, '알레르기') if allergy_names else []
+        canonical_dislikes = self._normalize_to_canonical(dislike_names, '비선호') if dislike_names else []
+        
+        # 동의어 확장 (캐싱된 함수 사용)
+        expanded_allergens = self._expand_with_synonyms(canonical_allergens, '알레르기') if canonical_allergens else []
+        expanded_dislikes = self._expand_with_synonyms(canonical_dislikes, '비선호') if canonical_dislikes else []
+        return expanded_allergens, expanded_dislikes
+    
+    def _is_excluded_row(self, result: Dict, allergen_matcher: ExclusionMatcher, dislike_matcher: ExclusionMatcher,
+                         exclusion_mask: Optional[ExclusionMask] = None) -> bool:
+        """검색 결과 1건이 알레르기/비선호 재료를 포함하는지
+        
+        재료 비트셋이 있는 행은 마스크 AND 한 번으로 판정하고,
+        없으면 제목 부분문자열 + 재료 토큰 (컴파일된 매처 1패스)으로 검사한다.
+        """
+        if exclusion_mask is not None:
+            verdict = exclusion_mask.check(result)
+            if verdict is not None:
+                # print(f"    ⚠️ 재료 비트셋 제외: '{result.get('title')}'")  # 임시 비활성화
+                return verdict
+        
+        title = result.get('title', '') or ''
+        ingredients = result.get('ingredients', []) or []
+        
+        # 알레르기 체크
+        if allergen_matcher:
+            matched = allergen_matcher.match_title(title)
+            if matched:
+                print(f"    ⚠️ 알레르기 제외: '{title}' (제목에 '{matched}' 포함)")
+                return True
+            matched_ing = allergen_matcher.match_ingredients(ingredients)
+            if matched_ing:
+                print(f"    ⚠️ 알레르기 제외: '{title}' (재료 '{matched_ing}'에 알레르기 재료 포함)")
+                return True
+        
+        # 비선호 체크
+        if dislike_matcher:
+            if dislike_matcher.match_title(title) or dislike_matcher.match_ingredients(ingredients):
+                # print(f"    ⚠️ 비선호 제외: '{title}'")  # 임시 비활성화
+                return True
+        
+        return False
+    
+    async def _remote_vector_search(self, query_embedding: List[float], max_search_count: int, meal_type: Optional[str],
+                                    user_allergies: List[str], user_dislikes: List[str]) -> List[Dict]:
+        """vector_search RPC 호출 (알레르기/비선호 임베딩 제외 조건 포함), 원본 행 반환"""
+        # 알레르기/비선호 정보 준비
+        exclude_allergens_embeddings = None
+        exclude_dislikes_embeddings = None
+        exclude_allergens_names = None
+        exclude_dislikes_names = None
+        
+        # 알레르기/비선호 임베딩 동시 생성
+        allergy_embedding, dislike_embedding = await asyncio.gather(
+            self._create_embedding(' '.join(user_allergies)) if user_allergies else asyncio.sleep(0, result=None),
+            self._create_embedding(' '.join(user_dislikes)) if user_dislikes else asyncio.sleep(0, result=None),
+        )
+        
+        # 알레르기 임베딩
+        if user_allergies:
+            exclude_allergens_embeddings = [allergy_embedding]
+            exclude_allergens_names = user_allergies
+            # print(f"🔍 알레르기 임베딩 생성 (1개): {user_allergies}")  # 임시 비활성화
+        
+        # 비선호 임베딩
+        if user_dislikes:
+            exclude_dislikes_embeddings = [dislike_embedding]
+            exclude_dislikes_names = user_dislikes
+            print(f"🔍 비선호 임베딩 생성 (1개): {user_dislikes}")
+        
+        # 벡터 검색 실행 (RPC 함수 사용)
+        rpc_params = {
+            'query_embedding': query_embedding,
+            'match_count': max_search_count,
+            'similarity_threshold': 0.0
+        }
+        # print(f"    🔍 최대 검색 수: {max_search_count}개 (알레르기 필터링 고려)")  # 임시 비활성화
+        
+        # 단일 벡터로 전달 (배열의 첫 번째 요소)
+        if exclude_allergens_embeddings:
+            rpc_params['exclude_allergens_embedding'] = exclude_allergens_embeddings[0]
+        if exclude_dislikes_embeddings:
+            rpc_params['exclude_dislikes_embedding'] = exclude_dislikes_embeddings[0]
+        if exclude_allergens_names:
+            rpc_params['exclude_allergens_names'] = exclude_allergens_names
+        if exclude_dislikes_names:
+            rpc_params['exclude_dislikes_names'] = exclude_dislikes_names
+        
+        # 🆕 meal_type 필터 추가 (항상 전달하여 함수 오버로딩 모호성 제거)
+        rpc_params['meal_type_filter'] = meal_type if meal_type else None
+        if meal_type:
+            print(f"🍽️ meal_type 필터 적용: {meal_type}")
+        
+        print(f"🔍 RPC 파라미터: allergens={len(exclude_allergens_names) if exclude_allergens_names else 0}, dislikes={len(exclude_dislikes_names) if exclude_dislikes_names else 0}")
+        
+        results = await self._execute(self.supabase.rpc('vector_search', rpc_params))
+        return results.data or []
+    
     async def _vector_search(self, query: str, query_embedding: List[float], k: int, user_id: Optional[str] = None, meal_type: Optional[str] = None,
                             allergies: Optional[List[str]] = None, dislikes: Optional[List[str]] = None) -> List[Dict]:
         """벡터 검색 (사용자 프로필 기반 필터링 + 임시 제약조건)"""
@@ -420,161 +469,29 @@ class KoreanSearchTool:
                 # print(f"🔍 DEBUG: Supabase가 None이거나 DummySupabase - 빈 결과 반환")  # 임시 비활성화
                 return []
             
-            # 알레르기/비선호 정보 준비
-            exclude_allergens_embeddings = None
-            exclude_dislikes_embeddings = None
-            exclude_allergens_names = None
-            exclude_dislikes_names = None
+            user_allergies, user_dislikes = await self._resolve_preferences(user_id, allergies, dislikes)
+            expanded_allergens, expanded_dislikes = self._expand_exclusions(user_allergies, user_dislikes)
+            exclusion_mask = ingredient_vocabulary.exclusion_mask([*user_allergies, *user_dislikes])
             
-            # 1. 파라미터로 전달된 allergies/dislikes가 있으면 우선 사용
-            user_allergies = allergies if allergies is not None else []
-            user_dislikes = dislikes if dislikes is not None else []
-            # print(f"    🔍 전달받은 알레르기: {user_allergies}")  # 임시 비활성화
-            # print(f"    🔍 전달받은 비선호: {user_dislikes}")  # 임시 비활성화
-            
-            # 2. 파라미터가 없으면 프로필에서 조회
-            if not user_allergies and not user_dislikes and user_id:
-            # print(f"    🔍 프로필에서 알레르기 정보 조회: user_id={user_id}")  # 임시 비활성화
-                from app.tools.shared.profile_tool import user_profile_tool
-                user_preferences = await user_profile_tool.get_user_preferences(user_id)
-                
-                if user_preferences.get("success"):
-                    prefs = user_preferences["preferences"]
-                    user_allergies = prefs.get("allergies", [])
-                    user_dislikes = prefs.get("dislikes", [])
-                    # print(f"    🔍 프로필에서 조회된 알레르기: {user_allergies}")  # 임시 비활성화
-                    # print(f"    🔍 프로필에서 조회된 비선호: {user_dislikes}")  # 임시 비활성화
-                else:
-                    print(f"    ⚠️ 프로필 조회 실패: {user_preferences}")
-            
-            # 알레르기 임베딩 생성
-            if user_allergies:
-                allergy_text = ' '.join(user_allergies)
-                allergy_embedding = await self._create_embedding(allergy_text)
-                exclude_allergens_embeddings = [allergy_embedding]
-                exclude_allergens_names = user_allergies
-                # print(f"🔍 알레르기 임베딩 생성 (1개): {user_allergies}")  # 임시 비활성화
-            
-            # 비선호 임베딩 생성
-            if user_dislikes:
-                dislike_text = ' '.join(user_dislikes)
-                dislike_embedding = await self._create_embedding(dislike_text)
-                exclude_dislikes_embeddings = [dislike_embedding]
-                exclude_dislikes_names = user_dislikes
-                print(f"🔍 비선호 임베딩 생성 (1개): {user_dislikes}")
-            
-            # 벡터 검색 실행 (RPC 함수 사용) - 최대한 많은 데이터 검색
-            # 알레르기 필터링을 고려하여 충분한 데이터 확보
+            # 최대한 많은 데이터 검색 (알레르기 필터링을 고려하여 충분한 데이터 확보)
             max_search_count = 1000  # 최대 1000개 검색 (DB의 모든 데이터)
             
-            rpc_params = {
-                'query_embedding': query_embedding,
-                'match_count': max_search_count,
-                'similarity_threshold': 0.0
-            }
-            # print(f"    🔍 최대 검색 수: {max_search_count}개 (알레르기 필터링 고려)")  # 임시 비활성화
-            
-            # 단일 벡터로 전달 (배열의 첫 번째 요소)
-            if exclude_allergens_embeddings:
-                rpc_params['exclude_allergens_embedding'] = exclude_allergens_embeddings[0]
-            if exclude_dislikes_embeddings:
-                rpc_params['exclude_dislikes_embedding'] = exclude_dislikes_embeddings[0]
-            if exclude_allergens_names:
-                rpc_params['exclude_allergens_names'] = exclude_allergens_names
-            if exclude_dislikes_names:
-                rpc_params['exclude_dislikes_names'] = exclude_dislikes_names
-            
-            # 🆕 meal_type 필터 추가 (항상 전달하여 함수 오버로딩 모호성 제거)
-            rpc_params['meal_type_filter'] = meal_type if meal_type else None
-            if meal_type:
-                print(f"🍽️ meal_type 필터 적용: {meal_type}")
-            
-            print(f"🔍 RPC 파라미터: allergens={len(exclude_allergens_names) if exclude_allergens_names else 0}, dislikes={len(exclude_dislikes_names) if exclude_dislikes_names else 0}")
-            
-            results = self.supabase.rpc('vector_search', rpc_params).execute()
+            if getattr(settings, "recipe_ann_enabled", False) and recipe_vector_index.ready:
+                # 🧭 로컬 벡터 인덱스: 원격 RPC 없이 meal_type/알레르기 태그 사전 필터 + top-k
+                rows = recipe_vector_index.search(query_embedding, max_search_count, meal_type=meal_type,
+                                                  exclude_allergens=expanded_allergens, exclude_mask=exclusion_mask.mask)
+                print(f"🧭 로컬 벡터 인덱스 검색: {len(rows)}개 (meal_type={meal_type})")
+            else:
+                rows = await self._remote_vector_search(query_embedding, max_search_count, meal_type, user_allergies, user_dislikes)
             
             formatted_results = []
             filtered_count = 0
             
-            # 표준명으로 정규화 (동의어 확장 대신)
-            canonical_allergens = self._normalize_to_canonical(exclude_allergens_names, '알레르기') if exclude_allergens_names else []
-            canonical_dislikes = self._normalize_to_canonical(exclude_dislikes_names, '비선호') if exclude_dislikes_names else []
-            
-            # 동의어 확장 (캐싱된 함수 사용)
-            expanded_allergens = self._expand_with_synonyms(canonical_allergens, '알레르기') if canonical_allergens else []
-            expanded_dislikes = self._expand_with_synonyms(canonical_dislikes, '비선호') if canonical_dislikes else []
-            
-            # print(f"    🔍 정규화된 알레르기: {canonical_allergens}")  # 임시 비활성화
-            # print(f"    🔍 확장된 알레르기: {len(expanded_allergens)}개 - {expanded_allergens[:10]}...")  # 임시 비활성화
-            # print(f"    🔍 정규화된 비선호: {canonical_dislikes}")  # 임시 비활성화
-            # print(f"    🔍 확장된 비선호: {len(expanded_dislikes)}개 - {expanded_dislikes[:10]}...")  # 임시 비활성화
-            # print(f"    🚨 알레르기 필터링 시작 - 총 {len(results.data or [])}개 결과 검사")  # 임시 비활성화
-            
-            for result in results.data or []:
-                # 🚨 Python 레벨 필터링: title, ingredients에서 알레르기/비선호 체크
-                title = result.get('title', '')
-                ingredients = result.get('ingredients', [])
-                should_skip = False
-                # print(f"    🔍 검사 중: '{title}' (재료: {ingredients[:3]}...)")  # 임시 비활성화
-                
-                # 알레르기 체크 (토큰 매칭 + 부분 문자열 매칭)
-                # print(f"    🔍 알레르기 체크 조건: expanded_allergens={len(expanded_allergens) if expanded_allergens else 0}, should_skip={should_skip}")  # 임시 비활성화
-                if expanded_allergens and not should_skip:
-                    # 제목 체크 (토큰 매칭)
-                    if self._exact_match_filter(title, expanded_allergens):
-                        print(f"    ⚠️ 알레르기 제외: '{title}' (제목에 알레르기 재료 포함)")
-                        filtered_count += 1
-                        should_skip = True
-                    
-                    # 제목 체크 (부분 문자열 매칭 - "계란샐러드" 같은 경우)
-                    if not should_skip:
-                        title_lower = title.lower()
-                        for allergen in expanded_allergens:
-                            if allergen in title_lower:
-                                print(f"    ⚠️ 알레르기 제외: '{title}' (제목에 '{allergen}' 포함)")
-                                print(f"        🔍 매칭된 알레르기: '{allergen}' in '{title_lower}'")
-                                filtered_count += 1
-                                should_skip = True
-                                break
-                    
-                    # 재료 체크
-                    if not should_skip:
-                        for ing in ingredients:
-                            if self._exact_match_filter(ing, expanded_allergens):
-                                print(f"    ⚠️ 알레르기 제외: '{title}' (재료 '{ing}'에 알레르기 재료 포함)")
-                                print(f"        🔍 매칭된 재료: '{ing}' in 알레르기 목록")
-                                filtered_count += 1
-                                should_skip = True
-                                break
-                
-                # 비선호 체크 (토큰 매칭 + 부분 문자열 매칭)
-                if expanded_dislikes and not should_skip:
-                    # 제목 체크 (토큰 매칭)
-                    if self._exact_match_filter(title, expanded_dislikes):
-                        # print(f"    ⚠️ 비선호 제외: '{title}' (제목에 비선호 재료 포함)")  # 임시 비활성화
-                        filtered_count += 1
-                        should_skip = True
-                    
-                    # 제목 체크 (부분 문자열 매칭 - "계란샐러드" 같은 경우)
-                    if not should_skip:
-                        title_lower = title.lower()
-                        for dislike in expanded_dislikes:
-                            if dislike in title_lower:
-                                # print(f"    ⚠️ 비선호 제외: '{title}' (제목에 '{dislike}' 포함)")  # 임시 비활성화
-                                filtered_count += 1
-                                should_skip = True
-                                break
-                    
-                    # 재료 체크
-                    if not should_skip:
-                        for ing in ingredients:
-                            if self._exact_match_filter(ing, expanded_dislikes):
-                                # print(f"    ⚠️ 비선호 제외: '{title}' (재료 '{ing}'에 비선호 재료 포함)")  # 임시 비활성화
-                                filtered_count += 1
-                                should_skip = True
-                                break
-                
-                if should_skip:
+            # 🚨 Python 레벨 필터링: title, ingredients에서 알레르기/비선호 체크 (금지어 집합별 컴파일 매처)
+            allergen_matcher, dislike_matcher = get_matcher(expanded_allergens), get_matcher(expanded_dislikes)
+            for result in rows:
+                if self._is_excluded_row(result, allergen_matcher, dislike_matcher, exclusion_mask):
+                    filtered_count += 1
                     continue
                 
                 # 통과!
@@ -593,7 +510,7 @@ class KoreanSearchTool:
             if filtered_count > 0:
                 print(f"    🔍 Python 필터링: {filtered_count}개 제외됨")
             
-            print(f"    ✅ 최종 결과: {len(formatted_results)}개 (검색 {len(results.data or [])}개 → 필터링 후 {len(formatted_results)}개)")
+            print(f"    ✅ 최종 결과: {len(formatted_results)}개 (검색 {len(rows)}개 → 필터링 후 {len(formatted_results)}개)")
             
             return formatted_results
             
@@ -619,7 +536,7 @@ class KoreanSearchTool:
             for keyword in keywords[:3]:  # 상위 3개 키워드만 사용
                 try:
                     # 제목에서 키워드 검색만 사용 (JSONB 검색 제거)
-                    title_results = self.supabase.table('recipe_blob_emb').select('*').ilike('title', f'%{keyword}%').limit(k).execute()
+                    title_results = await self._execute(self.supabase.table('recipe_blob_emb').select('*').ilike('title', f'%{keyword}%').limit(k))
                     
                     all_results.extend(title_results.data or [])
                     
@@ -628,13 +545,7 @@ class KoreanSearchTool:
                     continue
             
             # 중복 제거
-            seen_ids = set()
-            unique_results = []
-            for result in all_results:
-                result_id = result.get('id')
-                if result_id and result_id not in seen_ids:
-                    seen_ids.add(result_id)
-                    unique_results.append(result)
+            unique_results = dedupe_best(all_results)
             
             # 결과 포맷팅
             formatted_results = []
@@ -657,285 +568,391 @@ class KoreanSearchTool:
             print(f"폴백 ILIKE 검색 오류: {e}")
             return []
     
-    async def korean_hybrid_search(self, query: str, k: int = 5, user_id: Optional[str] = None, meal_type: Optional[str] = None, 
-                                   allergies: Optional[List[str]] = None, dislikes: Optional[List[str]] = None) -> List[Dict]:
-        """한글 최적화 하이브리드 검색 (병렬 실행 방식 + 결과 캐싱)"""
-        try:
-            print(f"🔍 한글 최적화 하이브리드 검색 시작: '{query}'")
-            
-            # 스마트 캐시 시스템: 다양성 확보를 위한 랜덤 요소 추가
-            import random
-            import time
-            
-            # 기본 캐시 키
-            base_cache_key = f"search_{hash(query)}_{k}_{user_id}_{meal_type}_{hash(tuple(sorted(allergies or [])))}_{hash(tuple(sorted(dislikes or [])))}"
-            
-            # 다양성을 위한 랜덤 요소 (매번 다른 결과를 위해 캐시 비활성화)
-            # random_seed = int(time.time() / 300)  # 5분마다 변경
-            # random_factor = random.randint(1, 10)
-            # cache_key = f"{base_cache_key}_{random_seed}_{random_factor}"
-            
-            # 🚀 다양성 확보를 위해 캐시 비활성화 (매번 새로운 결과)
-            cache_key = f"{base_cache_key}_{int(time.time())}_{random.randint(1, 1000)}"
-            
-            print(f"  🎲 스마트 캐시 키: {cache_key}")
-            
-            # Redis 캐시 확인
-            cached_result = redis_cache.get(cache_key)
-            if cached_result:
-                print(f"    📊 Redis 검색 결과 캐시 히트: {query[:30]}...")
-                return cached_result
-            
-            # 메모리 캐시 확인 (폴백)
-            if cache_key in self._search_results_cache:
-                print(f"    📊 메모리 검색 결과 캐시 히트: {query[:30]}...")
-                return self._search_results_cache[cache_key]
-            
-            all_results = []
-            search_strategy = "hybrid"
-            search_message = "종합 검색 결과입니다."
-            
-            # 모든 검색 방식을 병렬로 실행
-            print("  🚀 모든 검색 방식 병렬 실행...")
-            
-            # 1. 벡터 검색 (가중치 40% - 가장 높음)
-            print("    📊 벡터 검색 실행...")
-            
-            # 쿼리 임베딩 캐싱 (Redis 우선, 메모리 폴백)
-            query_cache_key = f"query_{hash(query)}"
-            
-            # Redis에서 쿼리 임베딩 확인
-            cached_embedding = redis_cache.get(query_cache_key)
-            if cached_embedding:
-                print(f"    📊 Redis 쿼리 임베딩 캐시 히트: {query[:30]}...")
-                query_embedding = cached_embedding
-            elif query_cache_key in self._query_embedding_cache:
-                print(f"    📊 쿼리 임베딩 캐시 히트: {query[:30]}...")
-                query_embedding = self._query_embedding_cache[query_cache_key]
-            else:
-                query_embedding = await self._create_embedding(query)
-                if query_embedding:
-                    # Redis에 쿼리 임베딩 저장 (TTL: 1시간)
-                    redis_cache.set(query_cache_key, query_embedding, ttl=3600)
-                    # 메모리 캐시에도 저장 (폴백용)
-                    self._query_embedding_cache[query_cache_key] = query_embedding
-                    self._manage_cache_size(self._query_embedding_cache)
-                    print(f"    📊 쿼리 임베딩 캐시 저장: {query[:30]}...")
-            
-            vector_results = []
-            if query_embedding:
-                vector_results = await self._vector_search(query, query_embedding, k, user_id, meal_type, allergies, dislikes)
-                for result in vector_results:
-                    result['final_score'] = result['search_score'] * 0.4
-                    result['search_type'] = 'vector'
-                all_results.extend(vector_results)
-                # print(f"    ✅ 벡터 검색 완료: {len(vector_results)}개")  # 임시 비활성화
-            else:
-                print("    ⚠️ 임베딩 생성 실패, 벡터 검색 건너뜀")
-            
+    # 검색 단계 후보 풀 최대 크기 (캐시 크기 제한, 다양성 단계는 이 안에서 선택)
+    CANDIDATE_POOL_SIZE = 100
+    # 레그별 가중치 (fused_recipe_search RPC 와 파이썬 병합에서 동일하게 사용)
+    LEG_WEIGHTS = {'vector': 0.4, 'exact_ilike': 0.35, 'fts': 0.3, 'trigram': 0.2}
+
+    async def _retrieve_candidates(self, query: str, k: int, user_id: Optional[str] = None, meal_type: Optional[str] = None,
+                                   allergies: Optional[List[str]] = None, dislikes: Optional[List[str]] = None) -> Dict[str, Any]:
+        """검색 단계: 벡터 + ILIKE + FTS + Trigram 결과를 병합해 점수순 후보 풀 생성 (안정 키로 캐싱)
+
+        Returns:
+            {"candidates": 점수순 후보 리스트, "search_strategy": str, "search_message": str}
+        """
+        cache_key = make_key(
+            "search", normalize_text(query),
+            k=k, user_id=user_id, meal_type=meal_type,
+            allergies=normalize_terms(allergies), dislikes=normalize_terms(dislikes),
+        )
+        cached = await redis_cache.aget(cache_key)
+        if cached and isinstance(cached, dict):
+            print(f"    📊 검색 후보 풀 캐시 히트: {query[:30]}... ({len(cached.get('candidates', []))}개)")
+            return cached
+        
+        all_results = []
+        search_strategy = "hybrid"
+        search_message = "종합 검색 결과입니다."
+        timeout = float(getattr(settings, "korean_search_leg_timeout", 8.0))
+        
+        # 1순위: 단일 RPC(fused_recipe_search)로 4개 레그 + 융합을 DB에서 한 번에 실행
+        fused_results = None
+        if getattr(settings, "fused_search_enabled", True) and not self._fused_unavailable:
+            fused_results = await self._run_leg(
+                "통합 검색(fused_recipe_search)",
+                self._fused_search(query, user_id, meal_type, allergies, dislikes),
+                timeout,
+            )
+        
+        if fused_results is not None:
+            degraded = False
+            all_results = fused_results
+            leg_counts = {
+                leg: sum(1 for r in fused_results if r['metadata'].get(score_field) is not None)
+                for leg, score_field in (('vector', 'vector_score'), ('exact_ilike', 'ilike_score'),
+                                         ('fts', 'fts_score'), ('trigram', 'trgm_score'))
+            }
+            print(f"    ✅ 통합 검색 완료: {len(fused_results)}개 (벡터 {leg_counts['vector']} / ILIKE {leg_counts['exact_ilike']} / FTS {leg_counts['fts']} / Trigram {leg_counts['trigram']})")
+        else:
+            # 폴백: 모든 검색 방식을 병렬로 실행 (레그별 타임아웃, 느린 레그는 빈 결과로 병합)
             # 🚨 알레르기/비선호 필터링이 있어도 모든 검색 방식 사용 (결과 확보 우선)
             has_filters = (allergies and len(allergies) > 0) or (dislikes and len(dislikes) > 0) or user_id
             if has_filters:
                 print("    ⚠️ 알레르기/비선호 필터링 적용 - 모든 검색 방식 사용 (결과 확보 우선)")
             
-            # 모든 검색 방식 실행 (필터링 여부와 관계없이)
-            # 2. 정확한 ILIKE 매칭 (가중치 35%)
-            print("    🔎 ILIKE 정확 매칭 검색...")
-            ilike_exact = await self._exact_ilike_search(query, k)
-            for result in ilike_exact:
-                result['final_score'] = result['search_score'] * 0.35
-                result['search_type'] = 'exact_ilike'
-            all_results.extend(ilike_exact)
-            # print(f"    ✅ ILIKE 정확 매칭 완료: {len(ilike_exact)}개")  # 임시 비활성화
-            
-            # 3. Full-Text Search (가중치 30%)
-            print("    📝 Full-Text Search 실행...")
-            fts_results = await self._full_text_search(query, k)
-            for result in fts_results:
-                result['final_score'] = result['search_score'] * 0.3
-                result['search_type'] = 'fts'
-            all_results.extend(fts_results)
-            # print(f"    ✅ FTS 검색 완료: {len(fts_results)}개")  # 임시 비활성화
-            
-            # 4. Trigram 유사도 검색 (가중치 20%)
-            print("    🔤 Trigram 검색 실행...")
-            trigram_results = await self._trigram_similarity_search(query, k)
-            for result in trigram_results:
-                result['final_score'] = result['search_score'] * 0.2
-                result['search_type'] = 'trigram'
-            all_results.extend(trigram_results)
-            # print(f"    ✅ Trigram 검색 완료: {len(trigram_results)}개")  # 임시 비활성화
-            
-            # 검색 전략 결정 (결과 종류에 따라)
-            if vector_results and len(vector_results) >= 2:
-                search_strategy = "vector_strong"
-                search_message = "AI 임베딩 검색으로 관련성 높은 결과를 찾았습니다."
-            elif ilike_exact and len(ilike_exact) >= 2:
-                search_strategy = "exact"
-                search_message = "정확한 검색 결과를 찾았습니다."
-            elif fts_results and len(fts_results) >= 2:
-                search_strategy = "fts_strong"
-                search_message = "전문 검색으로 관련 내용을 찾았습니다."
-            elif any([vector_results, ilike_exact, fts_results, trigram_results]):
-                search_strategy = "partial"
-                search_message = "관련 키워드로 검색한 결과입니다."
+            print("  🚀 모든 검색 방식 병렬 실행...")
+            leg_results = await asyncio.gather(
+                # 1. 벡터 검색 (임베딩 생성 포함, 가중치 40% - 가장 높음)
+                self._run_leg("벡터 검색", self._embed_and_vector_search(query, k, user_id, meal_type, allergies, dislikes), timeout),
+                # 2. 정확한 ILIKE 매칭 (가중치 35%)
+                self._run_leg("ILIKE 정확 매칭", self._exact_ilike_search(query, k), timeout),
+                # 3. Full-Text Search (가중치 30%)
+                self._run_leg("Full-Text Search", self._full_text_search(query, k), timeout),
+                # 4. Trigram 유사도 검색 (가중치 20%)
+                self._run_leg("Trigram 검색", self._trigram_similarity_search(query, k), timeout),
+            )
+            # 실패한 레그가 있으면 부분 결과 → 짧은 TTL로만 캐싱
+            degraded = any(r is None for r in leg_results)
+            vector_results, ilike_exact, fts_results, trigram_results = (r or [] for r in leg_results)
+            print(f"    ✅ 병렬 검색 완료: 벡터 {len(vector_results)} / ILIKE {len(ilike_exact)} / FTS {len(fts_results)} / Trigram {len(trigram_results)}")
+            
+            # 레그별 가중 점수 융합 (ID별 최고 가중 점수 유지) + 후보 풀 상위 N개
+            all_results = fuse_leg_scores(
+                {'vector': vector_results, 'exact_ilike': ilike_exact, 'fts': fts_results, 'trigram': trigram_results},
+                self.LEG_WEIGHTS, self.CANDIDATE_POOL_SIZE,
+            )
+            leg_counts = {'vector': len(vector_results), 'exact_ilike': len(ilike_exact),
+                          'fts': len(fts_results), 'trigram': len(trigram_results)}
+        
+        # 검색 전략 결정 (결과 종류에 따라)
+        if leg_counts['vector'] >= 2:
+            search_strategy = "vector_strong"
+            search_message = "AI 임베딩 검색으로 관련성 높은 결과를 찾았습니다."
+        elif leg_counts['exact_ilike'] >= 2:
+            search_strategy = "exact"
+            search_message = "정확한 검색 결과를 찾았습니다."
+        elif leg_counts['fts'] >= 2:
+            search_strategy = "fts_strong"
+            search_message = "전문 검색으로 관련 내용을 찾았습니다."
+        elif any(leg_counts.values()):
+            search_strategy = "partial"
+            search_message = "관련 키워드로 검색한 결과입니다."
+        
+        # 중복 제거(ID별 최고 점수) 후 후보 풀 크기만큼 상위 선택
+        unique_results = fuse_top_k(all_results, self.CANDIDATE_POOL_SIZE, 'final_score')
+        retrieval = {
+            "candidates": unique_results,
+            "search_strategy": search_strategy,
+            "search_message": search_message,
+        }
+        
+        # 결과가 있을 때만 캐시 (빈 결과는 일시 장애일 수 있음), 부분 결과는 1분만 유지
+        if unique_results:
+            await redis_cache.aset(cache_key, retrieval, ttl=60 if degraded else 3600)
+            print(f"    📊 검색 후보 풀 캐시 저장: {query[:30]}... ({len(retrieval['candidates'])}개)")
+        return retrieval
+    
+    async def _embed_and_vector_search(self, query: str, k: int, user_id: Optional[str] = None, meal_type: Optional[str] = None,
+                                       allergies: Optional[List[str]] = None, dislikes: Optional[List[str]] = None) -> List[Dict]:
+        """벡터 검색 레그: 쿼리 임베딩(캐시 우선) → vector_search RPC"""
+        print("    📊 벡터 검색 실행...")
+        query_embedding = await self._get_query_embedding(query)
+        if not query_embedding:
+            print("    ⚠️ 임베딩 생성 실패, 벡터 검색 건너뜀")
+            return []
+        return await self._vector_search(query, query_embedding, k, user_id, meal_type, allergies, dislikes)
+    
+    async def _get_query_embedding(self, query: str) -> Optional[List[float]]:
+        """쿼리 임베딩 조회 (캐시/배치는 임베딩 서비스가 처리)"""
+        return await self._create_embedding(query)
+    
+    def _merge_local_vector_rows(self, fused_rows: List[Dict], local_rows: List[Dict]) -> List[Dict]:
+        """로컬 인덱스 벡터 결과를 fused_recipe_search(텍스트 레그) 결과에 weighted-max 방식으로 병합"""
+        weight = self.LEG_WEIGHTS['vector']
+        merged = {str(row.get('id')): dict(row) for row in fused_rows}
+        for row in local_rows:
+            row_id = str(row.get('id'))
+            score = row.get('similarity_score', 0.0)
+            existing = merged.get(row_id)
+            if existing is None:
+                merged[row_id] = {k: v for k, v in row.items() if k != 'similarity_score'}
+                merged[row_id].update(vector_score=score, final_score=score * weight, search_type='vector')
+                continue
+            existing['vector_score'] = score
+            if score * weight > (existing.get('final_score') or 0.0):
+                existing['final_score'] = score * weight
+                existing['search_type'] = 'vector'
+        return list(merged.values())
+    
+    async def _fused_search(self, query: str, user_id: Optional[str] = None, meal_type: Optional[str] = None,
+                            allergies: Optional[List[str]] = None, dislikes: Optional[List[str]] = None) -> List[Dict]:
+        """통합 검색: fused_recipe_search RPC 1회 호출로 벡터/ILIKE/FTS/Trigram 검색 + 점수 융합
+        
+        실패 시 예외를 그대로 올려 호출자가 4개 레그 병렬 검색으로 폴백하게 한다.
+        (migrations/fused_recipe_search.sql 참고)
+        """
+        # 임베딩 생성과 프로필 조회는 서로 독립 → 동시 실행
+        query_embedding, (user_allergies, user_dislikes) = await asyncio.gather(
+            self._get_query_embedding(query),
+            self._resolve_preferences(user_id, allergies, dislikes),
+        )
+        expanded_allergens, expanded_dislikes = self._expand_exclusions(user_allergies, user_dislikes)
+        exclusion_mask = ingredient_vocabulary.exclusion_mask([*user_allergies, *user_dislikes])
+        
+        # 로컬 벡터 인덱스가 준비되어 있으면 벡터 레그는 로컬에서, RPC 는 텍스트 레그만
+        use_local_index = getattr(settings, "recipe_ann_enabled", False) and recipe_vector_index.ready
+        rpc_params = {
+            'query_text': query,
+            'query_embedding': None if use_local_index else (query_embedding or None),
+            'match_count': self.CANDIDATE_POOL_SIZE * 3,  # 파이썬 재료 필터링 후에도 후보 풀을 채우도록 여유 확보
+            'leg_count': 1000,
+            'meal_type_filter': meal_type if meal_type else None,
+            # 제목 부분문자열 제외는 DB에서 먼저 처리 (재료 토큰 체크는 아래 파이썬 필터)
+            'exclude_title_terms': sorted(set(expanded_allergens) | set(expanded_dislikes)) or None,
+            'vector_weight': self.LEG_WEIGHTS['vector'],
+            'ilike_weight': self.LEG_WEIGHTS['exact_ilike'],
+            'fts_weight': self.LEG_WEIGHTS['fts'],
+            'trgm_weight': self.LEG_WEIGHTS['trigram'],
+            'fusion': getattr(settings, "fused_search_mode", "weighted"),
+        }
+        if getattr(settings, "ingredient_mask_rpc_enabled", False) and exclusion_mask.mask:
+            # 재료 비트셋 제외 (recipe_ingredient_mask.sql 적용 후) → 제외 행은 DB 밖으로 나오지 않음
+            rpc_params['exclude_mask'] = exclusion_mask.mask
+            rpc_params['mask_vocab'] = exclusion_mask.version
+        try:
+            results = await self._execute(self.supabase.rpc('fused_recipe_search', rpc_params))
+        except Exception as e:
+            error_text = str(e)
+            if 'fused_recipe_search' in error_text and ('PGRST202' in error_text or 'does not exist' in error_text):
+                # 함수 미배포 → 매 요청마다 실패 왕복하지 않도록 이 프로세스에서는 비활성화
+                self._fused_unavailable = True
+                print("    ⚠️ fused_recipe_search 함수 없음 - 병렬 레그 검색으로 전환")
+            raise
+        
+        rows = results.data or []
+        if use_local_index and query_embedding:
+            rows = self._merge_local_vector_rows(rows, recipe_vector_index.search(
+                query_embedding, rpc_params['match_count'], meal_type=meal_type, exclude_allergens=expanded_allergens,
+                exclude_mask=exclusion_mask.mask,
+            ))
+        
+        formatted_results = []
+        filtered_count = 0
+        allergen_matcher, dislike_matcher = get_matcher(expanded_allergens), get_matcher(expanded_dislikes)
+        for result in rows:
+            if self._is_excluded_row(result, allergen_matcher, dislike_matcher, exclusion_mask):
+                filtered_count += 1
+                continue
+            formatted_results.append({
+                'id': str(result.get('id', '')),
+                'title': result.get('title', '제목 없음'),
+                'content': result.get('content', ''),
+                'allergens': result.get('allergens', []),
+                'ingredients': result.get('ingredients', []),
+                'search_score': result.get('final_score', 0.0),
+                'final_score': result.get('final_score', 0.0),
+                'search_type': result.get('search_type', 'hybrid'),
+                'url': result.get('url'),
+                'metadata': {k: v for k, v in result.items() if k not in ['id', 'title', 'content', 'allergens', 'ingredients', 'url', 'final_score', 'search_type']}
+            })
+        
+        if filtered_count > 0:
+            print(f"    🔍 Python 필터링: {filtered_count}개 제외됨")
+        return formatted_results
+    
+    def _apply_diversity(self, query: str, candidates: List[Dict], k: int, rng: Optional[random.Random]) -> List[Dict]:
+        """다양성 단계: 캐시된 후보 풀에서 최종 결과 선택 (rng=None 이면 결정적)
+        
+        캐시 객체를 건드리지 않도록 선택된 항목은 얕은 복사본으로 반환한다.
+        """
+        # 🎯 아침 식사에만 특별 로직 적용: 계란 포함/제외 분리 후 랜덤 선택
+        # 아침 키워드 체크
+        breakfast_keywords = ['아침', '브렉퍼스트', '모닝', 'breakfast', 'morning']
+        is_breakfast_query = any(keyword in query.lower() for keyword in breakfast_keywords)
+        
+        if is_breakfast_query:
+            print(f"    🌅 아침 식사 감지 - 특별 다양성 로직 적용")
             
-            # 결과 통합 및 정렬
-            if not all_results:
-                print("    ❌ 검색 결과가 없습니다.")
-                return []
+            egg_recipes = []
+            non_egg_recipes = []
             
-            # 중복 제거 (ID 기준)
-            seen_ids = set()
-            unique_results = []
-            for result in all_results:
-                result_id = result.get('id')
-                if result_id and result_id not in seen_ids:
-                    seen_ids.add(result_id)
-                    unique_results.append(result)
-                elif result_id in seen_ids:
-                    # 중복된 경우 더 높은 점수로 업데이트
-                    for i, existing in enumerate(unique_results):
-                        if existing.get('id') == result_id and result['final_score'] > existing['final_score']:
-                            unique_results[i] = result
-                            break
-            
-            # 최종 점수로 정렬 + 다양성을 위한 랜덤 요소 추가
-            unique_results.sort(key=lambda x: x['final_score'], reverse=True)
-            
-            # 🎯 아침 식사에만 특별 로직 적용: 계란 포함/제외 분리 후 랜덤 선택
-            # 아침 키워드 체크
-            breakfast_keywords = ['아침', '브렉퍼스트', '모닝', 'breakfast', 'morning']
-            is_breakfast_query = any(keyword in query.lower() for keyword in breakfast_keywords)
-            
-            if is_breakfast_query:
-                print(f"    🌅 아침 식사 감지 - 특별 다양성 로직 적용")
-                
-                egg_recipes = []
-                non_egg_recipes = []
-                
-                # 계란 관련 키워드 (동의어 포함)
-                egg_keywords = ['계란', 'egg', '달걀', '계란프라이', '스크램블', '오믈렛', '에그']
-                
-                for result in unique_results:
-                    title = result.get('title', '').lower()
-                    content = result.get('content', '').lower()
-                    
-                    # 계란 포함 여부 체크
-                    is_egg = any(keyword in title or keyword in content for keyword in egg_keywords)
-                    
-                    if is_egg:
-                        egg_recipes.append(result)
-                    else:
-                        non_egg_recipes.append(result)
-                
-                print(f"    🔍 계란 포함 레시피: {len(egg_recipes)}개")
-                print(f"    🔍 계란 제외 레시피: {len(non_egg_recipes)}개")
-                
-                # 다양성 확보: 계란 1개 + 비계란 2개 (총 3개)
-                import random
-                selected_results = []
-                
-                # 계란 레시피 1개 선택 (있으면)
-                if egg_recipes:
-                    selected_egg = random.choice(egg_recipes)
-                    selected_results.append(selected_egg)
-                    print(f"    ✅ 계란 레시피 선택: {selected_egg.get('title')}")
-                
-                # 비계란 레시피 2개 선택 (부족하면 가능한 만큼)
-                non_egg_count = min(2, len(non_egg_recipes))
-                if non_egg_count > 0:
-                    selected_non_egg = random.sample(non_egg_recipes, non_egg_count)
-                    selected_results.extend(selected_non_egg)
-                    print(f"    ✅ 비계란 레시피 선택: {[r.get('title') for r in selected_non_egg]}")
+            # 계란 관련 키워드 (동의어 포함)
+            egg_keywords = ['계란', 'egg', '달걀', '계란프라이', '스크램블', '오믈렛', '에그']
+            
+            for result in candidates:
+                title = result.get('title', '').lower()
+                content = result.get('content', '').lower()
                 
-                # 결과가 부족하면 나머지 추가
-                if len(selected_results) < 3 and len(unique_results) > len(selected_results):
-                    remaining = [r for r in unique_results if r not in selected_results]
-                    needed = 3 - len(selected_results)
-                    selected_results.extend(remaining[:needed])
-                    print(f"    ✅ 추가 레시피 선택: {[r.get('title') for r in remaining[:needed]]}")
+                # 계란 포함 여부 체크
+                is_egg = any(keyword in title or keyword in content for keyword in egg_keywords)
                 
-                print(f"    ✅ 최종 선택된 레시피: {len(selected_results)}개")
+                if is_egg:
+                    egg_recipes.append(result)
+                else:
+                    non_egg_recipes.append(result)
+            
+            print(f"    🔍 계란 포함 레시피: {len(egg_recipes)}개")
+            print(f"    🔍 계란 제외 레시피: {len(non_egg_recipes)}개")
+            
+            # 다양성 확보: 계란 1개 + 비계란 2개 (총 3개)
+            selected_results = []
+            
+            # 계란 레시피 1개 선택 (있으면)
+            if egg_recipes:
+                selected_egg = rng.choice(egg_recipes) if rng else egg_recipes[0]
+                selected_results.append(selected_egg)
+                print(f"    ✅ 계란 레시피 선택: {selected_egg.get('title')}")
+            
+            # 비계란 레시피 2개 선택 (부족하면 가능한 만큼)
+            non_egg_count = min(2, len(non_egg_recipes))
+            if non_egg_count > 0:
+                selected_non_egg = rng.sample(non_egg_recipes, non_egg_count) if rng else non_egg_recipes[:non_egg_count]
+                selected_results.extend(selected_non_egg)
+                print(f"    ✅ 비계란 레시피 선택: {[r.get('title') for r in selected_non_egg]}")
+            
+            # 결과가 부족하면 나머지 추가
+            if len(selected_results) < 3 and len(candidates) > len(selected_results):
+                remaining = [r for r in candidates if r not in selected_results]
+                needed = 3 - len(selected_results)
+                selected_results.extend(remaining[:needed])
+                print(f"    ✅ 추가 레시피 선택: {[r.get('title') for r in remaining[:needed]]}")
+            
+            print(f"    ✅ 최종 선택된 레시피: {len(selected_results)}개")
+            
+            filtered_results = selected_results
+        else:
+            print(f"    🍽️ 일반 식사 - 기존 다양성 로직 적용")
+            
+            # 기존 다양성 필터링 로직 (아침이 아닌 경우)
+            filtered_results = []
+            seen_ingredients = set()
+            seen_categories = set()
+            seen_proteins = set()
+            
+            for result in candidates:
+                title = result.get('title', '').lower()
+                content = result.get('content', '').lower()
                 
-                filtered_results = selected_results
-            else:
-                print(f"    🍽️ 일반 식사 - 기존 다양성 로직 적용")
+                # 배추류 중복 체크
+                cabbage_keywords = ['양배추', '알배추', '배추', 'cabbage']
+                is_cabbage = any(keyword in title or keyword in content for keyword in cabbage_keywords)
+                if is_cabbage and '배추류' in seen_ingredients:
+                    print(f"    ⚠️ 배추류 중복 제외: {result.get('title')}")
+                    continue
+                if is_cabbage:
+                    seen_ingredients.add('배추류')
                 
-                # 기존 다양성 필터링 로직 (아침이 아닌 경우)
-                filtered_results = []
-                seen_ingredients = set()
-                seen_categories = set()
-                seen_proteins = set()
+                # 계란 중복 체크 (일반적인 경우)
+                egg_keywords = ['계란', 'egg', '달걀', '계란프라이', '스크램블', '오믈렛', '에그']
+                is_egg = any(keyword in title or keyword in content for keyword in egg_keywords)
+                if is_egg and '계란' in seen_ingredients:
+                    print(f"    ⚠️ 계란 중복 제외: {result.get('title')}")
+                    continue
+                if is_egg:
+                    seen_ingredients.add('계란')
                 
-                for result in unique_results:
-                    title = result.get('title', '').lower()
-                    content = result.get('content', '').lower()
-                    
-                    # 배추류 중복 체크
-                    cabbage_keywords = ['양배추', '알배추', '배추', 'cabbage']
-                    is_cabbage = any(keyword in title or keyword in content for keyword in cabbage_keywords)
-                    if is_cabbage and '배추류' in seen_ingredients:
-                        print(f"    ⚠️ 배추류 중복 제외: {result.get('title')}")
+                # 김밥 중복 체크
+                if '김밥' in title or 'gimbap' in title:
+                    if '김밥' in seen_categories:
+                        print(f"    ⚠️ 김밥 중복 제외: {result.get('title')}")
                         continue
-                    if is_cabbage:
-                        seen_ingredients.add('배추류')
-                    
-                    # 계란 중복 체크 (일반적인 경우)
-                    egg_keywords = ['계란', 'egg', '달걀', '계란프라이', '스크램블', '오믈렛', '에그']
-                    is_egg = any(keyword in title or keyword in content for keyword in egg_keywords)
-                    if is_egg and '계란' in seen_ingredients:
-                        print(f"    ⚠️ 계란 중복 제외: {result.get('title')}")
-                        continue
-                    if is_egg:
-                        seen_ingredients.add('계란')
-                    
-                    # 김밥 중복 체크
-                    if '김밥' in title or 'gimbap' in title:
-                        if '김밥' in seen_categories:
-                            print(f"    ⚠️ 김밥 중복 제외: {result.get('title')}")
+                    seen_categories.add('김밥')
+                
+                # 단백질원 중복 체크
+                protein_keywords = ['닭고기', '소고기', '돼지고기', '연어', '새우', '참치', '베이컨', '치즈']
+                for protein in protein_keywords:
+                    if protein in title or protein in content:
+                        if protein in seen_proteins:
+                            print(f"    ⚠️ 단백질원 중복 제외: {result.get('title')} (단백질원: {protein})")
                             continue
-                        seen_categories.add('김밥')
-                    
-                    # 단백질원 중복 체크
-                    protein_keywords = ['닭고기', '소고기', '돼지고기', '연어', '새우', '참치', '베이컨', '치즈']
-                    for protein in protein_keywords:
-                        if protein in title or protein in content:
-                            if protein in seen_proteins:
-                                print(f"    ⚠️ 단백질원 중복 제외: {result.get('title')} (단백질원: {protein})")
-                                continue
-                            seen_proteins.add(protein)
-                            break
-                    
-                    filtered_results.append(result)
-                    
-                    # 다양성 확보를 위해 최대 3개로 제한
-                    if len(filtered_results) >= 3:
-                        print(f"    ✅ 다양성 확보: {len(filtered_results)}개 결과로 제한")
+                        seen_proteins.add(protein)
                         break
+                
+                filtered_results.append(result)
+                
+                # 다양성 확보를 위해 최대 3개로 제한
+                if len(filtered_results) >= 3:
+                    print(f"    ✅ 다양성 확보: {len(filtered_results)}개 결과로 제한")
+                    break
+        
+        # 다양성 확보: 상위 결과에서 랜덤하게 선택
+        if rng and len(filtered_results) > k:
+            # 상위 70%에서 랜덤 선택
+            top_count = max(k, int(len(filtered_results) * 0.7))
+            top_results = filtered_results[:top_count]
+            final_results = rng.sample(top_results, k)
+            print(f"  🎲 다양성 확보: 상위 {top_count}개에서 {k}개 랜덤 선택")
+        else:
+            final_results = filtered_results[:k]
+        
+        return [dict(result) for result in final_results]
+    
+    async def _fill_missing_urls(self, results: List[Dict]) -> None:
+        """URL 보완: RPC 함수가 url을 반환하지 않는 경우 직접 조회 (결과별 동시 조회)"""
+        async def _fill(result: Dict) -> None:
+            recipe_id = result.get('id')
+            try:
+                recipe_info = await self._execute(self.supabase.table('recipe_blob_emb').select('url').eq('id', recipe_id))
+                if recipe_info.data and len(recipe_info.data) > 0:
+                    result['url'] = recipe_info.data[0].get('url')
+                    if result.get('url'):
+                        print(f"  📎 {result.get('title')} URL 보완: {result['url']}")
+            except Exception as e:
+                print(f"  ⚠️ URL 조회 실패 ({recipe_id}): {e}")
+        
+        missing = [result for result in results if not result.get('url') and result.get('id')]
+        if missing:
+            await asyncio.gather(*(_fill(result) for result in missing))
+    
+    async def korean_hybrid_search(self, query: str, k: int = 5, user_id: Optional[str] = None, meal_type: Optional[str] = None, 
+                                   allergies: Optional[List[str]] = None, dislikes: Optional[List[str]] = None,
+                                   diversify: bool = True, seed: Optional[int] = None) -> List[Dict]:
+        """한글 최적화 하이브리드 검색 (검색 단계 캐싱 + 캐시 이후 다양성 적용)
+        
+        검색 단계(벡터/ILIKE/FTS/Trigram 병합)는 안정 키로 캐싱되고,
+        랜덤 다양성 선택은 캐시된 후보 풀 위에서 매 호출마다 수행된다.
+        
+        Args:
+            diversify: False 이면 랜덤 없이 점수순으로 선택 (결정적 모드)
+            seed: 다양성 랜덤 시드 (재현이 필요할 때)
+        """
+        try:
+            print(f"🔍 한글 최적화 하이브리드 검색 시작: '{query}'")
             
-            # 다양성 확보: 상위 결과에서 랜덤하게 선택
-            if len(filtered_results) > k:
-                # 상위 70%에서 랜덤 선택
-                top_count = max(k, int(len(filtered_results) * 0.7))
-                top_results = filtered_results[:top_count]
-                final_results = random.sample(top_results, k)
-                print(f"  🎲 다양성 확보: 상위 {top_count}개에서 {k}개 랜덤 선택")
-            else:
-                final_results = filtered_results[:k]
+            retrieval = await self._retrieve_candidates(query, k, user_id, meal_type, allergies, dislikes)
+            candidates = retrieval.get("candidates", [])
+            search_strategy = retrieval.get("search_strategy", "hybrid")
+            search_message = retrieval.get("search_message", "종합 검색 결과입니다.")
             
-            # URL 보완: RPC 함수가 url을 반환하지 않는 경우 직접 조회
-            for result in final_results:
-                recipe_id = result.get('id')
-                if not result.get('url') and recipe_id:
-                    try:
-                        recipe_info = self.supabase.table('recipe_blob_emb').select('url').eq('id', recipe_id).execute()
-                        if recipe_info.data and len(recipe_info.data) > 0:
-                            result['url'] = recipe_info.data[0].get('url')
-                            if result.get('url'):
-                                print(f"  📎 {result.get('title')} URL 보완: {result['url']}")
-                    except Exception as e:
-                        print(f"  ⚠️ URL 조회 실패 ({recipe_id}): {e}")
+            # 결과 통합 및 정렬
+            if not candidates:
+                print("    ❌ 검색 결과가 없습니다.")
+                return []
+            
+            rng = random.Random(seed) if diversify else None
+            final_results = self._apply_diversity(query, candidates, k, rng)
+            
+            await self._fill_missing_urls(final_results)
             
             # 검색 전략과 메시지 추가
             for result in final_results:
@@ -949,21 +966,46 @@ class KoreanSearchTool:
             for i, result in enumerate(final_results[:3], 1):
                 print(f"    {i}. {result['title']} (점수: {result['final_score']:.3f}, 타입: {result['search_type']})")
             
-            # 검색 결과 캐시 저장 (Redis 우선, 메모리 폴백)
-            # Redis에 저장 (TTL: 1시간)
-            redis_cache.set(cache_key, final_results, ttl=3600)
-            
-            # 메모리 캐시에도 저장 (폴백용)
-            self._search_results_cache[cache_key] = final_results
-            self._manage_cache_size(self._search_results_cache)
-            print(f"    📊 검색 결과 캐시 저장 (Redis + 메모리): {query[:30]}...")
-            
             return final_results
             
         except Exception as e:
             print(f"❌ 한글 하이브리드 검색 오류: {e}")
             return []
     
+    # 배치 검색 시 동시에 실행할 쿼리 수 (Supabase 스레드 풀 보호)
+    BATCH_CONCURRENCY = 8
+
+    async def batch_hybrid_search(self, queries: Sequence[str], ks: Sequence[int], user_id: Optional[str] = None,
+                                  meal_types: Optional[Sequence[Optional[str]]] = None,
+                                  allergies: Optional[List[str]] = None, dislikes: Optional[List[str]] = None) -> List[List[Dict]]:
+        """여러 쿼리를 한 번에 검색 (식단표 슬롯 검색용, 쿼리 순서대로 결과 반환)
+
+        1. 알레르기/비선호는 한 번만 결정해 모든 쿼리에 전달 (쿼리마다 프로필 재조회 없음)
+        2. 모든 쿼리 임베딩을 한 번의 배치 호출로 생성 (이후 벡터 레그는 캐시 히트)
+        3. 쿼리별 검색(통합 RPC 또는 병렬 레그)을 동시에 실행
+        """
+        if not queries:
+            return []
+        meal_types = meal_types or [None] * len(queries)
+        user_allergies, user_dislikes = await self._resolve_preferences(user_id, allergies, dislikes)
+
+        try:
+            await self.embedding_service.embed_many(list(queries))
+        except Exception as e:
+            # 임베딩 실패 시 각 쿼리의 벡터 레그가 개별로 처리 (텍스트 레그는 그대로 진행)
+            print(f"    ⚠️ 배치 임베딩 실패 - 쿼리별 처리로 진행: {e}")
+
+        semaphore = asyncio.Semaphore(self.BATCH_CONCURRENCY)
+
+        async def _search_one(query: str, k: int, meal_type: Optional[str]) -> List[Dict]:
+            async with semaphore:
+                return await self.korean_hybrid_search(query, k, user_id, meal_type, user_allergies, user_dislikes)
+
+        print(f"🔍 배치 검색 시작: 쿼리 {len(queries)}개")
+        return list(await asyncio.gather(*(
+            _search_one(query, k, meal_type) for query, k, meal_type in zip(queries, ks, meal_types)
+        )))
+
     async def search(self, query: str, profile: str = "", max_results: int = 5) -> List[Dict]:
         """간단한 검색 인터페이스 (한글 최적화 + 스마트 개선)"""
         try:
@@ -1094,13 +1136,7 @@ class KoreanSearchTool:
                 all_partial_results.extend(ilike_results)
                 
                 # 중복 제거
-                seen_ids = set()
-                unique_results = []
-                for result in all_partial_results:
-                    result_id = result.get('id')
-                    if result_id and result_id not in seen_ids:
-                        seen_ids.add(result_id)
-                        unique_results.append(result)
+                unique_results = dedupe_best(all_partial_results)
                 
                 return {
                     'results': unique_results[:k],
@@ -0,0 +1,220 @@
+"""
+식단 후보 풀
+(사용자 선호 해시, 식사 슬롯) → 점수순·알레르기/비선호 필터링된 레시피 후보 리스트
+
+- 풀은 선호(알레르기/비선호) 기준이라 같은 선호의 사용자끼리 공유된다
+- 저장은 redis_cache (L1 메모리 + Redis) → 재방문 사용자는 검색 없이 메모리에서 식단 샘플링
+- 선호가 바뀌면 해시가 달라져 새 풀을 만들고,
+  레시피 테이블이 바뀌면(updated_at 최대값) 백그라운드 작업이 최근 사용된 풀을 다시 만든다
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.cache_keys import digest, make_key, normalize_terms
+from app.core.database import supabase
+from app.core.redis_cache import redis_cache
+from app.tools.shared.hybrid_search import hybrid_search_tool
+
+logger = logging.getLogger(__name__)
+
+# 계란 아침 후보 (식단 중 하루 아침에 배치)
+EGG_SLOT = 'egg_breakfast'
+EGG_QUERY = "계란 달걀 스크램블 오믈렛 키토 아침"
+EGG_KEYWORDS = ['계란', '달걀', '스크램블', '오믈렛']
+
+
+def _exclude_egg_keywords(query: str) -> str:
+    """아침 검색어에서 계란 키워드 제외 후 다른 단백질 키워드 추가"""
+    for keyword in EGG_KEYWORDS:
+        query = query.replace(keyword, '')
+    return query + ' 닭가슴살 두부 베이컨 연어'
+
+
+def build_slot_queries(slot: str, strategy: Dict[str, Any], days: int) -> List[Tuple[str, int]]:
+    """슬롯별 검색 쿼리 목록 (우선순위 순: 기본 → 다양성 그룹 → 조리법)"""
+    queries = [(f"{' '.join(strategy['primary_keywords'])} 키토", days * 4)]  # 기본 키워드 검색
+    for variety_group in strategy.get('variety_keywords', []):
+        queries.append((f"{' '.join(variety_group)} 키토", 2))  # 각 그룹당 2개씩
+    if 'cooking_methods' in strategy:
+        queries.append((f"{' '.join(strategy['cooking_methods'][:2])} 키토 {slot}", 4))
+
+    # 아침은 계란 키워드 완전 제외 (계란 아침은 EGG_SLOT 후보에서 따로 배치)
+    if slot == 'breakfast':
+        queries = [(_exclude_egg_keywords(query), max_results) for query, max_results in queries]
+    return queries
+
+
+async def search_meal_candidates(strategies: Dict[str, Dict[str, Any]], days: int, user_id: Optional[str] = None,
+                                 allergies: Optional[List[str]] = None, dislikes: Optional[List[str]] = None) -> Dict[str, List[Dict]]:
+    """모든 슬롯(+ 계란 아침) 후보를 배치 검색 1회로 수집
+
+    슬롯 간 중복은 슬롯 순서대로 제거되고, 슬롯 후보가 days * 3 개에 도달하면 남은 쿼리 결과는 사용하지 않는다.
+    """
+    slot_queries = {slot: build_slot_queries(slot, strategy, days) for slot, strategy in strategies.items()}
+    # 계란 후보는 마지막: 일반 슬롯 후보를 먼저 확보
+    slot_queries[EGG_SLOT] = [(EGG_QUERY, 10)]
+    return await hybrid_search_tool.batch_search(
+        slot_queries,
+        user_id=user_id,
+        allergies=allergies,
+        dislikes=dislikes,
+        slot_targets={slot: days * 3 for slot in strategies},
+    )
+
+
+class MealCandidatePool:
+    """선호 해시별 식단 후보 풀 저장소 + 백그라운드 갱신
+
+    - pool_days: 풀을 만들 때 기준 일수 (요청 일수가 더 짧아도 이 기준으로 만들어 재사용)
+    - ttl: 캐시 보존 시간(초), max_tracked: 백그라운드 갱신 대상으로 추적할 최근 풀 수
+    """
+
+    def __init__(self, pool_days: int = 7, ttl: int = 86400, max_tracked: int = 256):
+        self.pool_days = pool_days
+        self.ttl = ttl
+        self.max_tracked = max_tracked
+
+        # 선호 해시 → 재생성에 필요한 정보 (최근 사용 순)
+        self._tracked: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._building: Dict[str, asyncio.Task] = {}
+        self._recipe_version: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.builds = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    @staticmethod
+    def preference_hash(allergies: Optional[List[str]], dislikes: Optional[List[str]]) -> str:
+        return digest(normalize_terms(allergies), normalize_terms(dislikes), length=16)
+
+    def _key(self, pref_hash: str) -> str:
+        return make_key("meal_candidates", pref_hash, pool_days=self.pool_days)
+
+    # ---------- 조회/생성 ----------
+
+    async def get(self, allergies: Optional[List[str]], dislikes: Optional[List[str]]) -> Optional[Dict[str, List[Dict]]]:
+        """풀 조회 (없으면 None, 오래된 풀도 반환하고 갱신은 백그라운드에서)"""
+        pref_hash = self.preference_hash(allergies, dislikes)
+        entry = await redis_cache.aget(self._key(pref_hash))
+        if not entry or not isinstance(entry, dict) or not entry.get('pools'):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._track(pref_hash, entry)
+        return entry['pools']
+
+    async def build(self, strategies: Dict[str, Dict[str, Any]], allergies: Optional[List[str]],
+                    dislikes: Optional[List[str]]) -> Dict[str, List[Dict]]:
+        """풀 생성 후 저장 (같은 선호의 동시 요청은 한 번만 검색)"""
+        pref_hash = self.preference_hash(allergies, dislikes)
+        task = self._building.get(pref_hash)
+        if task is None:
+            task = asyncio.create_task(self._build(pref_hash, strategies, allergies, dislikes))
+            self._building[pref_hash] = task
+            task.add_done_callback(lambda _: self._building.pop(pref_hash, None))
+        return await asyncio.shield(task)
+
+    async def _build(self, pref_hash: str, strategies: Dict[str, Dict[str, Any]],
+                     allergies: Optional[List[str]], dislikes: Optional[List[str]]) -> Dict[str, List[Dict]]:
+        started = time.time()
+        # 풀은 선호 기준으로 공유되므로 user_id 없이 검색 (프로필 재조회 없음)
+        pools = await search_meal_candidates(strategies, self.pool_days, allergies=allergies, dislikes=dislikes)
+        entry = {
+            'pools': pools,
+            'strategies': strategies,
+            'allergies': list(allergies or []),
+            'dislikes': list(dislikes or []),
+            'recipe_version': self._recipe_version,
+            'built_at': time.time(),
+        }
+        # 빈 풀은 저장하지 않음 (일시 장애일 수 있음)
+        if any(pools.get(slot) for slot in strategies):
+            await redis_cache.aset(self._key(pref_hash), entry, ttl=self.ttl)
+            self._track(pref_hash, entry)
+        self.builds += 1
+        print(f"🧺 식단 후보 풀 생성: {pref_hash} ({time.time() - started:.2f}s, "
+              + ", ".join(f"{slot} {len(items)}개" for slot, items in pools.items()) + ")")
+        return pools
+
+    def _track(self, pref_hash: str, entry: Dict[str, Any]) -> None:
+        self._tracked[pref_hash] = {
+            'strategies': entry.get('strategies') or {},
+            'allergies': entry.get('allergies') or [],
+            'dislikes': entry.get('dislikes') or [],
+            'recipe_version': entry.get('recipe_version'),
+        }
+        self._tracked.move_to_end(pref_hash)
+        while len(self._tracked) > self.max_tracked:
+            self._tracked.popitem(last=False)
+
+    # ---------- 백그라운드 갱신 ----------
+
+    async def _fetch_recipe_version(self) -> Optional[str]:
+        query = supabase.table('recipe_blob_emb').select('updated_at').order('updated_at', desc=True).limit(1)
+        rows = (await asyncio.to_thread(query.execute)).data or []
+        return str(rows[0].get('updated_at')) if rows else None
+
+    async def refresh(self) -> int:
+        """레시피 테이블이 바뀌었으면 추적 중인 풀 재생성, 재생성한 풀 수 반환"""
+        version = await self._fetch_recipe_version()
+        if self._recipe_version is None:
+            # 첫 확인: 기준 버전만 기록 (이미 만든 풀은 이 버전 기준으로 간주)
+            self._recipe_version = version
+            for tracked in self._tracked.values():
+                tracked['recipe_version'] = tracked['recipe_version'] or version
+            return 0
+        self._recipe_version = version
+
+        stale = [(h, t) for h, t in self._tracked.items() if t['recipe_version'] != version]
+        for pref_hash, tracked in stale:
+            await self._build(pref_hash, tracked['strategies'], tracked['allergies'], tracked['dislikes'])
+        if stale:
+            self.refreshes += 1
+            print(f"🧺 레시피 변경 감지 → 식단 후보 풀 {len(stale)}개 재생성")
+        return len(stale)
+
+    async def run_periodic_refresh(self, interval: float) -> None:
+        """백그라운드 주기 갱신 루프 (lifespan 에서 태스크로 실행)"""
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.refresh_errors += 1
+                logger.warning("식단 후보 풀 갱신 실패: %r", e)
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run_periodic_refresh(interval))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tracked": len(self._tracked),
+            "recipe_version": self._recipe_version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "builds": self.builds,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+        }
+
+
+meal_candidate_pool = MealCandidatePool()
@@ -0,0 +1,254 @@
+"""
+레시피 로컬 벡터 인덱스 (선택 기능)
+recipe_blob_emb 임베딩을 프로세스 메모리에 올려 벡터 검색을 원격 RPC 없이 처리
+
+- NumPy 코사인 유사도 (정규화 행렬 × 쿼리 벡터)
+- 행 수가 ivf_min_rows 이상이면 IVF(k-means 셀 + nprobe 탐색), 미만이면 전수 탐색
+- meal_type / 알레르기 태그 / 재료 비트셋 사전 필터 후 top-k
+- updated_at 기준 증분 동기화 + 주기적 전체 동기화 (삭제 반영)
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.core.database import supabase
+from app.tools.meal.ingredient_bitset import ingredient_vocabulary
+
+logger = logging.getLogger(__name__)
+
+_SELECT_COLUMNS = "id,title,blob,ingredients,allergens,tags,meal_type,url,embedding,updated_at"
+
+
+class _Snapshot:
+    """검색에 쓰는 불변 스냅샷 (동기화 시 통째로 교체 → 읽기 락 불필요)"""
+
+    def __init__(self, rows: List[Dict[str, Any]], matrix: np.ndarray,
+                 centroids: Optional[np.ndarray] = None):
+        self.rows = rows
+        self.matrix = matrix
+        self.id_to_pos = {row["id"]: i for i, row in enumerate(rows)}
+        self.meal_types = np.array([row.get("meal_type") or "" for row in rows], dtype=object)
+        self.allergens = [frozenset(a.lower() for a in (row.get("allergens") or [])) for row in rows]
+        self.masks = np.array([row.get("ingredient_mask") or 0 for row in rows], dtype=np.int64)
+        self.centroids = centroids
+        self.cells: List[np.ndarray] = []
+        if centroids is not None and len(rows):
+            assignment = np.argmax(matrix @ centroids.T, axis=1)
+            self.cells = [np.flatnonzero(assignment == c) for c in range(len(centroids))]
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _parse_embedding(value: Any) -> Optional[List[float]]:
+    # PostgREST 는 pgvector 컬럼을 "[0.1,0.2,...]" 문자열로 반환
+    if isinstance(value, str):
+        value = json.loads(value)
+    return value if value else None
+
+
+def _train_centroids(matrix: np.ndarray, nlist: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """구면 k-means (정규화된 행 기준)"""
+    rng = np.random.default_rng(seed)
+    centroids = matrix[rng.choice(len(matrix), size=nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(matrix @ centroids.T, axis=1)
+        for c in range(nlist):
+            members = matrix[assignment == c]
+            if len(members):
+                centroids[c] = members.sum(axis=0)
+        centroids = _normalize_rows(centroids)
+    return centroids
+
+
+class RecipeVectorIndex:
+    """recipe_blob_emb 인메모리 ANN 인덱스
+
+    - ivf_min_rows: 이 행 수 이상일 때만 IVF 사용 (작은 테이블은 전수 탐색이 더 빠르고 정확)
+    - nprobe: IVF 탐색 셀 수
+    - full_sync_interval: 전체 재동기화 주기(초), 그 사이에는 updated_at 증분만 반영
+    """
+
+    def __init__(self, model_name: str = "text-embedding-3-small", ivf_min_rows: int = 5000,
+                 nprobe: int = 8, full_sync_interval: float = 3600.0, page_size: int = 500):
+        self.model_name = model_name
+        self.ivf_min_rows = ivf_min_rows
+        self.nprobe = nprobe
+        self.full_sync_interval = full_sync_interval
+        self.page_size = page_size
+
+        self._snapshot: Optional[_Snapshot] = None
+        self._last_updated_at: Optional[str] = None
+        self._last_full_sync = 0.0
+        self._sync_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+        self.syncs = 0
+        self.sync_errors = 0
+        self.searches = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._snapshot is not None and len(self._snapshot.rows) > 0
+
+    # ---------- 동기화 ----------
+
+    async def _fetch(self, since: Optional[str]) -> List[Dict[str, Any]]:
+        rows: List[Dict[str, Any]] = []
+        start = 0
+        while True:
+            query = (supabase.table("recipe_blob_emb").select(_SELECT_COLUMNS)
+                     .eq("model_name", self.model_name))
+            if since:
+                query = query.gt("updated_at", since)
+            query = query.order("updated_at").range(start, start + self.page_size - 1)
+            page = (await asyncio.to_thread(query.execute)).data or []
+            rows.extend(page)
+            if len(page) < self.page_size:
+                return rows
+            start += self.page_size
+
+    async def sync(self, full: bool = False) -> int:
+        """Supabase 에서 변경분 반영, 반영된 행 수 반환"""
+        async with self._sync_lock:
+            full = full or self._snapshot is None or time.time() - self._last_full_sync >= self.full_sync_interval
+            fetched = await self._fetch(None if full else self._last_updated_at)
+            if not full and not fetched:
+                return 0
+
+            # NumPy 연산(k-means 등)은 스레드에서
+            snapshot = await asyncio.to_thread(self._build_snapshot, fetched, full)
+            self._snapshot = snapshot
+            if fetched:
+                self._last_updated_at = max(str(r.get("updated_at") or "") for r in fetched) or self._last_updated_at
+            if full:
+                self._last_full_sync = time.time()
+            self.syncs += 1
+            print(f"🧭 레시피 벡터 인덱스 {'전체' if full else '증분'} 동기화: {len(fetched)}건 반영 (총 {len(snapshot.rows)}건)")
+            return len(fetched)
+
+    def _build_snapshot(self, fetched: Iterable[Dict[str, Any]], full: bool) -> _Snapshot:
+        previous = None if full else self._snapshot
+        rows = list(previous.rows) if previous else []
+        vectors = list(previous.matrix) if previous else []
+        id_to_pos = dict(previous.id_to_pos) if previous else {}
+
+        for raw in fetched:
+            embedding = _parse_embedding(raw.get("embedding"))
+            if not embedding:
+                continue
+            row = {k: v for k, v in raw.items() if k not in ("embedding", "blob", "updated_at")}
+            row["id"] = str(raw.get("id", ""))
+            row["content"] = json.dumps(raw.get("blob"), ensure_ascii=False) if isinstance(raw.get("blob"), (dict, list)) else (raw.get("blob") or "")
+            # 재료 비트셋 (DB 컬럼 유무와 무관하게 로컬에서 계산)
+            row["ingredient_mask"] = ingredient_vocabulary.recipe_mask(row.get("title"), row.get("ingredients"))
+            row["ingredient_mask_vocab"] = ingredient_vocabulary.version
+            vector = np.asarray(embedding, dtype=np.float32)
+            if row["id"] in id_to_pos:
+                pos = id_to_pos[row["id"]]
+                rows[pos], vectors[pos] = row, vector
+            else:
+                id_to_pos[row["id"]] = len(rows)
+                rows.append(row)
+                vectors.append(vector)
+
+        matrix = _normalize_rows(np.vstack(vectors)) if vectors else np.zeros((0, 0), dtype=np.float32)
+        centroids = None
+        if len(rows) >= self.ivf_min_rows:
+            # 전체 동기화 때만 셀 재학습, 증분은 기존 셀에 배정
+            if full or previous is None or previous.centroids is None:
+                centroids = _train_centroids(matrix, nlist=int(np.sqrt(len(rows))))
+            else:
+                centroids = previous.centroids
+        return _Snapshot(rows, matrix.astype(np.float32, copy=False), centroids)
+
+    async def run_periodic_sync(self, interval: float) -> None:
+        """백그라운드 주기 동기화 루프 (lifespan 에서 태스크로 실행)"""
+        while True:
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.sync_errors += 1
+                logger.warning("레시피 벡터 인덱스 동기화 실패: %r", e)
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run_periodic_sync(interval))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # ---------- 검색 ----------
+
+    def search(self, query_embedding: List[float], k: int, meal_type: Optional[str] = None,
+               exclude_allergens: Optional[Iterable[str]] = None, exclude_mask: int = 0) -> List[Dict[str, Any]]:
+        """top-k 검색 (vector_search RPC 와 같은 행 형태 + similarity_score)"""
+        snapshot = self._snapshot
+        if snapshot is None or not snapshot.rows or not query_embedding:
+            return []
+        self.searches += 1
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0 or query.shape[0] != snapshot.matrix.shape[1]:
+            return []
+        query = query / norm
+
+        if snapshot.centroids is not None:
+            nprobe = min(self.nprobe, len(snapshot.centroids))
+            probe = np.argpartition(-(snapshot.centroids @ query), nprobe - 1)[:nprobe]
+            candidates = np.concatenate([snapshot.cells[c] for c in probe])
+        else:
+            candidates = np.arange(len(snapshot.rows))
+
+        # 메타데이터 사전 필터
+        if meal_type:
+            candidates = candidates[snapshot.meal_types[candidates] == meal_type]
+        if exclude_mask:
+            candidates = candidates[(snapshot.masks[candidates] & exclude_mask) == 0]
+        excluded = {a.lower() for a in (exclude_allergens or []) if a}
+        if excluded:
+            candidates = np.array([i for i in candidates if not (snapshot.allergens[i] & excluded)], dtype=np.int64)
+        if not len(candidates):
+            return []
+
+        scores = snapshot.matrix[candidates] @ query
+        top_n = min(k, len(candidates))
+        top = np.argpartition(-scores, top_n - 1)[:top_n]
+        top = top[np.argsort(-scores[top])]
+        return [
+            dict(snapshot.rows[candidates[i]], similarity_score=float(scores[i]))
+            for i in top
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "ready": self.ready,
+            "rows": len(snapshot.rows) if snapshot else 0,
+            "ivf_cells": len(snapshot.centroids) if snapshot is not None and snapshot.centroids is not None else 0,
+            "last_updated_at": self._last_updated_at,
+            "syncs": self.syncs,
+            "sync_errors": self.sync_errors,
+            "searches": self.searches,
+        }
+
+
+recipe_vector_index = RecipeVectorIndex()
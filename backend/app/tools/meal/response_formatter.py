@@ -4,7 +4,7 @@ app/tools/meal/response_formatter.py
 Orchestrator의 포맷팅 로직을 이동
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 from datetime import datetime, timedelta
 
 class MealResponseFormatter:
@@ -29,53 +29,71 @@ class MealResponseFormatter:
         Returns:
             str: 포맷된 응답 텍스트
         """
+        return "".join(self.iter_meal_plan_chunks(meal_plan, days))
+    
+    def iter_meal_plan_chunks(self, meal_plan: Dict[str, Any], days: int) -> Iterator[str]:
+        """
+        식단표 텍스트를 스트리밍 단위(헤더 → 일차별 → 안내)로 생성
+        이어 붙이면 format_meal_plan 결과와 같다
+        """
         if not meal_plan or not meal_plan.get("days"):
-            return "죄송합니다. 식단표 생성에 실패했습니다. 다시 시도해주세요."
-        
-        # 일수 텍스트 생성
-        day_text = "1일" if days == 1 else f"{days}일"
+            yield "죄송합니다. 식단표 생성에 실패했습니다. 다시 시도해주세요."
+            return
         
         # 디버그 로그
-        print(f"🔍 DEBUG: response_formatter - days: {days}, day_text: {day_text}, meal_plan.days 길이: {len(meal_plan.get('days', []))}")
+        print(f"🔍 DEBUG: response_formatter - days: {days}, meal_plan.days 길이: {len(meal_plan.get('days', []))}")
         
-        # 응답 시작
-        response_text = f"## ✨ {day_text} 키토 식단표\n\n"
+        yield self.format_meal_plan_header(days)
         
         # 요청된 일수만큼만 출력
-        meal_days = meal_plan.get("days", [])[:days]
+        for day_idx, day_meals in enumerate(meal_plan.get("days", [])[:days], 1):
+            yield self.format_meal_plan_day(day_idx, day_meals)
         
-        for day_idx, day_meals in enumerate(meal_days, 1):
-            response_text += f"**{day_idx}일차:**\n"
-            
-            # 각 끼니별 메뉴
-            for slot in ['breakfast', 'lunch', 'dinner', 'snack']:
-                if slot in day_meals and day_meals[slot]:
-                    meal = day_meals[slot]
-                    slot_name = self.slot_names[slot]
-                    
-                    # 기본 정보
-                    title = meal.get('title', '메뉴 없음')
-                    url = meal.get('url')  # URL 정보 추가
-                    
-                    # URL이 있으면 링크로 표시, 없으면 일반 텍스트
-                    if url:
-                        response_text += f"- {slot_name}: [{title}]({url}) [🔗]({url})"
-                    else:
-                        response_text += f"- {slot_name}: {title}"
-                    
-                    # 영양 정보 추가 (있을 경우)
-                    nutrition_info = []
-                    if meal.get('carbs'):
-                        nutrition_info.append(f"탄수화물 {meal['carbs']}g")
-                    if meal.get('calories'):
-                        nutrition_info.append(f"{meal['calories']}kcal")
-                    
-                    if nutrition_info:
-                        response_text += f" ({', '.join(nutrition_info)})"
-                    
-                    response_text += "\n"
-            
-            response_text += "\n"
+        yield self.format_meal_plan_footer(meal_plan)
+    
+    def format_meal_plan_header(self, days: int) -> str:
+        """식단표 제목"""
+        day_text = "1일" if days == 1 else f"{days}일"
+        return f"## ✨ {day_text} 키토 식단표\n\n"
+    
+    def format_meal_plan_day(self, day_idx: int, day_meals: Optional[Dict[str, Any]]) -> str:
+        """일차 1개 (day_idx 는 1부터)"""
+        response_text = f"**{day_idx}일차:**\n"
+        day_meals = day_meals or {}
+        
+        # 각 끼니별 메뉴
+        for slot in ['breakfast', 'lunch', 'dinner', 'snack']:
+            if slot in day_meals and day_meals[slot]:
+                meal = day_meals[slot]
+                slot_name = self.slot_names[slot]
+                
+                # 기본 정보
+                title = meal.get('title', '메뉴 없음')
+                url = meal.get('url')  # URL 정보 추가
+                
+                # URL이 있으면 링크로 표시, 없으면 일반 텍스트
+                if url:
+                    response_text += f"- {slot_name}: [{title}]({url}) [🔗]({url})"
+                else:
+                    response_text += f"- {slot_name}: {title}"
+                
+                # 영양 정보 추가 (있을 경우)
+                nutrition_info = []
+                if meal.get('carbs'):
+                    nutrition_info.append(f"탄수화물 {meal['carbs']}g")
+                if meal.get('calories'):
+                    nutrition_info.append(f"{meal['calories']}kcal")
+                
+                if nutrition_info:
+                    response_text += f" ({', '.join(nutrition_info)})"
+                
+                response_text += "\n"
+        
+        return response_text + "\n"
+    
+    def format_meal_plan_footer(self, meal_plan: Dict[str, Any]) -> str:
+        """키토 팁 / 영양 정보 / 링크·캘린더 안내"""
+        response_text = ""
         
         # 키토 팁: 간결 모드(요청 사항에 따라 한 줄 가이드만 표시)
         missing = meal_plan.get("missing_slots", [])
@@ -103,8 +121,6 @@ class MealResponseFormatter:
         # 캘린더 저장 안내 (실패 슬롯이 있으면 저장 안내 숨김)
         if not missing:
             response_text += "📅 이 식단표를 캘린더에 저장하시려면 **캘린더에 저장해줘** 라고 말씀해주세요!"
-        else:
-            response_text += ""
         
         return response_text
     
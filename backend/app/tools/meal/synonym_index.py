@@ -0,0 +1,144 @@
+"""
+재료 동의어 역색인
+ingredient_synonyms.json 을 로드 시 한 번 컴파일해 표준명 정규화/동의어 확장을 dict 조회로 처리
+
+- term(소문자) → 표준명 역매핑 (카테고리별)
+- 표준명 → 확장 튜플 (표준명 + 동의어 상위 5개)
+- 컴파일 결과는 JSON 옆 pickle 아티팩트로 저장해 워커마다 JSON 을 다시 파싱하지 않음
+  (JSON 의 mtime/크기 또는 색인 빌드 코드/상수가 바뀌면 자동 재생성)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SYNONYM_FILE = Path(__file__).parent.parent.parent / 'data' / 'ingredient_synonyms.json'
+
+# 동의어 확장 시 표준명당 사용할 동의어 수 (기존 _expand_with_synonyms 와 동일)
+EXPANSION_LIMIT = 5
+ARTIFACT_FORMAT = 1
+
+
+def _code_material(code) -> tuple:
+    # 중첩 코드 객체(컴프리헨션 등)의 repr 에는 메모리 주소가 들어가므로 재귀적으로 풀어서 사용
+    consts = tuple(_code_material(c) if hasattr(c, 'co_code') else c for c in code.co_consts)
+    return code.co_code, consts, code.co_names
+
+
+class SynonymIndex:
+    """카테고리("알레르기"/"비선호")별 동의어 역색인"""
+
+    def __init__(self, data: Dict[str, Dict[str, List[str]]]):
+        self.data = data
+        self._canonical: Dict[str, Dict[str, str]] = {}
+        self._expansion: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+        for category, synonym_dict in data.items():
+            reverse: Dict[str, str] = {}
+            expansion: Dict[str, Tuple[str, ...]] = {}
+            # 사전 순서대로 먼저 나온 표준명이 우선 (기존 선형 탐색과 같은 결과)
+            for canonical, synonyms in synonym_dict.items():
+                reverse.setdefault(canonical.lower(), canonical)
+                for syn in synonyms:
+                    reverse.setdefault(syn.lower(), canonical)
+                expansion[canonical] = tuple(dict.fromkeys([canonical, *synonyms[:EXPANSION_LIMIT]]))
+            self._canonical[category] = reverse
+            self._expansion[category] = expansion
+
+    def canonical(self, word: str, category: str) -> Optional[str]:
+        """단어 1개의 표준명 (사전에 없으면 None)"""
+        return self._canonical.get(category, {}).get(word.strip().lower())
+
+    def normalize(self, words: Iterable[str], category: str) -> List[str]:
+        """단어 리스트 → 표준명 리스트 (사전에 없는 단어는 원본 유지, 중복 제거)"""
+        reverse = self._canonical.get(category, {})
+        return list(dict.fromkeys(
+            reverse.get(word.strip().lower(), word.strip()) for word in words if word
+        ))
+
+    def expand(self, words: Iterable[str], category: str) -> List[str]:
+        """표준명 리스트 → 표준명 + 동의어 (순서 유지, 중복 제거)"""
+        expansion = self._expansion.get(category, {})
+        expanded: Dict[str, None] = {}
+        for word in words:
+            expanded.setdefault(word)
+            for term in expansion.get(word, ()):
+                expanded.setdefault(term)
+        return list(expanded)
+
+    # ---------- 로드 ----------
+
+    @staticmethod
+    def _source_stamp(path: Path) -> Tuple[int, int]:
+        stat = path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    @classmethod
+    def build_fingerprint(cls) -> str:
+        """색인 빌드 입력(빌드 코드 + 상수) 해시 → 정규화/구조가 바뀌면 ARTIFACT_FORMAT 을 안 올려도 재생성"""
+        material = repr((ARTIFACT_FORMAT, EXPANSION_LIMIT, _code_material(cls.__init__.__code__)))
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()[:16]
+
+    def _is_valid(self) -> bool:
+        """역직렬화된 색인 구조 확인 (카테고리별 역매핑/확장 dict)"""
+        return (
+            isinstance(self.data, dict)
+            and isinstance(getattr(self, '_canonical', None), dict)
+            and isinstance(getattr(self, '_expansion', None), dict)
+            and set(self._canonical) == set(self.data) == set(self._expansion)
+        )
+
+    @classmethod
+    def load(cls, path: Path = SYNONYM_FILE, artifact_path: Optional[Path] = None) -> 'SynonymIndex':
+        """pickle 아티팩트가 최신이면 재사용, 아니면 JSON 컴파일 후 아티팩트 저장"""
+        artifact_path = artifact_path or path.with_suffix('.index.pkl')
+        try:
+            stamp = cls._source_stamp(path)
+        except OSError as e:
+            print(f"⚠️ 동의어 사전 로드 실패: {e}")
+            return cls({"알레르기": {}, "비선호": {}})
+
+        fingerprint = cls.build_fingerprint()
+        try:
+            with open(artifact_path, 'rb') as f:
+                payload = pickle.load(f)
+            index = payload.get('index')
+            if (payload.get('format') == ARTIFACT_FORMAT and payload.get('stamp') == stamp
+                    and payload.get('build') == fingerprint and isinstance(index, cls) and index._is_valid()):
+                return index
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning("동의어 색인 아티팩트 무시 (재생성): %r", e)
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                index = cls(json.load(f))
+            print(f"✅ 동의어 사전 로드 완료: {path}")
+        except Exception as e:
+            print(f"⚠️ 동의어 사전 로드 실패: {e}")
+            return cls({"알레르기": {}, "비선호": {}})
+
+        cls._write_artifact(artifact_path, {'format': ARTIFACT_FORMAT, 'stamp': stamp, 'build': fingerprint, 'index': index})
+        return index
+
+    @staticmethod
+    def _write_artifact(artifact_path: Path, payload: dict) -> None:
+        # 임시 파일 → rename 으로 원자적 교체 (동시에 뜨는 워커끼리 깨진 파일을 읽지 않도록)
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=artifact_path.parent, prefix=artifact_path.name, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, artifact_path)
+        except Exception as e:
+            # 읽기 전용 배포 환경 등: 아티팩트 없이 동작
+            logger.debug("동의어 색인 아티팩트 저장 생략: %r", e)
+
+
+synonym_index = SynonymIndex.load()
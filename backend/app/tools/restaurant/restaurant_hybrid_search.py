@@ -5,13 +5,13 @@ Supabase 벡터 검색 + 키워드 검색을 통한 식당 RAG
 
 import re
 import random
-import openai
 import asyncio
 import sys
 import os
 from typing import List, Dict, Any, Optional
 from app.core.database import supabase
 from app.core.redis_cache import redis_cache
+from app.core.cache_keys import make_key
 
 # Windows 콘솔에서 이모지 출력을 위한 인코딩 설정
 if sys.platform == "win32":
@@ -26,14 +26,15 @@ if sys.platform == "win32":
         # 일부 환경에서는 reconfigure 미지원: 환경 변수 또는 기본 출력 사용
         pass
 from app.core.config import settings
+from app.core.embedding_service import embedding_service
+from app.core.tracing import span
+from app.tools.shared.result_fusion import dedupe_best, top_k
 
 class RestaurantHybridSearchTool:
     """식당 하이브리드 검색 도구 클래스"""
     
     def __init__(self):
         self.supabase = supabase
-        # OpenAI 클라이언트 (임베딩용으로 유지)
-        self.openai_client = openai.OpenAI(api_key=settings.openai_api_key)
         # 실제 식당 테이블들
         self.restaurant_table = "restaurant"
         self.menu_table = "menu"
@@ -44,11 +45,7 @@ class RestaurantHybridSearchTool:
         """텍스트를 임베딩으로 변환"""
         try:
             print(f"📊 식당 임베딩 생성 중: {text[:50]}...")
-            response = self.openai_client.embeddings.create(
-                model=settings.embedding_model,
-                input=text
-            )
-            embedding = response.data[0].embedding
+            embedding = await embedding_service.embed(text)
             print(f"✅ 식당 임베딩 생성 완료: {len(embedding)}차원")
             return embedding
         except Exception as e:
@@ -76,27 +73,20 @@ class RestaurantHybridSearchTool:
     
     def _deduplicate_results(self, results: List[Dict]) -> List[Dict]:
         """중복 결과 제거 (개선된 버전)"""
-        seen_ids = set()
-        unique_results = []
-        
-        for result in results:
-            # 여러 필드명으로 고유 ID 생성 시도
-            restaurant_id = result.get('restaurant_id') or result.get('id')
-            menu_id = result.get('menu_id')
-            
-            # restaurant_id가 있으면 그것을 사용, 없으면 식당명으로 대체
-            if restaurant_id:
-                result_id = f"{restaurant_id}_{menu_id or 'no_menu'}"
-            else:
-                # 식당명으로 중복 제거 (폴백)
-                restaurant_name = result.get('restaurant_name') or result.get('name', '')
-                result_id = f"{restaurant_name}_{menu_id or 'no_menu'}"
-            
-            if result_id and result_id not in seen_ids:
-                seen_ids.add(result_id)
-                unique_results.append(result)
+        return dedupe_best(results, key=self._result_key)
+    
+    @staticmethod
+    def _result_key(result: Dict) -> str:
+        # 여러 필드명으로 고유 ID 생성 시도
+        restaurant_id = result.get('restaurant_id') or result.get('id')
+        menu_id = result.get('menu_id')
         
-        return unique_results
+        # restaurant_id가 있으면 그것을 사용, 없으면 식당명으로 대체
+        if restaurant_id:
+            return f"{restaurant_id}_{menu_id or 'no_menu'}"
+        # 식당명으로 중복 제거 (폴백)
+        restaurant_name = result.get('restaurant_name') or result.get('name', '')
+        return f"{restaurant_name}_{menu_id or 'no_menu'}"
     
     def _select_diverse_results(self, results: List[Dict], max_results: int, gimbap_cap: int = 1) -> List[Dict]:
         """메뉴 다양성을 고려한 결과 선택 (식당 다양성 우선)"""
@@ -254,11 +244,12 @@ class RestaurantHybridSearchTool:
                 return []
             
             # 실제 스키마 기반 RPC 함수 호출
-            results = self.supabase.rpc('restaurant_menu_vector_search', {
-                'query_embedding': query_embedding,
-                'match_count': k,
-                'similarity_threshold': 0.4  # 의미 있는 유사도만 반환
-            }).execute()
+            with span("supabase.rpc.restaurant_menu_vector_search"):
+                results = self.supabase.rpc('restaurant_menu_vector_search', {
+                    'query_embedding': query_embedding,
+                    'match_count': k,
+                    'similarity_threshold': 0.4  # 의미 있는 유사도만 반환
+                }).execute()
             
             if results.data:
                 print(f"✅ 식당 메뉴 벡터 검색 성공: {len(results.data)}개 (임계값 0.4 이상)")
@@ -294,10 +285,11 @@ class RestaurantHybridSearchTool:
                     print(f"  🔍 키워드 '{keyword}' 검색 중...")
                     
                     # ILIKE 검색
-                    ilike_results = self.supabase.rpc('restaurant_ilike_search', {
-                        'query_text': keyword,
-                        'match_count': k
-                    }).execute()
+                    with span("supabase.rpc.restaurant_ilike_search"):
+                        ilike_results = self.supabase.rpc('restaurant_ilike_search', {
+                            'query_text': keyword,
+                            'match_count': k
+                        }).execute()
                     
                     print(f"    ILIKE 결과: {len(ilike_results.data) if ilike_results.data else 0}개")
                     if ilike_results.data:
@@ -307,11 +299,12 @@ class RestaurantHybridSearchTool:
                         all_results.extend(filtered_results)
                     
                     # Trigram 검색
-                    trgm_results = self.supabase.rpc('restaurant_trgm_search', {
-                        'query_text': keyword,
-                        'match_count': k,
-                        'similarity_threshold': 0.3
-                    }).execute()
+                    with span("supabase.rpc.restaurant_trgm_search"):
+                        trgm_results = self.supabase.rpc('restaurant_trgm_search', {
+                            'query_text': keyword,
+                            'match_count': k,
+                            'similarity_threshold': 0.3
+                        }).execute()
                     
                     print(f"    Trigram 결과: {len(trgm_results.data) if trgm_results.data else 0}개")
                     if trgm_results.data:
@@ -430,7 +423,7 @@ class RestaurantHybridSearchTool:
             print(f"  🎯 전체 결과 검색: 제한 없이 모든 식당 검색 후 {max_results}개 랜덤 선택")
             
             # 1. 결과 풀 캐시 확인 (쿼리 기준) - 회전을 위해 캐시 비활성화
-            pool_cache_key = f"restaurant_result_pool:{normalized_query}"
+            pool_cache_key = make_key("restaurant", "result_pool", normalized_query)
             cached_pool = None  # 회전을 위해 항상 새로 검색
             if cached_pool:
                 print(f"  ⚡ 캐시 히트 - 결과 풀 재사용: {len(cached_pool)}개")
@@ -620,7 +613,7 @@ class RestaurantHybridSearchTool:
                     unique_results = filtered_pool
                 # 결과 풀 캐시 저장 (5분)
                 if unique_results:
-                    redis_cache.set(pool_cache_key, unique_results, ttl=300)
+                    await redis_cache.aset(pool_cache_key, unique_results, ttl=300)
                     print(f"  💾 캐시 저장 - 결과 풀 {len(unique_results)}개 (TTL 300s)")
             
             # 4. 결과가 없으면 폴백 검색
@@ -649,9 +642,9 @@ class RestaurantHybridSearchTool:
                 except Exception:
                     user_id = None
             rotation_user = str(user_id) if user_id else "anon"
-            rotation_key = f"restaurant_rotation:{rotation_user}:{normalized_query}"
+            rotation_key = make_key("restaurant", "rotation", rotation_user, normalized_query)
             recent_last_batch_key = rotation_key + ":last"
-            menu_rotation_key = f"menu_rotation:{rotation_user}:{normalized_query}"
+            menu_rotation_key = make_key("restaurant", "menu_rotation", rotation_user, normalized_query)
             last_menu_batch_key = f"{menu_rotation_key}:last"
 
             # 요청으로 회전 캐시 초기화 (비활성화)
@@ -667,8 +660,10 @@ class RestaurantHybridSearchTool:
 
 
                 
-            recent_restaurant_ids = redis_cache.get(rotation_key) or []
-            recent_last_batch = redis_cache.get(recent_last_batch_key) or []
+            # 회전 이력 + 직전 배치를 한 번의 왕복(MGET)으로 조회
+            recent_restaurant_ids, recent_last_batch = await redis_cache.amget([rotation_key, recent_last_batch_key])
+            recent_restaurant_ids = recent_restaurant_ids or []
+            recent_last_batch = recent_last_batch or []
             recent_set = set(str(rid) for rid in recent_restaurant_ids)
 
             # 최근에 추천한 식당 제외
@@ -717,7 +712,7 @@ class RestaurantHybridSearchTool:
             print(f"  🔁 회전 추천(식당 제외 비활성): 최근 리스트 {len(recent_set)}개 → 사용 가능 {len(available_results)}개")
 
             # 메뉴 레벨 회전(used_menu)도 제외
-            used_menus = set(str(x) for x in (redis_cache.get(menu_rotation_key) or []))
+            used_menus = set(str(x) for x in (await redis_cache.aget(menu_rotation_key) or []))
             if used_menus:
                 before = len(available_results)
                 remaining_after_menu = [r for r in available_results if _mid(r) not in used_menus]
@@ -734,10 +729,9 @@ class RestaurantHybridSearchTool:
                             if mid_c in used_menus or mid_c in picked_mids_tmp:
                                 continue
                             candidates.append(cand)
-                        # 점수 우선 정렬 후 보충
-                        candidates.sort(key=lambda x: x.get('keto_score') or 0, reverse=True)
+                        # 점수 상위 후보로 보충
                         need = max_results - len(remaining_after_menu)
-                        fill = candidates[:need]
+                        fill = top_k(candidates, need, 'keto_score')
                         available_results = remaining_after_menu + fill
                     except Exception as e:
                         print(f"  ⚠️ 회전 유지 보충 실패: {e}")
@@ -747,7 +741,7 @@ class RestaurantHybridSearchTool:
 
             # 🧱 직전 배치 메뉴 1회 우선 제외(부족하면 해제)
             try:
-                last_menu_batch = set(str(x) for x in (redis_cache.get(last_menu_batch_key) or []))
+                last_menu_batch = set(str(x) for x in (await redis_cache.aget(last_menu_batch_key) or []))
                 if last_menu_batch:
                     before = len(available_results)
                     tmp = [r for r in available_results if _mid(r) not in last_menu_batch]
@@ -803,8 +797,8 @@ class RestaurantHybridSearchTool:
 
             # 회전 추천: 사용 가능한 메뉴 풀 관리
             rotation_user = str(user_id) if user_id else "anon"
-            menu_rotation_key = f"menu_rotation:{rotation_user}:{normalized_query}"
-            used_menus = set(str(x) for x in (redis_cache.get(menu_rotation_key) or []))
+            menu_rotation_key = make_key("restaurant", "menu_rotation", rotation_user, normalized_query)
+            used_menus = set(str(x) for x in (await redis_cache.aget(menu_rotation_key) or []))
             
             # 전체 메뉴 풀 생성
             all_menu_names = set(str(r.get('menu_name', '')).strip() for r in available_results if r.get('menu_name'))
@@ -812,7 +806,7 @@ class RestaurantHybridSearchTool:
             # 처음 요청이면 전체 메뉴를 회전 풀에 저장
             if len(used_menus) == 0:
                 print(f"  🆕 첫 요청: 전체 메뉴 {len(all_menu_names)}개를 회전 풀에 저장")
-                redis_cache.set(menu_rotation_key, list(all_menu_names), ttl=1800)
+                await redis_cache.aset(menu_rotation_key, list(all_menu_names), ttl=1800)
                 used_menus = set()
             
             # 사용 가능한 메뉴 풀 생성 (전체 메뉴 - 사용한 메뉴)
@@ -827,7 +821,7 @@ class RestaurantHybridSearchTool:
                 print(f"  🔄 회전 리셋: 사용 가능한 메뉴 {len(unused_menus)}개 → 전체 메뉴로 리셋")
                 try:
                     # 전체 메뉴로 리셋
-                    redis_cache.delete(menu_rotation_key)
+                    await redis_cache.adelete(menu_rotation_key)
                     used_menus = set()
                     unused_menus = all_menu_names
                     print(f"  ✅ 회전 리셋 완료: 전체 메뉴 {len(unused_menus)}개 사용 가능")
@@ -1014,9 +1008,11 @@ class RestaurantHybridSearchTool:
                         seen.add(str(rid))
                 merged = merged[-100:]
                 # 30분 TTL
-                redis_cache.set(rotation_key, merged, ttl=1800)
-                # 직전 배치도 별도 저장하여 보충 로직에 활용
-                redis_cache.set(recent_last_batch_key, new_ids, ttl=1800)
+                # 직전 배치도 별도 저장하여 보충 로직에 활용 (파이프라인 1회)
+                await redis_cache.amset({
+                    rotation_key: merged,
+                    recent_last_batch_key: new_ids,
+                }, ttl=1800)
                 print(f"  🧠 회전 추천 업데이트: 총 {len(merged)}개 저장")
 
                 # 메뉴 레벨 회전 업데이트 (사용한 메뉴 추가)
@@ -1029,7 +1025,7 @@ class RestaurantHybridSearchTool:
                         
                         # Redis에 저장
                         try:
-                            redis_cache.set(menu_rotation_key, list(updated_used_menus), ttl=1800)
+                            await redis_cache.aset(menu_rotation_key, list(updated_used_menus), ttl=1800)
                             print(f"  🍽️ 메뉴 회전 업데이트: 사용한 메뉴 {len(updated_used_menus)}개 저장")
                         except Exception as e:
                             print(f"  ⚠️ 메뉴 회전 키 저장 실패: {e}")
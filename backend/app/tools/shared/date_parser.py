@@ -10,6 +10,7 @@ import logging
 from langchain.schema import HumanMessage
 
 from app.core.llm_factory import create_chat_llm
+from app.shared.utils.keyword_router import keyword_router
 
 # 로거 설정
 logger = logging.getLogger(__name__)
@@ -941,10 +942,9 @@ JSON 형식 (duration_days 필드 필수):
                 pass
 
         # "25일" 형태 (이번 달) - 캘린더 저장 요청인 경우에만 처리
-        calendar_keywords = ['캘린더', '저장', '추가', '넣어', '일정']
-        is_calendar_request = any(keyword in text for keyword in calendar_keywords)
+        matches = keyword_router.scan(text)
         
-        if is_calendar_request and not any(keyword in text for keyword in ['식단표', '식단', '계획', '추천', '만들', '생성']):
+        if matches.has("date.calendar_request") and not matches.has("date.meal_plan_request"):
             day_only_match = re.search(r'(\d{1,2})일', text)
             if day_only_match:
                 day = int(day_only_match.group(1))
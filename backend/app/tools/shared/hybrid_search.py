@@ -4,34 +4,26 @@ Supabase 하이브리드 검색 도구
 """
 
 import re
-# OpenAI import (임베딩용으로 유지)
-import openai
 import asyncio
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from app.core.database import supabase
 from app.core.config import settings
+from app.core.embedding_service import embedding_service
+from app.core.tracing import span
 from app.tools.shared.profile_tool import user_profile_tool
+from app.tools.shared.result_fusion import dedupe_best
 
 class HybridSearchTool:
     """Supabase 하이브리드 검색 도구 클래스"""
     
     def __init__(self):
         self.supabase = supabase
-        # OpenAI 클라이언트 (임베딩용으로 유지)
-        self.openai_client = openai.OpenAI(api_key=settings.openai_api_key)
-        # 알레르기/비선호 임베딩 캐시
-        self._allergy_cache = {}
-        self._dislike_cache = {}
     
     async def _create_embedding(self, text: str) -> List[float]:
         """텍스트를 임베딩으로 변환"""
         try:
             print(f"📊 임베딩 생성 중: {text[:50]}...")
-            response = self.openai_client.embeddings.create(
-                model=settings.embedding_model,
-                input=text
-            )
-            embedding = response.data[0].embedding
+            embedding = await embedding_service.embed(text)
             print(f"✅ 임베딩 생성 완료: {len(embedding)}차원")
             return embedding
         except Exception as e:
@@ -83,16 +75,7 @@ class HybridSearchTool:
     
     def _deduplicate_results(self, results: List[Dict]) -> List[Dict]:
         """중복 결과 제거"""
-        seen_ids = set()
-        unique_results = []
-        
-        for result in results:
-            result_id = result.get('id')
-            if result_id and result_id not in seen_ids:
-                seen_ids.add(result_id)
-                unique_results.append(result)
-        
-        return unique_results
+        return dedupe_best(results)
     
     async def _supabase_hybrid_search(self, query: str, query_embedding: List[float], k: int) -> List[Dict]:
         """Supabase RPC 하이브리드 검색"""
@@ -101,11 +84,12 @@ class HybridSearchTool:
                 return []
             
             # Supabase RPC 함수 호출
-            results = self.supabase.rpc('hybrid_search', {
-                'query_text': query,
-                'query_embedding': query_embedding,
-                'match_count': k
-            }).execute()
+            with span("supabase.rpc.hybrid_search"):
+                results = self.supabase.rpc('hybrid_search', {
+                    'query_text': query,
+                    'query_embedding': query_embedding,
+                    'match_count': k
+                }).execute()
             
             if results.data:
                 print(f"✅ Supabase 하이브리드 검색 성공: {len(results.data)}개")
@@ -353,6 +337,23 @@ class HybridSearchTool:
             print(f"❌ 하이브리드 검색 오류: {e}")
             return []
     
+    def _format_korean_result(self, result: Dict, search_strategy: str, search_message: str) -> Dict:
+        """한글 검색 결과 1건 → search() 반환 형식"""
+        return {
+            'id': result.get('id', ''),
+            'title': result.get('title', '제목 없음'),
+            'content': result.get('content', ''),
+            'blob': result.get('blob', ''),  # blob 데이터 추가
+            'allergens': result.get('allergens', []),
+            'ingredients': result.get('ingredients', []),
+            'similarity': result.get('final_score', 0.0),
+            'url': result.get('url'),  # URL 추가
+            'metadata': result.get('metadata', {}),
+            'search_types': [result.get('search_type', 'hybrid')],
+            'search_strategy': search_strategy,
+            'search_message': search_message
+        }
+    
     async def search(self, query: str, profile: str = "", max_results: int = 5, user_id: Optional[str] = None,
                     allergies: Optional[List[str]] = None, dislikes: Optional[List[str]] = None) -> List[Dict]:
         """간단한 검색 인터페이스 (한글 최적화) + 사용자 프로필 필터링 + 임시 제약조건"""
@@ -394,20 +395,7 @@ class HybridSearchTool:
                 if blob_data:
                     print(f"    🔍 blob 내용: {str(blob_data)[:100]}...")
                 
-                formatted_results.append({
-                    'id': result.get('id', ''),
-                    'title': result.get('title', '제목 없음'),
-                    'content': result.get('content', ''),
-                    'blob': result.get('blob', ''),  # blob 데이터 추가
-                    'allergens': result.get('allergens', []),
-                    'ingredients': result.get('ingredients', []),
-                    'similarity': result.get('final_score', 0.0),
-                    'url': result.get('url'),  # URL 추가
-                    'metadata': result.get('metadata', {}),
-                    'search_types': [result.get('search_type', 'hybrid')],
-                    'search_strategy': search_strategy,
-                    'search_message': search_message
-                })
+                formatted_results.append(self._format_korean_result(result, search_strategy, search_message))
             
             # 과거 Top3 강제 컷 제거: 다양성 확보를 위해 max_results 수준까지 반환
             # (여기서는 DB 단계에서 이미 max_results를 적용함)
@@ -456,5 +444,63 @@ class HybridSearchTool:
                 print(f"Fallback search error: {fallback_error}")
                 return []
 
+    async def batch_search(self, slot_queries: Dict[str, List[Tuple[str, int]]], user_id: Optional[str] = None,
+                           allergies: Optional[List[str]] = None, dislikes: Optional[List[str]] = None,
+                           used_recipes: Optional[set] = None,
+                           slot_targets: Optional[Dict[str, int]] = None) -> Dict[str, List[Dict]]:
+        """식사 슬롯별 여러 쿼리를 한 번에 검색해 슬롯별 후보 풀 반환
+        
+        Args:
+            slot_queries: {슬롯: [(쿼리, 최대 수집 수), ...]} - 쿼리 순서가 우선순위
+            used_recipes: 슬롯 간 공유되는 사용 레시피 ID 집합 (수집된 레시피가 추가됨)
+            slot_targets: 슬롯별 목표 후보 수 - 도달하면 그 슬롯의 뒤쪽 쿼리 결과는 건너뜀
+        
+        모든 쿼리의 임베딩/검색은 한 번에 실행하고, 중복 제거는 슬롯 순서대로 결정적으로 적용한다.
+        """
+        from app.tools.meal.korean_search import korean_search_tool
+        
+        used_recipes = used_recipes if used_recipes is not None else set()
+        slot_targets = slot_targets or {}
+        flat = [(slot, query, max_results) for slot, queries in slot_queries.items() for query, max_results in queries]
+        if not flat:
+            return {slot: [] for slot in slot_queries}
+        
+        try:
+            batch_results = await korean_search_tool.batch_hybrid_search(
+                [query for _, query, _ in flat],
+                # 단건 search() 와 같은 여유분 (필터링/중복 제거 후에도 채우도록)
+                [min(max_results * 3, 50) for _, _, max_results in flat],
+                user_id=user_id,
+                meal_types=[self._extract_meal_type(query) for _, query, _ in flat],
+                allergies=allergies,
+                dislikes=dislikes,
+            )
+        except Exception as e:
+            print(f"❌ 배치 검색 오류: {e}")
+            batch_results = [[] for _ in flat]
+        
+        pools: Dict[str, List[Dict]] = {slot: [] for slot in slot_queries}
+        for (slot, query, max_results), results in zip(flat, batch_results):
+            pool = pools[slot]
+            target = slot_targets.get(slot)
+            if target is not None and len(pool) >= target:
+                continue
+            
+            collected = 0
+            for result in results:
+                recipe_id = result.get('id') or result.get('title', '')
+                if not recipe_id or recipe_id in used_recipes:
+                    continue
+                used_recipes.add(recipe_id)
+                pool.append(self._format_korean_result(
+                    result, result.get('search_strategy', 'unknown'), result.get('search_message', '')
+                ))
+                collected += 1
+                if collected >= max_results:
+                    break
+        
+        print(f"✅ 배치 검색 완료: 쿼리 {len(flat)}개 → " + ", ".join(f"{slot} {len(pool)}개" for slot, pool in pools.items()))
+        return pools
+
 # 전역 하이브리드 검색 도구 인스턴스
 hybrid_search_tool = HybridSearchTool()
@@ -411,7 +411,16 @@ class UserProfileTool:
         
         excluded_count = 0
         
+        # 재료 비트셋이 있는 레시피는 마스크 AND 한 번으로 제외 판정
+        from app.tools.meal.ingredient_bitset import ingredient_vocabulary
+        exclusion_mask = ingredient_vocabulary.exclusion_mask([*user_allergies, *user_dislikes])
+        
         for recipe in recipes:
+            if exclusion_mask.check(recipe):
+                logger.info(f"🚫 재료 비트셋으로 인해 제외: {recipe.get('title', 'Unknown')}")
+                excluded_count += 1
+                continue
+            
             # 알레르기 체크 (임베딩 검색으로 이미 의미적 유사성이 반영됨)
             recipe_allergens = set(recipe.get("allergens", []))
             recipe_title = recipe.get("title", "").lower()
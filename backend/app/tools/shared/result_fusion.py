@@ -0,0 +1,118 @@
+"""
+검색 결과 융합 유틸리티
+여러 검색 레그(벡터/ILIKE/FTS/Trigram 등) 결과를 ID 기준으로 합치고 상위 k개만 선택
+
+- dedupe_best: dict 한 번의 패스로 ID별 최고 점수 행만 유지 (첫 등장 순서 유지)
+- top_k: 전체 정렬 대신 heapq.nlargest (동점은 입력 순서 유지, sorted()[:k] 와 같은 결과)
+- fuse_leg_scores: 레그별 점수를 (후보 × 레그) 행렬로 모아 NumPy 로 가중치 융합 → 수천 개 후보도 저렴하게 처리
+"""
+
+import heapq
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+ResultKey = Callable[[Dict[str, Any]], Optional[Hashable]]
+
+
+def id_key(result: Dict[str, Any]) -> Optional[Hashable]:
+    """기본 결과 키: id (없으면 None → 중복 제거 대상에서 제외)"""
+    result_id = result.get('id')
+    return str(result_id) if result_id not in (None, '') else None
+
+
+def _score(result: Dict[str, Any], score_key: str) -> float:
+    return result.get(score_key) or 0.0
+
+
+def dedupe_best(results: Iterable[Dict[str, Any]], score_key: Optional[str] = None,
+                key: ResultKey = id_key) -> List[Dict[str, Any]]:
+    """ID별로 한 행만 유지
+
+    score_key 가 있으면 점수가 더 높은 행으로 교체, 없으면 먼저 나온 행 유지.
+    키가 None 인 행은 버린다 (기존 seen_ids 루프와 동일).
+    """
+    best: Dict[Hashable, Dict[str, Any]] = {}
+    for result in results:
+        result_key = key(result)
+        if result_key is None:
+            continue
+        existing = best.get(result_key)
+        if existing is None:
+            best[result_key] = result
+        elif score_key is not None and _score(result, score_key) > _score(existing, score_key):
+            # dict 는 키 최초 삽입 위치를 유지하므로 순서는 첫 등장 기준
+            best[result_key] = result
+    return list(best.values())
+
+
+def top_k(results: Iterable[Dict[str, Any]], k: int, score_key: str) -> List[Dict[str, Any]]:
+    """점수 상위 k개 (내림차순)"""
+    if k <= 0:
+        return []
+    return heapq.nlargest(k, results, key=lambda r: _score(r, score_key))
+
+
+def fuse_top_k(results: Iterable[Dict[str, Any]], k: int, score_key: str,
+               key: ResultKey = id_key) -> List[Dict[str, Any]]:
+    """중복 제거(최고 점수 유지) + 상위 k개"""
+    return top_k(dedupe_best(results, score_key, key), k, score_key)
+
+
+def fuse_leg_scores(leg_results: Mapping[str, Sequence[Dict[str, Any]]], weights: Mapping[str, float],
+                    k: int, score_key: str = 'search_score', mode: str = 'max',
+                    key: ResultKey = id_key) -> List[Dict[str, Any]]:
+    """레그별 결과 → 가중 융합 점수 상위 k개
+
+    각 후보의 레그 점수를 (후보 수 × 레그 수) 행렬에 채운 뒤 가중치 벡터를 곱해
+    mode='max' 면 레그 중 최고 가중 점수(기존 중복 제거 방식), 'sum' 이면 합산으로 융합한다.
+    반환 행에는 final_score 와 최고 점수를 낸 레그(search_type)가 채워진다.
+    """
+    legs = [leg for leg in leg_results if leg_results[leg]]
+    if k <= 0 or not legs:
+        return []
+
+    positions: Dict[Hashable, int] = {}
+    rows: List[Dict[str, Any]] = []
+    cells: List[tuple] = []
+    # (후보, 레그) → 그 레그의 원본 행 (표시용 필드가 레그마다 다를 수 있어 최고 점수 레그의 행을 사용)
+    leg_rows: Dict[tuple, Dict[str, Any]] = {}
+    for col, leg in enumerate(legs):
+        for result in leg_results[leg]:
+            result_key = key(result)
+            if result_key is None:
+                continue
+            pos = positions.get(result_key)
+            if pos is None:
+                pos = positions[result_key] = len(rows)
+                rows.append(result)
+            score = _score(result, score_key)
+            cells.append((pos, col, score))
+            existing = leg_rows.get((pos, col))
+            if existing is None or score > _score(existing, score_key):
+                leg_rows[(pos, col)] = result
+
+    scores = np.zeros((len(rows), len(legs)), dtype=np.float64)
+    row_idx, col_idx, values = zip(*cells)
+    # 같은 레그에 같은 ID가 여러 번 나오면 높은 점수 유지
+    np.maximum.at(scores, (np.asarray(row_idx), np.asarray(col_idx)), np.asarray(values, dtype=np.float64))
+    weighted = scores * np.asarray([weights.get(leg, 0.0) for leg in legs], dtype=np.float64)
+
+    best_leg = np.argmax(weighted, axis=1)
+    fused = weighted.sum(axis=1) if mode == 'sum' else weighted[np.arange(len(rows)), best_leg]
+
+    n = min(k, len(rows))
+    # n번째 점수보다 높은 후보 + 경계 동점은 첫 등장 순으로 채운 뒤 그 안에서만 정렬
+    # (argpartition 은 경계 동점 중 임의로 골라 sorted()[:k] 와 결과가 달라질 수 있음)
+    if n < len(rows):
+        kth = np.partition(fused, len(rows) - n)[len(rows) - n]
+        above = np.flatnonzero(fused > kth)
+        top = np.concatenate([above, np.flatnonzero(fused == kth)[:n - len(above)]])
+    else:
+        top = np.arange(len(rows))
+    top = top[np.lexsort((top, -fused[top]))]
+
+    return [
+        dict(leg_rows.get((i, best_leg[i]), rows[i]), final_score=float(fused[i]), search_type=legs[best_leg[i]])
+        for i in top
+    ]
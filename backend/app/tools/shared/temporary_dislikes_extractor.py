@@ -179,6 +179,7 @@ JSON 형식으로만 응답하세요:
             r"(\w+)\s+제외",  # "계란 제외"
             r"(\w+)(?:을|를|은|는|이|가)?\s*(?:없는|없이)",  # "계란을 없는", "계란은 없이", "계란이 없는", "계란 없는"
             r"(\w+)(?:을|를|은|는|이|가)?\s*(?:빼고|말고)",  # "계란을 빼고", "계란은 말고", "계란이 빼고", "계란 빼고"
+            r"(\w+?)(?:을|를|은|는)?\s*빼\s*(?:줘|주세요|달라)",  # "오이 빼줘", "오이는 빼 줘", "계란을 빼주세요"
             r"(\w+)(?:을|를|은|는|이|가)?\s*(?:안|못)",  # "계란을 안", "계란은 못", "계란이 안", "계란 안"
         ]
         
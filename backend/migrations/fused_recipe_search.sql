@@ -0,0 +1,171 @@
+-- =========================================================
+-- 레시피 통합 검색 RPC (fused_recipe_search)
+-- 벡터 + ILIKE + FTS + Trigram 4개 레그를 한 번의 SQL 호출로 실행하고
+-- 가중치 융합(weighted) 또는 RRF(reciprocal rank fusion)로 단일 랭킹 반환
+--
+-- 기존: 레시피 검색 1회당 PostgREST 호출 최대 5회 (vector/ilike/fts/trgm/fallback)
+-- 변경: 1회 호출 → 식단 생성 시 슬롯 검색 수십 회의 네트워크 왕복 감소
+--
+-- 전제: recipe_blob_emb 테이블, pg_trgm 확장, 'korean' text search 설정
+--       (기존 vector_search / ilike_search / fts_search / trgm_search 와 동일)
+--
+-- 백엔드: KoreanSearchTool._fused_search 가 이 함수를 우선 호출하고,
+--         함수가 없거나 실패하면 기존 4개 레그 병렬 검색으로 폴백한다.
+-- =========================================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- 기존 오버로드 모두 삭제 후 재생성
+DO $$
+DECLARE
+    func_signature text;
+BEGIN
+    FOR func_signature IN
+        SELECT format('%s(%s)', p.proname, pg_get_function_identity_arguments(p.oid))
+        FROM pg_proc p
+        JOIN pg_namespace n ON p.pronamespace = n.oid
+        WHERE p.proname = 'fused_recipe_search'
+          AND n.nspname = 'public'
+    LOOP
+        EXECUTE format('DROP FUNCTION IF EXISTS %s', func_signature);
+    END LOOP;
+END $$;
+
+CREATE OR REPLACE FUNCTION fused_recipe_search(
+    query_text text,
+    query_embedding vector(1536) DEFAULT NULL,
+    match_count integer DEFAULT 300,        -- 최종 반환 개수
+    leg_count integer DEFAULT 1000,         -- 벡터 레그 후보 수 (기존 max_search_count)
+    meal_type_filter text DEFAULT NULL,
+    exclude_title_terms text[] DEFAULT NULL, -- 제목 부분문자열 제외 (알레르기/비선호 확장어)
+    vector_weight float DEFAULT 0.4,
+    ilike_weight float DEFAULT 0.35,
+    fts_weight float DEFAULT 0.3,
+    trgm_weight float DEFAULT 0.2,
+    fusion text DEFAULT 'weighted',         -- 'weighted' | 'rrf'
+    rrf_k integer DEFAULT 60,
+    text_leg_count integer DEFAULT 50        -- ILIKE/FTS/Trigram 레그 후보 수
+)
+RETURNS TABLE (
+    id uuid,
+    title text,
+    content text,
+    ingredients text[],
+    allergens text[],
+    tags text[],
+    meal_type text,
+    url text,
+    vector_score float,
+    ilike_score float,
+    fts_score float,
+    trgm_score float,
+    final_score float,
+    search_type text
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH vec AS (
+        SELECT rbe.id,
+               (1 - (rbe.embedding <=> query_embedding))::float AS score,
+               row_number() OVER (ORDER BY rbe.embedding <=> query_embedding) AS rnk
+        FROM recipe_blob_emb rbe
+        WHERE query_embedding IS NOT NULL
+          AND (meal_type_filter IS NULL OR rbe.meal_type = meal_type_filter)
+        ORDER BY rbe.embedding <=> query_embedding
+        LIMIT leg_count
+    ),
+    ilk AS (
+        SELECT rbe.id,
+               1.0::float AS score,
+               row_number() OVER (
+                   ORDER BY CASE WHEN rbe.title ILIKE query_text THEN 1
+                                 WHEN rbe.title ILIKE query_text || '%' THEN 2
+                                 WHEN rbe.title ILIKE '%' || query_text THEN 3
+                                 ELSE 4 END
+               ) AS rnk
+        FROM recipe_blob_emb rbe
+        WHERE rbe.title ILIKE '%' || query_text || '%'
+        LIMIT text_leg_count
+    ),
+    fts AS (
+        SELECT rbe.id,
+               ts_rank(to_tsvector('korean', rbe.title), plainto_tsquery('korean', query_text))::float AS score,
+               row_number() OVER (
+                   ORDER BY ts_rank(to_tsvector('korean', rbe.title), plainto_tsquery('korean', query_text)) DESC
+               ) AS rnk
+        FROM recipe_blob_emb rbe
+        WHERE to_tsvector('korean', rbe.title) @@ plainto_tsquery('korean', query_text)
+        LIMIT text_leg_count
+    ),
+    trg AS (
+        SELECT rbe.id,
+               similarity(rbe.title, query_text)::float AS score,
+               row_number() OVER (ORDER BY similarity(rbe.title, query_text) DESC) AS rnk
+        FROM recipe_blob_emb rbe
+        WHERE similarity(rbe.title, query_text) > 0.3
+        LIMIT text_leg_count
+    ),
+    legs AS (
+        SELECT l.id, 'vector'::text AS leg, l.score, l.rnk, vector_weight AS w FROM vec l
+        UNION ALL
+        SELECT l.id, 'exact_ilike', l.score, l.rnk, ilike_weight FROM ilk l
+        UNION ALL
+        SELECT l.id, 'fts', l.score, l.rnk, fts_weight FROM fts l
+        UNION ALL
+        SELECT l.id, 'trigram', l.score, l.rnk, trgm_weight FROM trg l
+    ),
+    scored AS (
+        SELECT legs.id,
+               legs.leg,
+               legs.score,
+               CASE WHEN fusion = 'rrf'
+                    THEN legs.w / (rrf_k + legs.rnk)
+                    ELSE legs.score * legs.w  -- 파이썬 병합과 동일: 레그별 score × weight
+               END AS contrib
+        FROM legs
+    ),
+    fused AS (
+        SELECT s.id,
+               max(s.score) FILTER (WHERE s.leg = 'vector')      AS vector_score,
+               max(s.score) FILTER (WHERE s.leg = 'exact_ilike') AS ilike_score,
+               max(s.score) FILTER (WHERE s.leg = 'fts')         AS fts_score,
+               max(s.score) FILTER (WHERE s.leg = 'trigram')     AS trgm_score,
+               -- weighted: 같은 id 는 가장 높은 레그 점수 유지 (기존 중복 제거 규칙)
+               -- rrf: 레그별 기여도 합산
+               CASE WHEN fusion = 'rrf' THEN sum(s.contrib) ELSE max(s.contrib) END AS final_score,
+               (array_agg(s.leg ORDER BY s.contrib DESC))[1] AS search_type
+        FROM scored s
+        GROUP BY s.id
+    )
+    SELECT rbe.id,
+           rbe.title,
+           rbe.blob::text AS content,
+           rbe.ingredients,
+           rbe.allergens,
+           rbe.tags,
+           rbe.meal_type,
+           rbe.url,
+           f.vector_score,
+           f.ilike_score,
+           f.fts_score,
+           f.trgm_score,
+           f.final_score,
+           f.search_type
+    FROM fused f
+    JOIN recipe_blob_emb rbe ON rbe.id = f.id
+    WHERE exclude_title_terms IS NULL
+       OR NOT EXISTS (
+            SELECT 1 FROM unnest(exclude_title_terms) AS t(term)
+            WHERE t.term <> '' AND lower(rbe.title) LIKE '%' || lower(t.term) || '%'
+       )
+    ORDER BY f.final_score DESC
+    LIMIT match_count;
+$$;
+
+GRANT EXECUTE ON FUNCTION fused_recipe_search TO anon, authenticated;
+
+DO $$
+BEGIN
+    RAISE NOTICE '✅ fused_recipe_search 함수 생성 완료 (vector + ilike + fts + trgm 단일 호출)';
+END $$;
@@ -0,0 +1,192 @@
+-- =========================================================
+-- 레시피 재료 비트셋 (ingredient_mask)
+-- recipe_blob_emb 에 표준 재료 비트셋 컬럼을 추가하고
+-- fused_recipe_search 가 사용자 제외 마스크로 DB 안에서 바로 걸러내도록 재생성
+--
+-- 적용 순서:
+--   1. (선행) migrations/fused_recipe_search.sql
+--   2. 이 파일
+--   3. python scripts/build_ingredient_masks.py   -- 기존 레시피 마스크 채우기
+--   4. INGREDIENT_MASK_RPC_ENABLED=true            -- 백엔드에서 exclude_mask 전달 시작
+--
+-- 비트 배정은 backend/app/tools/meal/ingredient_bitset.py (동의어 사전 표준명 순서)
+-- ingredient_mask_vocab 이 요청의 mask_vocab 과 다른 행은 비트 필터를 건너뛰고
+-- 백엔드 문자열 매칭으로 판정한다 (사전 변경 후 재인덱싱 전에도 안전).
+-- =========================================================
+
+ALTER TABLE public.recipe_blob_emb
+    ADD COLUMN IF NOT EXISTS ingredient_mask bigint,
+    ADD COLUMN IF NOT EXISTS ingredient_mask_vocab text;
+
+-- 기존 오버로드 모두 삭제 후 재생성
+DO $$
+DECLARE
+    func_signature text;
+BEGIN
+    FOR func_signature IN
+        SELECT format('%s(%s)', p.proname, pg_get_function_identity_arguments(p.oid))
+        FROM pg_proc p
+        JOIN pg_namespace n ON p.pronamespace = n.oid
+        WHERE p.proname = 'fused_recipe_search'
+          AND n.nspname = 'public'
+    LOOP
+        EXECUTE format('DROP FUNCTION IF EXISTS %s', func_signature);
+    END LOOP;
+END $$;
+
+CREATE OR REPLACE FUNCTION fused_recipe_search(
+    query_text text,
+    query_embedding vector(1536) DEFAULT NULL,
+    match_count integer DEFAULT 300,        -- 최종 반환 개수
+    leg_count integer DEFAULT 1000,         -- 벡터 레그 후보 수 (기존 max_search_count)
+    meal_type_filter text DEFAULT NULL,
+    exclude_title_terms text[] DEFAULT NULL, -- 제목 부분문자열 제외 (알레르기/비선호 확장어)
+    vector_weight float DEFAULT 0.4,
+    ilike_weight float DEFAULT 0.35,
+    fts_weight float DEFAULT 0.3,
+    trgm_weight float DEFAULT 0.2,
+    fusion text DEFAULT 'weighted',         -- 'weighted' | 'rrf'
+    rrf_k integer DEFAULT 60,
+    text_leg_count integer DEFAULT 50,       -- ILIKE/FTS/Trigram 레그 후보 수
+    exclude_mask bigint DEFAULT NULL,        -- 사용자 제외 재료 비트셋 (ingredient_bitset.py)
+    mask_vocab text DEFAULT NULL             -- 제외 마스크의 vocab 버전 (다른 버전 마스크 행은 필터하지 않음)
+)
+RETURNS TABLE (
+    id uuid,
+    title text,
+    content text,
+    ingredients text[],
+    allergens text[],
+    tags text[],
+    meal_type text,
+    url text,
+    ingredient_mask bigint,
+    ingredient_mask_vocab text,
+    vector_score float,
+    ilike_score float,
+    fts_score float,
+    trgm_score float,
+    final_score float,
+    search_type text
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH vec AS (
+        SELECT rbe.id,
+               (1 - (rbe.embedding <=> query_embedding))::float AS score,
+               row_number() OVER (ORDER BY rbe.embedding <=> query_embedding) AS rnk
+        FROM recipe_blob_emb rbe
+        WHERE query_embedding IS NOT NULL
+          AND (meal_type_filter IS NULL OR rbe.meal_type = meal_type_filter)
+          AND (exclude_mask IS NULL OR rbe.ingredient_mask IS NULL
+               OR rbe.ingredient_mask_vocab IS DISTINCT FROM mask_vocab
+               OR (rbe.ingredient_mask & exclude_mask) = 0)
+        ORDER BY rbe.embedding <=> query_embedding
+        LIMIT leg_count
+    ),
+    ilk AS (
+        SELECT rbe.id,
+               1.0::float AS score,
+               row_number() OVER (
+                   ORDER BY CASE WHEN rbe.title ILIKE query_text THEN 1
+                                 WHEN rbe.title ILIKE query_text || '%' THEN 2
+                                 WHEN rbe.title ILIKE '%' || query_text THEN 3
+                                 ELSE 4 END
+               ) AS rnk
+        FROM recipe_blob_emb rbe
+        WHERE rbe.title ILIKE '%' || query_text || '%'
+          AND (exclude_mask IS NULL OR rbe.ingredient_mask IS NULL
+               OR rbe.ingredient_mask_vocab IS DISTINCT FROM mask_vocab
+               OR (rbe.ingredient_mask & exclude_mask) = 0)
+        LIMIT text_leg_count
+    ),
+    fts AS (
+        SELECT rbe.id,
+               ts_rank(to_tsvector('korean', rbe.title), plainto_tsquery('korean', query_text))::float AS score,
+               row_number() OVER (
+                   ORDER BY ts_rank(to_tsvector('korean', rbe.title), plainto_tsquery('korean', query_text)) DESC
+               ) AS rnk
+        FROM recipe_blob_emb rbe
+        WHERE to_tsvector('korean', rbe.title) @@ plainto_tsquery('korean', query_text)
+          AND (exclude_mask IS NULL OR rbe.ingredient_mask IS NULL
+               OR rbe.ingredient_mask_vocab IS DISTINCT FROM mask_vocab
+               OR (rbe.ingredient_mask & exclude_mask) = 0)
+        LIMIT text_leg_count
+    ),
+    trg AS (
+        SELECT rbe.id,
+               similarity(rbe.title, query_text)::float AS score,
+               row_number() OVER (ORDER BY similarity(rbe.title, query_text) DESC) AS rnk
+        FROM recipe_blob_emb rbe
+        WHERE similarity(rbe.title, query_text) > 0.3
+          AND (exclude_mask IS NULL OR rbe.ingredient_mask IS NULL
+               OR rbe.ingredient_mask_vocab IS DISTINCT FROM mask_vocab
+               OR (rbe.ingredient_mask & exclude_mask) = 0)
+        LIMIT text_leg_count
+    ),
+    legs AS (
+        SELECT l.id, 'vector'::text AS leg, l.score, l.rnk, vector_weight AS w FROM vec l
+        UNION ALL
+        SELECT l.id, 'exact_ilike', l.score, l.rnk, ilike_weight FROM ilk l
+        UNION ALL
+        SELECT l.id, 'fts', l.score, l.rnk, fts_weight FROM fts l
+        UNION ALL
+        SELECT l.id, 'trigram', l.score, l.rnk, trgm_weight FROM trg l
+    ),
+    scored AS (
+        SELECT legs.id,
+               legs.leg,
+               legs.score,
+               CASE WHEN fusion = 'rrf'
+                    THEN legs.w / (rrf_k + legs.rnk)
+                    ELSE legs.score * legs.w  -- 파이썬 병합과 동일: 레그별 score × weight
+               END AS contrib
+        FROM legs
+    ),
+    fused AS (
+        SELECT s.id,
+               max(s.score) FILTER (WHERE s.leg = 'vector')      AS vector_score,
+               max(s.score) FILTER (WHERE s.leg = 'exact_ilike') AS ilike_score,
+               max(s.score) FILTER (WHERE s.leg = 'fts')         AS fts_score,
+               max(s.score) FILTER (WHERE s.leg = 'trigram')     AS trgm_score,
+               -- weighted: 같은 id 는 가장 높은 레그 점수 유지 (기존 중복 제거 규칙)
+               -- rrf: 레그별 기여도 합산
+               CASE WHEN fusion = 'rrf' THEN sum(s.contrib) ELSE max(s.contrib) END AS final_score,
+               (array_agg(s.leg ORDER BY s.contrib DESC))[1] AS search_type
+        FROM scored s
+        GROUP BY s.id
+    )
+    SELECT rbe.id,
+           rbe.title,
+           rbe.blob::text AS content,
+           rbe.ingredients,
+           rbe.allergens,
+           rbe.tags,
+           rbe.meal_type,
+           rbe.url,
+           rbe.ingredient_mask,
+           rbe.ingredient_mask_vocab,
+           f.vector_score,
+           f.ilike_score,
+           f.fts_score,
+           f.trgm_score,
+           f.final_score,
+           f.search_type
+    FROM fused f
+    JOIN recipe_blob_emb rbe ON rbe.id = f.id
+    WHERE exclude_title_terms IS NULL
+       OR NOT EXISTS (
+            SELECT 1 FROM unnest(exclude_title_terms) AS t(term)
+            WHERE t.term <> '' AND lower(rbe.title) LIKE '%' || lower(t.term) || '%'
+       )
+    ORDER BY f.final_score DESC
+    LIMIT match_count;
+$$;
+
+GRANT EXECUTE ON FUNCTION fused_recipe_search TO anon, authenticated;
+
+DO $$
+BEGIN
+    RAISE NOTICE '✅ ingredient_mask 컬럼 + fused_recipe_search(exclude_mask) 재생성 완료';
+END $$;
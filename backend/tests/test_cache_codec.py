@@ -0,0 +1,94 @@
+"""캐시 값 코덱 인코딩/디코딩 테스트"""
+
+import json
+import zlib
+
+import pytest
+
+from app.core import cache_codec
+from app.core.cache_codec import FLAG_ZLIB, MAGIC, VECTOR_MIN_DIM, decode, encode
+
+
+def _header(data: bytes):
+    return data[0], chr(data[1]), data[2]
+
+
+def test_vector_round_trip_uses_float32():
+    vector = [i / 8 for i in range(VECTOR_MIN_DIM)]  # float32 로 정확히 표현되는 값
+    data = encode(vector, compress_threshold=0)
+
+    assert _header(data) == (MAGIC, "v", 0)
+    assert len(data) == 3 + 4 * VECTOR_MIN_DIM
+    assert decode(data) == vector
+
+
+def test_short_float_list_keeps_precision():
+    scores = [0.1, 0.2, 0.3]
+    assert decode(encode(scores)) == scores
+    assert chr(encode(scores)[1]) != "v"
+
+
+def test_dict_round_trip():
+    value = {"title": "키토 샐러드", "tags": ["저탄수", "고지방"], "kcal": 420, "nested": {"ok": True}}
+    data = encode(value)
+
+    assert data[0] == MAGIC
+    assert decode(data) == value
+
+
+def test_json_fallback_without_msgpack(monkeypatch):
+    monkeypatch.setattr(cache_codec, "msgpack", None)
+    value = {"a": [1, 2, 3]}
+    data = encode(value)
+
+    assert chr(data[1]) == "j"
+    assert decode(data) == value
+
+
+def test_forced_codec():
+    data = encode({"a": 1}, codec="json")
+    assert chr(data[1]) == "j"
+    assert json.loads(data[3:].decode("utf-8")) == {"a": 1}
+
+
+def test_large_payload_is_compressed():
+    value = {"text": "키토" * 5000}
+    data = encode(value, compress_threshold=1024)
+
+    assert data[2] & FLAG_ZLIB
+    assert len(data) < len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+    assert decode(data) == value
+
+
+def test_compression_disabled():
+    data = encode({"text": "a" * 10000}, compress_threshold=0)
+    assert not data[2] & FLAG_ZLIB
+
+
+def test_incompressible_payload_stays_raw():
+    noise = zlib.compress(bytes(range(256)) * 4).hex()  # 압축해도 작아지지 않는 값
+    data = encode(noise, codec="json", compress_threshold=16)
+    assert decode(data) == noise
+
+
+def test_legacy_json_values():
+    value = {"title": "기존 값", "items": [1, 2]}
+    legacy = json.dumps(value, ensure_ascii=False)
+
+    assert decode(legacy) == value
+    assert decode(legacy.encode("utf-8")) == value
+    assert decode(None) is None
+
+
+def test_unknown_codec_id():
+    with pytest.raises(ValueError):
+        decode(bytes((MAGIC, ord("?"), 0)) + b"payload")
+
+
+def test_register_codec_rejects_duplicate_id():
+    class Duplicate(cache_codec.Codec):
+        codec_id = ord("j")
+        name = "duplicate"
+
+    with pytest.raises(ValueError):
+        cache_codec.register_codec(Duplicate())
@@ -0,0 +1,73 @@
+"""캐시 키 생성 (정규화/안정 해시/네임스페이스 버전) 테스트"""
+
+import os
+import subprocess
+import sys
+import unicodedata
+from pathlib import Path
+
+from app.core import cache_keys
+from app.core.cache_keys import (
+    _load_overrides, bump_namespace, digest, make_key, namespace_version, normalize_terms, normalize_text,
+)
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def test_normalize_text():
+    decomposed = unicodedata.normalize("NFD", "강")
+    assert normalize_text(f"  {decomposed}남   맛집\n") == "강남 맛집"
+    assert normalize_text("KETO  Salad") == "keto salad"
+    assert normalize_text(None) == ""
+
+
+def test_normalize_terms_ignores_order_case_and_duplicates():
+    assert normalize_terms(["새우", "Egg", " egg ", "", None, "새우"]) == ["egg", "새우"]
+    assert normalize_terms(None) == []
+
+
+def test_digest_is_order_independent_for_dict_fields():
+    assert digest({"a": 1, "b": 2}) == digest({"b": 2, "a": 1})
+    assert digest("a", "b") != digest("b", "a")
+    assert len(digest("x")) == 32
+    assert len(digest("x", length=16)) == 16
+
+
+def test_make_key_format_and_fields():
+    key = make_key("search", "버터", k=5, allergies=["새우"])
+    namespace, version, key_digest = key.split(":")
+
+    assert namespace == "search"
+    assert version == namespace_version("search")
+    assert len(key_digest) == 32
+    assert key == make_key("search", "버터", allergies=["새우"], k=5)
+    assert key != make_key("search", "버터", k=6, allergies=["새우"])
+
+
+def test_make_key_is_stable_across_processes():
+    # 내장 hash() 와 달리 PYTHONHASHSEED 가 달라도 같은 키
+    code = "from app.core.cache_keys import make_key; print(make_key('intent', '키토 식단', k=3))"
+    keys = set()
+    for seed in ("1", "2"):
+        env = {**os.environ, "PYTHONHASHSEED": seed, "PYTHONPATH": str(BACKEND_DIR)}
+        env.pop("CACHE_KEY_VERSION", None)
+        env.pop("CACHE_NAMESPACE_VERSIONS", None)
+        output = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=env,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        keys.add(output)
+    assert len(keys) == 1
+
+
+def test_bump_namespace_changes_keys(monkeypatch):
+    monkeypatch.setitem(cache_keys.NAMESPACE_VERSIONS, "search", 2)
+    before = make_key("search", "버터")
+
+    bump_namespace("search")
+
+    assert cache_keys.NAMESPACE_VERSIONS["search"] == 3
+    assert make_key("search", "버터") != before
+
+
+def test_load_overrides():
+    assert _load_overrides("search=2, query_emb=3,bad,x=,=4,y=z") == {"search": 2, "query_emb": 3}
+    assert _load_overrides("") == {}
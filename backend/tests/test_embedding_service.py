@@ -0,0 +1,96 @@
+"""EmbeddingService 요청 병합(coalescing) 취소 전파 / 로컬 저장소 조회 테스트"""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.embedding_service import EmbeddingService
+
+
+def _service_with_blocking_client(release: asyncio.Event) -> EmbeddingService:
+    service = EmbeddingService(model="test-model", batch_window=0.01, cache_ttl=0, store=None)
+
+    class FakeEmbeddings:
+        async def create(self, model, input):
+            await release.wait()
+            return SimpleNamespace(data=[
+                SimpleNamespace(index=i, embedding=[float(len(text)), 1.0]) for i, text in enumerate(input)
+            ])
+
+    service._get_client = lambda: SimpleNamespace(embeddings=FakeEmbeddings())
+    return service
+
+
+def test_cancelling_one_coalesced_caller_keeps_the_other():
+    async def scenario():
+        release = asyncio.Event()
+        service = _service_with_blocking_client(release)
+
+        first = asyncio.create_task(service.embed("hello"))
+        second = asyncio.create_task(service.embed("hello"))
+        await asyncio.sleep(0.05)  # 배치 전송 후 두 호출 모두 같은 Future 대기
+        assert service.coalesced == 1
+
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == [5.0, 1.0]
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert service.api_calls == 1
+
+    asyncio.run(scenario())
+
+
+def test_wait_for_timeout_does_not_break_other_waiters():
+    async def scenario():
+        release = asyncio.Event()
+        service = _service_with_blocking_client(release)
+
+        waiter = asyncio.create_task(service.embed("hello"))
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(service.embed("hello"), timeout=0.05)
+        release.set()
+
+        assert await waiter == [5.0, 1.0]
+
+    asyncio.run(scenario())
+
+
+def test_store_lookup_runs_off_the_event_loop():
+    class SlowStore:
+        def __init__(self):
+            self.threads = []
+
+        def get_many(self, model, texts):
+            # put_many 가 저장소 락을 잡고 있는 상황 흉내
+            self.threads.append(threading.get_ident())
+            threading.Event().wait(0.1)
+            return [[1.0, 2.0] for _ in texts]
+
+        def stats(self):
+            return {}
+
+    async def scenario():
+        store = SlowStore()
+        service = EmbeddingService(model="test-model", cache_ttl=0, store=store)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        assert await service.embed("hello") == [1.0, 2.0]
+        ticking.cancel()
+
+        assert store.threads and store.threads[0] != threading.get_ident()
+        assert ticks >= 3
+        assert service.store_hits == 1
+
+    asyncio.run(scenario())
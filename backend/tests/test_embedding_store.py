@@ -0,0 +1,41 @@
+"""로컬 임베딩 저장소 행 수 상한 / 세대 재구축 테스트"""
+
+from app.core.embedding_store import EmbeddingStore
+
+
+def _vectors(*texts):
+    return {text: [float(len(text)), float(i)] for i, text in enumerate(texts)}
+
+
+def test_round_trip_without_cap(tmp_path):
+    store = EmbeddingStore(str(tmp_path))
+
+    assert store.put_many("m", _vectors("a", "bb")) == 2
+    assert store.get_many("m", ["a", "bb", "ccc"]) == [[1.0, 0.0], [2.0, 1.0], None]
+
+
+def test_rebuilds_when_max_rows_exceeded(tmp_path):
+    store = EmbeddingStore(str(tmp_path), max_rows=3)
+    store.put_many("m", _vectors("a", "bb", "ccc"))
+
+    assert store.put_many("m", _vectors("dddd")) == 1
+
+    assert store.get_many("m", ["a", "dddd"]) == [None, [4.0, 0.0]]
+    assert store.stats()["rebuilds"] == 1
+    assert store.stats()["models"] == {"m": 1}
+    # 이전 세대 파일은 삭제되어 디스크 사용량도 상한 안에 머묾
+    assert sorted(p.name for p in tmp_path.glob("m*.f32")) == ["m.1.f32"]
+
+
+def test_other_worker_follows_new_generation(tmp_path):
+    writer = EmbeddingStore(str(tmp_path), max_rows=2)
+    reader = EmbeddingStore(str(tmp_path), max_rows=2)
+    writer.put_many("m", _vectors("a", "bb"))
+    assert reader.get_many("m", ["a"]) == [[1.0, 0.0]]
+
+    writer.put_many("m", _vectors("ccc"))
+
+    assert reader.get_many("m", ["ccc", "a"]) == [[3.0, 0.0], None]
+    # 재구축을 모르는 워커가 써도 현재 세대에 추가됨
+    assert reader.put_many("m", _vectors("x")) == 1
+    assert writer.get_many("m", ["x"]) == [[1.0, 0.0]]
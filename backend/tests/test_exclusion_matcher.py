@@ -0,0 +1,82 @@
+"""알레르기/비선호 제외 매처 테스트 (기존 토큰/부분문자열 규칙과 동일한 판정인지 확인)"""
+
+import random
+import re
+
+from app.tools.meal.exclusion_matcher import get_matcher
+
+TERMS = ["새우", "egg", "계란", "sesame oil", "땅콩", "milk"]
+
+
+def _legacy_tokens(text):
+    # KoreanSearchTool._tokenize_ingredients
+    return [t.strip() for t in re.split(r'[,\s\(\)\[\]\{\}/]+', text.lower()) if t.strip()]
+
+
+def _legacy_ingredient_match(text, terms):
+    # 기존 KoreanSearchTool._exact_match_filter
+    if not text or not terms:
+        return False
+    tokens = _legacy_tokens(text)
+    for banned in terms:
+        banned = banned.lower()
+        if banned in tokens:
+            return True
+        if ' ' in banned and banned in text.lower():
+            return True
+    return False
+
+
+def _legacy_excluded(title, ingredients, terms):
+    title_lower = title.lower()
+    if _legacy_ingredient_match(title, terms) or any(t.lower() in title_lower for t in terms):
+        return True
+    return any(_legacy_ingredient_match(ing, terms) for ing in ingredients)
+
+
+def _excluded(title, ingredients, terms):
+    matcher = get_matcher(terms)
+    return bool(matcher.match_title(title) or matcher.match_ingredients(ingredients))
+
+
+def test_title_matches_substring():
+    matcher = get_matcher(TERMS)
+    assert matcher.match_title("계란샐러드") == "계란"
+    assert matcher.match_title("Egg Muffin") == "egg"
+    assert matcher.match_title("버터 스테이크") is None
+
+
+def test_ingredients_match_whole_tokens_only():
+    matcher = get_matcher(TERMS)
+    assert matcher.match_ingredients(["올리브유", "새우(중하)"]) == "새우(중하)"
+    assert matcher.match_ingredients(["eggplant", "새우젓갈"]) is None
+    assert matcher.match_ingredients(["toasted sesame oil 1T"]) == "toasted sesame oil 1T"
+    assert matcher.match_ingredients(["우유/MILK"]) == "우유/MILK"
+    assert matcher.match_ingredients([]) is None
+
+
+def test_empty_terms():
+    matcher = get_matcher([])
+    assert not matcher
+    assert matcher.match_title("계란말이") is None
+    assert matcher.match_ingredients(["계란"]) is None
+
+
+def test_matcher_is_cached_per_term_set():
+    assert get_matcher(["b", "a"]) is get_matcher(["a", "b", "a"])
+
+
+def test_same_decisions_as_legacy_rules():
+    rng = random.Random(0)
+    words = ["새우", "새우젓", "egg", "eggplant", "계란", "계란말이", "sesame", "oil", "sesame oil",
+             "땅콩버터", "땅콩", "milk", "우유", "버터", "아보카도", "올리브유", "MILK"]
+    separators = [" ", ", ", "/", "(", ")", " [", "]", ""]
+    for _ in range(2000):
+        title = "".join(rng.choice(words) + rng.choice(separators) for _ in range(rng.randint(1, 3)))
+        ingredients = [
+            "".join(rng.choice(words) + rng.choice(separators) for _ in range(rng.randint(1, 3)))
+            for _ in range(rng.randint(0, 4))
+        ]
+        terms = rng.sample(TERMS, rng.randint(0, len(TERMS)))
+        assert _excluded(title, ingredients, terms) == _legacy_excluded(title, ingredients, terms), (
+            title, ingredients, terms)
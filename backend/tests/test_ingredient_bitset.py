@@ -0,0 +1,99 @@
+"""레시피 재료 비트셋 (재료 마스크 / 제외 마스크) 테스트"""
+
+import random
+
+from app.tools.meal.exclusion_matcher import get_matcher
+from app.tools.meal.ingredient_bitset import MAX_BITS, IngredientVocabulary
+
+SYNONYMS = {
+    "알레르기": {"새우": ["대하", "shrimp"], "땅콩": ["peanut", "땅콩버터"], "계란": ["달걀", "egg"]},
+    "비선호": {"오이": ["백오이"], "계란": ["메추리알"]},
+}
+
+
+def _recipe(vocab, title, ingredients):
+    return {
+        "title": title,
+        "ingredients": ingredients,
+        "ingredient_mask": vocab.recipe_mask(title, ingredients),
+        "ingredient_mask_vocab": vocab.version,
+    }
+
+
+def test_bits_follow_dictionary_order_without_duplicates():
+    vocab = IngredientVocabulary(SYNONYMS)
+    assert vocab.bits == {"새우": 0, "땅콩": 1, "계란": 2, "오이": 3}
+
+
+def test_recipe_mask_from_title_and_ingredients():
+    vocab = IngredientVocabulary(SYNONYMS)
+    mask = vocab.recipe_mask("달걀 오이무침", [{"name": "대하"}, "참기름", None, {"name": None}])
+
+    assert mask == (1 << vocab.bits["새우"]) | (1 << vocab.bits["계란"]) | (1 << vocab.bits["오이"])
+    assert vocab.recipe_mask(None, None) == 0
+
+
+def test_exclusion_mask_maps_synonyms_and_keeps_unmapped_terms():
+    vocab = IngredientVocabulary(SYNONYMS)
+    exclusion = vocab.exclusion_mask(["Shrimp", "메추리알", "고수", " ", None])
+
+    assert exclusion.mask == (1 << vocab.bits["새우"]) | (1 << vocab.bits["계란"])
+    assert exclusion.unmapped == ("고수",)
+
+
+def test_check_results():
+    vocab = IngredientVocabulary(SYNONYMS)
+    shrimp_recipe = _recipe(vocab, "새우 볶음", ["대하", "버터"])
+    plain_recipe = _recipe(vocab, "버터 스테이크", ["소고기", "버터"])
+
+    mapped = vocab.exclusion_mask(["새우"])
+    assert mapped.check(shrimp_recipe) is True
+    assert mapped.check(plain_recipe) is False
+
+    # 사전에 없는 단어가 섞이면 통과는 확정하지 못함 (문자열 매칭 폴백)
+    partly_mapped = vocab.exclusion_mask(["새우", "고수"])
+    assert partly_mapped.check(shrimp_recipe) is True
+    assert partly_mapped.check(plain_recipe) is None
+
+
+def test_missing_or_stale_mask_falls_back():
+    vocab = IngredientVocabulary(SYNONYMS)
+    exclusion = vocab.exclusion_mask(["새우"])
+
+    assert exclusion.check({"title": "새우 볶음"}) is None
+    stale = _recipe(vocab, "새우 볶음", ["대하"])
+    stale["ingredient_mask_vocab"] = "old"
+    assert exclusion.check(stale) is None
+
+
+def test_version_changes_with_vocabulary():
+    changed = {**SYNONYMS, "비선호": {**SYNONYMS["비선호"], "가지": []}}
+    assert IngredientVocabulary(SYNONYMS).version == IngredientVocabulary(SYNONYMS).version
+    assert IngredientVocabulary(changed).version != IngredientVocabulary(SYNONYMS).version
+
+
+def test_bits_are_capped_for_bigint():
+    data = {"알레르기": {f"재료{i}": [] for i in range(MAX_BITS + 10)}}
+    vocab = IngredientVocabulary(data)
+
+    assert len(vocab.bits) == MAX_BITS
+    assert vocab.exclusion_mask([f"재료{MAX_BITS + 1}"]).unmapped == (f"재료{MAX_BITS + 1}",)
+    assert vocab.recipe_mask(f"재료{MAX_BITS - 1}", []) < 1 << MAX_BITS
+
+
+def test_same_decisions_as_string_matching():
+    vocab = IngredientVocabulary(SYNONYMS)
+    groups = {"새우": ["새우", "대하", "shrimp"], "땅콩": ["땅콩", "peanut", "땅콩버터"],
+              "계란": ["계란", "달걀", "egg", "메추리알"], "오이": ["오이", "백오이"]}
+    words = [w for terms in groups.values() for w in terms] + ["버터", "소고기", "eggplant", "오이지", "아보카도"]
+    rng = random.Random(0)
+    for _ in range(1000):
+        title = " ".join(rng.sample(words, rng.randint(1, 2)))
+        ingredients = rng.sample(words, rng.randint(0, 3))
+        canonicals = rng.sample(list(groups), rng.randint(1, len(groups)))
+
+        expanded = [term for canonical in canonicals for term in groups[canonical]]
+        matcher = get_matcher(expanded)
+        expected = bool(matcher.match_title(title) or matcher.match_ingredients(ingredients))
+        assert vocab.exclusion_mask(canonicals).check(_recipe(vocab, title, ingredients)) is expected, (
+            title, ingredients, canonicals)
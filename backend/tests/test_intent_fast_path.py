@@ -0,0 +1,125 @@
+"""의도 빠른 분류 (해시 n-gram 모델 / 임계값 보정 / 교차검증 / 저장·로드) 테스트"""
+
+import numpy as np
+import pytest
+
+from app.core import intent_classifier as intent_classifier_module
+from app.core import intent_fast_path
+from app.core.intent_fast_path import (
+    FEATURE_DIM, FastIntentModel, calibrate_threshold, cross_validate, featurize,
+)
+
+EXAMPLES = [
+    ("키토 레시피 알려줘", "recipe_search"),
+    ("버터 스테이크 레시피", "recipe_search"),
+    ("아보카도 샐러드 조리법", "recipe_search"),
+    ("연어 스테이크 만드는 법 레시피", "recipe_search"),
+    ("강남 키토 식당 찾아줘", "place_search"),
+    ("근처 저탄수 맛집 추천", "place_search"),
+    ("홍대 근처 키토 식당", "place_search"),
+    ("집 주변 맛집 알려줘", "place_search"),
+    ("안녕 반가워", "general"),
+    ("고마워 도움이 됐어", "general"),
+    ("오늘 기분 어때", "general"),
+    ("안녕 잘 지냈어", "general"),
+]
+
+
+@pytest.fixture
+def model():
+    return FastIntentModel.train(EXAMPLES, epochs=200, threshold=0.5)
+
+
+def test_featurize_is_deterministic_and_normalized():
+    indices, values = featurize("  키토  레시피 ")
+    again_indices, again_values = featurize("키토 레시피")
+
+    assert np.array_equal(indices, again_indices)
+    assert np.allclose(values, again_values)
+    assert np.linalg.norm(values) == pytest.approx(1.0, abs=1e-6)
+    assert indices.max() < FEATURE_DIM
+    assert featurize("")[0].size == 0
+
+
+def test_trained_model_fits_training_examples(model):
+    for text, label in EXAMPLES:
+        predicted, confidence = model.predict(text)
+        assert predicted == label
+        assert 0.0 < confidence <= 1.0
+    assert model.predict_proba("레시피").sum() == pytest.approx(1.0, abs=1e-5)
+
+
+def test_save_and_load_round_trip(model, tmp_path):
+    path = tmp_path / "intent.npz"
+    model.metrics = {"cv_accepted_accuracy": 0.97}
+    model.save(path)
+
+    loaded = FastIntentModel.load(path)
+
+    assert loaded.labels == model.labels
+    assert loaded.threshold == pytest.approx(model.threshold)
+    assert loaded.metrics == {"cv_accepted_accuracy": 0.97}
+    assert loaded.predict("버터 스테이크 레시피")[0] == "recipe_search"
+
+
+def test_load_rejects_missing_or_other_feature_version(model, tmp_path, monkeypatch):
+    assert FastIntentModel.load(tmp_path / "missing.npz") is None
+
+    path = tmp_path / "intent.npz"
+    model.save(path)
+    monkeypatch.setattr(intent_fast_path, "FEATURE_VERSION", intent_fast_path.FEATURE_VERSION + 1)
+    assert FastIntentModel.load(path) is None
+
+
+def test_calibrate_threshold_picks_lowest_threshold_meeting_precision():
+    confidences = [0.9, 0.8, 0.7, 0.6, 0.5, 0.4]
+    correct = [True, True, True, True, False, False]
+
+    assert calibrate_threshold(confidences, correct, target_precision=1.0, min_support=2) == 0.6
+    assert calibrate_threshold(confidences, correct, target_precision=0.8, min_support=2) == 0.5
+    # 조건을 만족하는 임계값이 없으면 1.0 초과 → 빠른 경로 미사용
+    assert calibrate_threshold(confidences, correct, target_precision=1.0, min_support=10) > 1.0
+
+
+def test_calibrate_threshold_does_not_split_ties():
+    # 0.7 묶음 안에 오답이 있으면 묶음 전체를 포함하거나 제외해야 함
+    confidences = [0.9, 0.9, 0.7, 0.7]
+    correct = [True, True, True, False]
+    assert calibrate_threshold(confidences, correct, target_precision=1.0, min_support=1) == 0.9
+
+
+def test_cross_validate_predicts_every_example_out_of_fold():
+    predictions = cross_validate(EXAMPLES, folds=4, epochs=50)
+
+    assert len(predictions) == len(EXAMPLES)
+    assert [expected for expected, _, _ in predictions] == [label for _, label in EXAMPLES]
+    assert all(0.0 < confidence <= 1.0 for _, _, confidence in predictions)
+
+
+def _classifier_with(monkeypatch, model):
+    monkeypatch.setattr(intent_classifier_module, "fast_intent_model", model)
+    monkeypatch.setattr(intent_classifier_module.settings, "intent_fast_path_enabled", True, raising=False)
+    return intent_classifier_module.IntentClassifier.__new__(intent_classifier_module.IntentClassifier)
+
+
+def test_fast_path_reports_model_probability(monkeypatch, model):
+    model.metrics = {"cv_accepted_accuracy": 0.99}
+    model.threshold = 0.0
+    classifier = _classifier_with(monkeypatch, model)
+
+    result = classifier._fast_path_classify("버터 스테이크 레시피")
+    _, probability = model.predict("버터 스테이크 레시피")
+
+    assert result["intent"].value == "recipe_search"
+    assert result["confidence"] == pytest.approx(probability)
+    assert result["cv_accepted_accuracy"] == 0.99
+    assert result["method"] == "fast_path"
+
+
+def test_fast_path_below_threshold_or_disabled(monkeypatch, model):
+    model.threshold = 1.01
+    classifier = _classifier_with(monkeypatch, model)
+    assert classifier._fast_path_classify("버터 스테이크 레시피") is None
+
+    monkeypatch.setattr(intent_classifier_module, "fast_intent_model", None)
+    assert classifier._fast_path_classify("버터 스테이크 레시피") is None
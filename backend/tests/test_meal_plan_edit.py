@@ -0,0 +1,77 @@
+"""
+식단 부분 수정 요청 파싱 / 이전 식단이 없을 때 파싱 생략 확인
+"""
+
+import asyncio
+
+from app.agents.meal_planner import MAX_MEAL_PLAN_DAYS, MealPlannerAgent
+from app.tools.shared.temporary_dislikes_extractor import temp_dislikes_extractor
+
+
+def _make_agent() -> MealPlannerAgent:
+    # LLM/검색 도구 초기화 없이 파싱에 필요한 속성만 설정
+    agent = MealPlannerAgent.__new__(MealPlannerAgent)
+    agent.temp_dislikes_extractor = temp_dislikes_extractor
+    return agent
+
+
+def test_day_and_slot_edit():
+    edit = _make_agent()._parse_plan_edit("3일차 저녁 바꿔줘")
+
+    assert edit == {"targets": [(2, "dinner")], "temp_dislikes": []}
+
+
+def test_slot_across_all_days():
+    edit = _make_agent()._parse_plan_edit("저녁 전부 다른 걸로")
+
+    assert edit["targets"] == [(day_idx, "dinner") for day_idx in range(MAX_MEAL_PLAN_DAYS)]
+    assert edit["temp_dislikes"] == []
+
+
+def test_new_temporary_dislike_only():
+    edit = _make_agent()._parse_plan_edit("오이 빼줘")
+
+    assert edit == {"targets": [], "temp_dislikes": ["오이"]}
+
+
+def test_new_plan_request_is_not_an_edit():
+    assert _make_agent()._parse_plan_edit("식단표 만들어줘") is None
+
+
+def test_edit_skips_parsing_without_previous_plan():
+    agent = _make_agent()
+
+    async def no_previous_plan(state):
+        return None
+
+    def fail_parse(message):
+        raise AssertionError("이전 식단이 없으면 파싱하지 않아야 함")
+
+    agent._load_previous_plan = no_previous_plan
+    agent._parse_plan_edit = fail_parse
+
+    result = asyncio.run(agent._handle_meal_plan_edit("3일차 저녁 바꿔줘", {"thread_id": "t1"}, {}))
+
+    assert result is None
+
+
+def test_duration_or_generation_request_is_a_new_plan():
+    agent = _make_agent()
+
+    for message in (
+        "오이 빼고 3일치 만들어줘",
+        "오이 말고 5일 메뉴 추천해줘",
+        "오이 빼고 하루 식단",
+        "오이 말고 이틀치 짜줘",
+        "오이 빼고 일주일 식단",
+        "오이 말고 추천해줘",
+        "오이 빼고 다시 짜줘",
+        "3일간 저녁 바꿔줘",
+    ):
+        assert agent._parse_plan_edit(message) is None, message
+
+
+def test_day_index_is_not_a_duration():
+    edit = _make_agent()._parse_plan_edit("3일차 저녁 다른 메뉴 추천해줘")
+
+    assert edit == {"targets": [(2, "dinner")], "temp_dislikes": []}
@@ -0,0 +1,210 @@
+"""L1 메모리 캐시 (LRU/TTL/바이트 예산) + Redis 히트 시 L1 채움 테스트"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import cache_codec
+from app.core import memory_cache as memory_cache_module
+from app.core.memory_cache import MemoryCache, estimate_size
+from app.core.redis_cache import RedisCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(memory_cache_module, "time", fake)
+    return fake
+
+
+def test_get_set_and_none_values(clock):
+    cache = MemoryCache(sweep_interval=0)
+    assert cache.get("a") == (False, None)
+
+    cache.set("a", {"x": 1}, ttl=10)
+    cache.set("none", None, ttl=10)
+
+    assert cache.get("a") == (True, {"x": 1})
+    assert cache.get("none") == (True, None)
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 1
+
+
+def test_ttl_expiry(clock):
+    cache = MemoryCache(sweep_interval=0)
+    cache.set("a", 1, ttl=10)
+
+    clock.now += 9.9
+    assert "a" in cache
+    clock.now += 0.1
+    assert cache.get("a") == (False, None)
+    assert cache.expirations == 1
+    assert len(cache) == 0
+
+
+def test_lru_eviction_by_entries(clock):
+    cache = MemoryCache(max_entries=2, sweep_interval=0)
+    cache.set("a", 1, ttl=10)
+    cache.set("b", 2, ttl=10)
+    cache.get("a")  # a 를 최근 사용으로
+    cache.set("c", 3, ttl=10)
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert cache.evictions == 1
+
+
+def test_byte_budget(clock):
+    value = "x" * 1000
+    size = estimate_size(value)
+    cache = MemoryCache(max_bytes=size * 2, sweep_interval=0)
+    for key in ("a", "b", "c"):
+        cache.set(key, value, ttl=10)
+
+    assert len(cache) == 2
+    assert cache.stats()["bytes"] <= size * 2
+    assert "a" not in cache
+
+
+def test_oversize_value_is_rejected(clock):
+    cache = MemoryCache(max_bytes=100, sweep_interval=0)
+    cache.set("big", "small", ttl=10)
+
+    assert cache.set("big", "x" * 1000, ttl=10) is False
+    assert "big" not in cache  # 이전 값도 남기지 않음
+    assert cache.oversize_rejects == 1
+
+
+def test_sweep_expired(clock):
+    cache = MemoryCache(sweep_interval=0)
+    cache.set("short", 1, ttl=1)
+    cache.set("long", 2, ttl=100)
+    clock.now += 5
+
+    assert cache.sweep_expired() == 1
+    assert len(cache) == 1
+    assert cache.stats()["bytes"] == estimate_size(2)
+
+
+def test_estimate_size_counts_nested_values():
+    flat = estimate_size([])
+    nested = estimate_size([{"title": "키토 샐러드" * 10}])
+    assert nested > flat + estimate_size("키토 샐러드" * 10)
+
+
+# ---------- RedisCache L1 채움 ----------
+
+class FakePipeline:
+    """GET / PTTL / MGET 만 지원하는 파이프라인 (store: key → (raw, pttl))"""
+
+    def __init__(self, store):
+        self.store = store
+        self.ops = []
+
+    def get(self, key):
+        self.ops.append(("get", key))
+        return self
+
+    def pttl(self, key):
+        self.ops.append(("pttl", key))
+        return self
+
+    def mget(self, keys):
+        self.ops.append(("mget", keys))
+        return self
+
+    def _results(self):
+        results = []
+        for op, arg in self.ops:
+            if op == "get":
+                results.append(self.store.get(arg, (None, -2))[0])
+            elif op == "pttl":
+                results.append(self.store.get(arg, (None, -2))[1])
+            else:
+                results.append([self.store.get(key, (None, -2))[0] for key in arg])
+        return results
+
+    def execute(self):
+        return self._results()
+
+
+class FakeAsyncPipeline(FakePipeline):
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self):
+        return self._results()
+
+
+@pytest.fixture
+def redis_store(clock):
+    store = {
+        "recipe:1": (cache_codec.encode({"title": "버터 스테이크"}), 5_000),   # 5초 남음
+        "recipe:2": (cache_codec.encode(["a", "b"]), -1),                   # 만료 없음
+    }
+    cache = RedisCache()
+    cache.memory_cache = MemoryCache(sweep_interval=0)
+    cache.backfill_ttl = 300
+    cache.enabled = True
+    cache.redis_client = SimpleNamespace(pipeline=lambda transaction=False: FakePipeline(store))
+    cache._get_async_client = lambda: SimpleNamespace(pipeline=lambda transaction=False: FakeAsyncPipeline(store))
+    return cache, store
+
+
+def _l1_ttl(cache, key, clock):
+    return cache.memory_cache._data[key][1] - clock.now
+
+
+def test_get_backfills_l1_with_remaining_ttl(redis_store, clock):
+    cache, store = redis_store
+
+    assert cache.get("recipe:1") == {"title": "버터 스테이크"}
+    assert _l1_ttl(cache, "recipe:1", clock) == pytest.approx(5.0)
+
+    # 이후 조회는 Redis 를 거치지 않음
+    del store["recipe:1"]
+    assert cache.get("recipe:1") == {"title": "버터 스테이크"}
+    assert cache.redis_hits == 1
+
+
+def test_mget_backfills_persistent_keys_with_backfill_ttl(redis_store, clock):
+    cache, _ = redis_store
+
+    assert cache.mget(["recipe:2", "missing"]) == [["a", "b"], None]
+    assert _l1_ttl(cache, "recipe:2", clock) == pytest.approx(300)
+    assert "missing" not in cache.memory_cache
+    assert cache.redis_misses == 1
+
+
+def test_async_get_and_mget_backfill(redis_store, clock):
+    cache, store = redis_store
+
+    async def run():
+        first = await cache.aget("recipe:1")
+        many = await cache.amget(["recipe:1", "recipe:2"])
+        return first, many
+
+    first, many = asyncio.run(run())
+    assert first == {"title": "버터 스테이크"}
+    assert many == [{"title": "버터 스테이크"}, ["a", "b"]]
+    assert "recipe:1" in cache.memory_cache and "recipe:2" in cache.memory_cache
+    assert cache.redis_hits == 2  # recipe:1 두 번째 조회는 L1
+
+
+def test_expired_redis_key_is_not_backfilled(redis_store):
+    cache, _ = redis_store
+    cache._backfill("gone", 1, -2)
+    cache._backfill("zero", 1, 0)
+
+    assert len(cache.memory_cache) == 0
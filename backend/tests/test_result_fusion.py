@@ -0,0 +1,112 @@
+"""검색 결과 융합 (중복 제거 / 상위 k / 레그 가중 융합) 테스트"""
+
+import random
+
+import pytest
+
+from app.tools.shared.result_fusion import dedupe_best, fuse_leg_scores, fuse_top_k, top_k
+
+
+def _row(result_id, score, **extra):
+    return {"id": result_id, "score": score, **extra}
+
+
+def test_dedupe_keeps_first_position_and_best_score():
+    rows = [_row(1, 0.2, leg="a"), _row(2, 0.5), _row(1, 0.9, leg="b"), _row(None, 1.0), _row("", 1.0)]
+
+    deduped = dedupe_best(rows, score_key="score")
+
+    assert [r["id"] for r in deduped] == [1, 2]
+    assert deduped[0]["leg"] == "b"
+
+
+def test_dedupe_without_score_keeps_first_row():
+    rows = [_row(1, 0.2, leg="a"), _row(1, 0.9, leg="b")]
+    assert dedupe_best(rows)[0]["leg"] == "a"
+
+
+def test_top_k_matches_sorted_slice_including_ties():
+    rng = random.Random(0)
+    rows = [_row(i, rng.choice([0.1, 0.5, 0.5, 0.9, None])) for i in range(200)]
+    for k in (0, 1, 5, 50, 500):
+        expected = sorted(rows, key=lambda r: r["score"] or 0.0, reverse=True)[:k]
+        assert top_k(rows, k, "score") == expected
+
+
+def test_fuse_top_k_matches_legacy_loop():
+    rng = random.Random(1)
+    rows = [_row(rng.randint(0, 30), round(rng.random(), 2)) for _ in range(300)]
+
+    # 기존 방식: seen dict 로 최고 점수 유지 → 전체 정렬 → 슬라이스
+    best = {}
+    for row in rows:
+        key = str(row["id"])
+        if key not in best or row["score"] > best[key]["score"]:
+            best[key] = row
+    expected = sorted(best.values(), key=lambda r: r["score"], reverse=True)[:10]
+
+    assert fuse_top_k(rows, 10, "score") == expected
+
+
+def test_fuse_leg_scores_max_mode():
+    legs = {
+        "vector": [_row(1, 0.9, title="v1"), _row(2, 0.6, title="v2")],
+        "ilike": [_row(2, 1.0, title="i2"), _row(3, 0.4, title="i3")],
+        "empty": [],
+    }
+    fused = fuse_leg_scores(legs, {"vector": 1.0, "ilike": 0.8}, k=10, score_key="score")
+
+    assert [r["id"] for r in fused] == [1, 2, 3]
+    assert fused[0]["final_score"] == pytest.approx(0.9)
+    # 2번은 ilike 가중 점수(0.8)가 vector(0.6)보다 높음 → ilike 행과 레그를 사용
+    assert fused[1]["final_score"] == pytest.approx(0.8)
+    assert fused[1]["search_type"] == "ilike" and fused[1]["title"] == "i2"
+    assert fused[2]["final_score"] == pytest.approx(0.32)
+
+
+def test_fuse_leg_scores_sum_mode_and_k():
+    legs = {"vector": [_row(1, 0.5), _row(2, 0.6)], "fts": [_row(1, 0.5)]}
+    fused = fuse_leg_scores(legs, {"vector": 1.0, "fts": 1.0}, k=1, score_key="score", mode="sum")
+
+    assert len(fused) == 1
+    assert fused[0]["id"] == 1 and fused[0]["final_score"] == pytest.approx(1.0)
+
+
+def test_fuse_leg_scores_duplicate_ids_in_one_leg_keep_best():
+    legs = {"vector": [_row(1, 0.2, title="low"), _row(1, 0.7, title="high")]}
+    fused = fuse_leg_scores(legs, {"vector": 1.0}, k=5, score_key="score")
+
+    assert len(fused) == 1
+    assert fused[0]["final_score"] == pytest.approx(0.7)
+    assert fused[0]["title"] == "high"
+
+
+def test_fuse_leg_scores_empty_inputs():
+    assert fuse_leg_scores({}, {}, k=5) == []
+    assert fuse_leg_scores({"vector": [_row(1, 0.5)]}, {"vector": 1.0}, k=0, score_key="score") == []
+
+
+def test_fuse_leg_scores_matches_reference():
+    rng = random.Random(2)
+    weights = {"vector": 1.0, "ilike": 0.7, "fts": 0.9}
+    for _ in range(50):
+        legs = {
+            leg: [_row(rng.randint(0, 40), round(rng.random(), 2)) for _ in range(rng.randint(0, 30))]
+            for leg in weights
+        }
+        k = rng.randint(1, 20)
+
+        # 참조 구현: 후보별 최고 가중 점수, 점수 내림차순 + 첫 등장 순서
+        best, order = {}, []
+        for leg, rows in legs.items():
+            for row in rows:
+                key = str(row["id"])
+                if key not in best:
+                    order.append(key)
+                    best[key] = 0.0
+                best[key] = max(best[key], row["score"] * weights[leg])
+        expected = sorted(order, key=lambda key: (-best[key], order.index(key)))[:k]
+
+        fused = fuse_leg_scores(legs, weights, k=k, score_key="score")
+        assert [str(r["id"]) for r in fused] == expected
+        assert [r["final_score"] for r in fused] == pytest.approx([best[key] for key in expected])
@@ -0,0 +1,60 @@
+"""동의어 역색인 + pickle 아티팩트 무효화 테스트"""
+
+import json
+import pickle
+
+from app.tools.meal import synonym_index as synonym_module
+from app.tools.meal.synonym_index import SynonymIndex
+
+SAMPLE = {
+    "알레르기": {"새우": ["대하", "Shrimp", "칵테일새우"]},
+    "비선호": {"오이": ["백오이", "취청오이"]},
+}
+
+
+def _write_source(tmp_path):
+    source = tmp_path / "synonyms.json"
+    source.write_text(json.dumps(SAMPLE, ensure_ascii=False), encoding="utf-8")
+    return source, tmp_path / "synonyms.index.pkl"
+
+
+def test_normalize_and_expand():
+    index = SynonymIndex(SAMPLE)
+    assert index.canonical(" shrimp ", "알레르기") == "새우"
+    assert index.normalize(["대하", "새우", "연어"], "알레르기") == ["새우", "연어"]
+    assert index.expand(["오이"], "비선호") == ["오이", "백오이", "취청오이"]
+    assert index.canonical("오이", "알레르기") is None
+
+
+def test_artifact_is_reused_when_fresh(tmp_path):
+    source, artifact = _write_source(tmp_path)
+    SynonymIndex.load(source, artifact)
+    payload = pickle.loads(artifact.read_bytes())
+    assert payload["build"] == SynonymIndex.build_fingerprint()
+
+    # 아티팩트 내용을 표시해 두면 재사용 여부를 확인할 수 있음
+    payload["index"].data["marker"] = {}
+    payload["index"]._canonical["marker"] = {}
+    payload["index"]._expansion["marker"] = {}
+    artifact.write_bytes(pickle.dumps(payload))
+    assert "marker" in SynonymIndex.load(source, artifact).data
+
+
+def test_artifact_rebuilt_when_build_code_changes(tmp_path, monkeypatch):
+    source, artifact = _write_source(tmp_path)
+    SynonymIndex.load(source, artifact)
+
+    monkeypatch.setattr(synonym_module, "EXPANSION_LIMIT", 1)
+    index = SynonymIndex.load(source, artifact)
+    assert index.expand(["오이"], "비선호") == ["오이", "백오이"]
+
+
+def test_corrupt_or_invalid_artifact_falls_back_to_rebuild(tmp_path):
+    source, artifact = _write_source(tmp_path)
+    artifact.write_bytes(b"not a pickle")
+    assert SynonymIndex.load(source, artifact).canonical("대하", "알레르기") == "새우"
+
+    payload = pickle.loads(artifact.read_bytes())
+    del payload["index"]._expansion["비선호"]
+    artifact.write_bytes(pickle.dumps(payload))
+    assert SynonymIndex.load(source, artifact).expand(["오이"], "비선호")[0] == "오이"
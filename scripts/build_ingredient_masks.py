@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+레시피 재료 비트셋 인덱싱 스크립트
+recipe_blob_emb 의 모든 레시피에 ingredient_mask / ingredient_mask_vocab 을 채웁니다.
+(선행: backend/migrations/recipe_ingredient_mask.sql)
+
+동의어 사전(ingredient_synonyms.json)이 바뀌면 vocab 버전이 달라지므로 다시 실행하세요.
+
+사용법:
+    python scripts/build_ingredient_masks.py            # 변경된 행만 갱신
+    python scripts/build_ingredient_masks.py --dry-run  # 갱신 없이 통계만 출력
+"""
+
+import argparse
+import os
+import sys
+from collections import Counter
+
+from dotenv import load_dotenv
+
+# 프로젝트 루트를 Python path에 추가
+backend_path = os.path.join(os.path.dirname(__file__), '..', 'backend')
+sys.path.insert(0, backend_path)
+
+# .env 파일 로드
+load_dotenv(os.path.join(backend_path, '.env'))
+
+from app.core.database import supabase
+from app.tools.meal.ingredient_bitset import ingredient_vocabulary
+
+PAGE_SIZE = 500
+
+
+def fetch_recipes():
+    start = 0
+    while True:
+        page = (supabase.table('recipe_blob_emb')
+                .select('id,title,ingredients,ingredient_mask,ingredient_mask_vocab')
+                .order('id')
+                .range(start, start + PAGE_SIZE - 1)
+                .execute()).data or []
+        yield from page
+        if len(page) < PAGE_SIZE:
+            return
+        start += PAGE_SIZE
+
+
+def main():
+    parser = argparse.ArgumentParser(description="레시피 재료 비트셋 인덱싱")
+    parser.add_argument('--dry-run', action='store_true', help="DB 갱신 없이 통계만 출력")
+    args = parser.parse_args()
+
+    vocab = ingredient_vocabulary
+    bit_names = {bit: name for name, bit in vocab.bits.items()}
+    print(f"🧮 재료 비트셋 인덱싱 시작: 표준 재료 {len(vocab.bits)}개, vocab={vocab.version}")
+
+    total = updated = 0
+    bit_counts = Counter()
+    for recipe in fetch_recipes():
+        total += 1
+        mask = vocab.recipe_mask(recipe.get('title'), recipe.get('ingredients'))
+        for bit, name in bit_names.items():
+            if mask >> bit & 1:
+                bit_counts[name] += 1
+
+        if recipe.get('ingredient_mask') == mask and recipe.get('ingredient_mask_vocab') == vocab.version:
+            continue
+        updated += 1
+        if not args.dry_run:
+            supabase.table('recipe_blob_emb').update({
+                'ingredient_mask': mask,
+                'ingredient_mask_vocab': vocab.version,
+            }).eq('id', recipe['id']).execute()
+
+    print(f"✅ 완료: 전체 {total}개, 갱신 {updated}개{' (dry-run)' if args.dry_run else ''}")
+    print("📊 재료별 레시피 수 (상위 15개):")
+    for name, count in bit_counts.most_common(15):
+        print(f"   {name}: {count}")
+
+
+if __name__ == '__main__':
+    main()
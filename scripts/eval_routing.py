@@ -146,15 +146,38 @@ TEST_CASES = [
 
 ]
 
+# 의도 빠른 분류 모델 평가용 holdout (의도별 FAST_PATH_HOLDOUT_EVERY 번째 문장마다 1개, 약 25%)
+# scripts/train_intent_fast_path.py 는 holdout 문장을 학습/교차검증/임계값 보정에 쓰지 않는다
+FAST_PATH_HOLDOUT_EVERY = 4
+
+
+def split_fast_path_holdout(cases):
+    """의도별 층화 (학습용, holdout) 분할 (케이스 순서 기준으로 고정)"""
+    seen = {}
+    train, holdout = [], []
+    for message, intent in cases:
+        position = seen[intent] = seen.get(intent, -1) + 1
+        (holdout if position % FAST_PATH_HOLDOUT_EVERY == FAST_PATH_HOLDOUT_EVERY - 1 else train).append((message, intent))
+    return train, holdout
+
+
+FAST_PATH_HOLDOUT = {message for message, _ in split_fast_path_holdout(TEST_CASES)[1]}
 
 
 
 
 async def evaluate_routing_accuracy():
     from app.core.intent_classifier import IntentClassifier
+    from app.core.config import settings
+    import time
+    from collections import defaultdict
     classifier = IntentClassifier()
     correct = 0
     total = len(TEST_CASES)
+    fast_path_enabled = settings.intent_fast_path_enabled
+    holdout_total = len(FAST_PATH_HOLDOUT)
+    # 분류 방식(fast_path / llm / 키워드)별 [정답 수, 전체 수, 누적 시간]
+    method_stats = defaultdict(lambda: [0, 0, 0.0])
 
     preview_count = 5  # 한글 출력 확인용 짧은 프리뷰 개수
 
@@ -162,7 +185,14 @@ async def evaluate_routing_accuracy():
         # 실제 orchestrator.py와 동일한 방식으로 context 전달
         # 빈 컨텍스트로 테스트 (실제 프론트엔드와 동일)
         context = ""
-        result = await classifier.classify(message, context)
+        # 빠른 경로 모델이 학습한 문장은 빠른 경로 없이 분류 (학습 데이터 정확도가 섞이지 않도록 holdout 에서만 사용)
+        settings.intent_fast_path_enabled = fast_path_enabled and message in FAST_PATH_HOLDOUT
+        try:
+            started = time.perf_counter()
+            result = await classifier.classify(message, context)
+            elapsed = time.perf_counter() - started
+        finally:
+            settings.intent_fast_path_enabled = fast_path_enabled
         
         # 디버깅: 실제 프롬프트 확인
         if idx == 0:  # 첫 번째 테스트 케이스만
@@ -181,13 +211,25 @@ async def evaluate_routing_accuracy():
             except Exception:
                 # 인코딩 문제 발생 시에도 테스트가 중단되지 않도록 안전 처리
                 pass
+        stats = method_stats[result.get("method", "unknown")]
+        stats[1] += 1
+        stats[2] += elapsed
         if predicted == expected_intent:
             correct += 1
+            stats[0] += 1
         else:
-            print(f"[X] '{message}' -> 예상: {expected_intent}, 실제: {predicted}")
+            print(f"[X] '{message}' -> 예상: {expected_intent}, 실제: {predicted} ({result.get('method', 'unknown')})")
 
     acc = correct / total
     print(f"[OK] 정확도: {acc:.2%} ({correct}/{total}) | 목표: 90%+")
+    # 방식별 처리율/정확도/평균 지연 (빠른 경로가 정확도를 떨어뜨리지 않는지 확인)
+    for method, (method_correct, method_total, method_time) in sorted(method_stats.items()):
+        print(f"  - {method}: 처리 {method_total / total:.0%} ({method_total}건) | "
+              f"정확도 {method_correct / method_total:.2%} | 평균 {method_time / method_total * 1000:.1f}ms")
+    if fast_path_enabled:
+        fast_total = method_stats["fast_path"][1] if "fast_path" in method_stats else 0
+        print(f"  * 빠른 경로는 학습에 쓰지 않은 holdout {holdout_total}건에서만 사용 "
+              f"(holdout 처리율 {fast_total / holdout_total if holdout_total else 0:.0%})")
     return acc
 
 if __name__ == "__main__":
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+의도 빠른 분류 모델 학습/내보내기 스크립트
+eval_routing.py 의 라벨 문장(+ 추가 JSONL)으로 로컬 의도 분류기를 학습합니다.
+eval_routing.py 의 holdout 문장은 학습/교차검증/임계값 보정에 쓰지 않습니다 (라우팅 평가용).
+
+1. 층화 k-fold 교차검증으로 정확도와 신뢰도별 정밀도 측정
+2. 교차검증 예측으로 임계값 보정 (임계값 이상 예측의 정확도 ≥ --target-precision)
+3. 전체 데이터로 재학습 후 backend/app/data/intent_fast_path.npz 로 내보내기
+
+사용법:
+    python scripts/train_intent_fast_path.py                       # 학습 + 리포트 + 내보내기
+    python scripts/train_intent_fast_path.py --dry-run             # 리포트만 출력
+    python scripts/train_intent_fast_path.py --data extra.jsonl    # {"text": ..., "intent": ...} 줄 단위 추가 데이터
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+# 프로젝트 루트를 Python path에 추가
+backend_path = os.path.join(os.path.dirname(__file__), '..', 'backend')
+sys.path.insert(0, backend_path)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.core.intent_fast_path import (
+    MODEL_FILE, FastIntentModel, calibrate_threshold, cross_validate,
+)
+from eval_routing import TEST_CASES, split_fast_path_holdout
+
+
+def load_examples(extra_path=None):
+    examples, holdout = split_fast_path_holdout(TEST_CASES)
+    holdout_texts = {text for text, _ in holdout}
+    if extra_path:
+        with open(extra_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    # 추가 데이터에 섞인 평가 문장도 제외
+                    if row['text'] in holdout_texts:
+                        continue
+                    examples.append((row['text'], row['intent']))
+    return examples, holdout
+
+
+def print_report(predictions, threshold):
+    total = len(predictions)
+    correct = sum(expected == predicted for expected, predicted, _ in predictions)
+    accepted = [(e, p) for e, p, conf in predictions if conf >= threshold]
+    accepted_correct = sum(e == p for e, p in accepted)
+
+    print(f"\n📊 교차검증 결과 ({total}문장)")
+    print(f"  전체 정확도(빠른 경로 단독): {correct / total:.2%} ({correct}/{total})")
+    print(f"  보정 임계값: {threshold:.3f}")
+    if accepted:
+        print(f"  빠른 경로 처리율: {len(accepted) / total:.2%} ({len(accepted)}/{total}) → 나머지는 LLM")
+        print(f"  빠른 경로 정확도: {accepted_correct / len(accepted):.2%} ({accepted_correct}/{len(accepted)})")
+    else:
+        print("  빠른 경로 처리율: 0% (목표 정밀도를 만족하는 임계값 없음 → 전부 LLM)")
+
+    print("\n  의도별 (전체 / 빠른 경로 처리 / 빠른 경로 정답):")
+    for label in sorted({e for e, _, _ in predictions}):
+        rows = [(p, conf) for e, p, conf in predictions if e == label]
+        fast = [(p, conf) for p, conf in rows if conf >= threshold]
+        print(f"    {label:15s} {len(rows):4d} / {len(fast):4d} / {sum(p == label for p, _ in fast):4d}")
+
+    confusions = Counter((e, p) for e, p, _ in predictions if e != p)
+    if confusions:
+        print("\n  주요 오분류 (정답 → 예측):")
+        for (expected, predicted), count in confusions.most_common(5):
+            print(f"    {expected} → {predicted}: {count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="의도 빠른 분류 모델 학습")
+    parser.add_argument('--data', help="추가 학습 데이터 JSONL ({\"text\", \"intent\"})")
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--target-precision', type=float, default=0.95)
+    parser.add_argument('--epochs', type=int, default=300)
+    parser.add_argument('--output', default=str(MODEL_FILE))
+    parser.add_argument('--dry-run', action='store_true', help="내보내지 않고 리포트만 출력")
+    args = parser.parse_args()
+
+    examples, holdout = load_examples(args.data)
+    print(f"🚀 학습 데이터: {len(examples)}문장 (평가용 holdout {len(holdout)}문장 제외), "
+          f"의도 분포: {dict(Counter(label for _, label in examples))}")
+
+    started = time.time()
+    predictions = cross_validate(examples, folds=args.folds, epochs=args.epochs)
+    threshold = calibrate_threshold(
+        [conf for _, _, conf in predictions],
+        [e == p for e, p, _ in predictions],
+        target_precision=args.target_precision,
+    )
+    print(f"  교차검증 시간: {time.time() - started:.1f}초")
+    print_report(predictions, threshold)
+
+    model = FastIntentModel.train(examples, epochs=args.epochs, threshold=threshold)
+    total = len(predictions)
+    accepted = [(e, p) for e, p, conf in predictions if conf >= threshold]
+    model.metrics = {
+        "examples": float(total),
+        "cv_accuracy": sum(e == p for e, p, _ in predictions) / total,
+        "cv_coverage": len(accepted) / total,
+        "cv_accepted_accuracy": (sum(e == p for e, p in accepted) / len(accepted)) if accepted else 0.0,
+        "target_precision": args.target_precision,
+    }
+
+    # holdout 확인 (학습/보정에 쓰지 않은 문장, 임계값 이상만 빠른 경로 처리)
+    holdout_predictions = [(expected, *model.predict(text)) for text, expected in holdout]
+    holdout_accepted = [(e, p) for e, p, conf in holdout_predictions if conf >= threshold]
+    if holdout:
+        holdout_correct = sum(e == p for e, p in holdout_accepted)
+        print(f"\n🧪 holdout ({len(holdout)}문장): 빠른 경로 처리율 {len(holdout_accepted) / len(holdout):.2%}, "
+              f"정확도 {holdout_correct / len(holdout_accepted) if holdout_accepted else 0:.2%} "
+              f"({holdout_correct}/{len(holdout_accepted)})")
+
+    # 추론 지연 측정 (요구: 5ms 미만)
+    started = time.perf_counter()
+    for text, _ in examples:
+        model.predict(text)
+    avg_ms = (time.perf_counter() - started) / len(examples) * 1000
+    print(f"\n⏱️ 평균 추론 시간: {avg_ms:.3f}ms")
+
+    if args.dry_run:
+        print("\n(dry-run: 모델을 내보내지 않았습니다)")
+        return
+    model.save(Path(args.output))
+    print(f"\n💾 모델 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()